@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Union
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import authentication
+from rest_framework_simplejwt.authentication import (
+    AUTH_HEADER_TYPE_BYTES,
+    JWTAuthentication,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from apps.core.services import bump_version, get_version
+
+USER_VERSION_KEY = "user:{user_id}:version"
+
+
+def get_user_version(user_id: int) -> int:
+    """Get version of user stored in shared cache."""
+    return get_version(USER_VERSION_KEY.format(user_id=user_id))
+
+
+def bump_user_version(user_id: int) -> int:
+    """Bump version of user, so all processes drop its cached tokens."""
+    return bump_version(USER_VERSION_KEY.format(user_id=user_id))
+
+
+class TokenUserCache:
+    """In-process LRU cache of validated tokens and snapshots of their users.
+
+    Entry lives until `timeout` seconds pass or token expires, whichever
+    comes first. Only values of user fields are stored, every hit builds new
+    user instance, so requests don't share state of user object.
+
+    Entry remembers version of user from shared cache and every hit checks
+    it, so entries of user changed in other process are dropped too.
+
+    """
+
+    def __init__(self, size: int, timeout: int):
+        self.size = size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, raw_token: str) -> Optional[tuple]:
+        """Get user and validated token cached for `raw_token`."""
+        with self._lock:
+            entry = self._entries.get(raw_token)
+            if entry is None:
+                return None
+            if entry["expires_at"] <= time.time():
+                del self._entries[raw_token]
+                return None
+            self._entries.move_to_end(raw_token)
+        if entry["version"] != get_user_version(entry["user_id"]):
+            with self._lock:
+                self._entries.pop(raw_token, None)
+            return None
+        user = entry["model"].from_db(
+            DEFAULT_DB_ALIAS,
+            entry["field_names"],
+            entry["values"],
+        )
+        return user, entry["token"]
+
+    def set(self, raw_token: str, token: Token, user, version: int) -> None:
+        """Cache snapshot of `user` and validated `token` for `raw_token`.
+
+        `version` of user must be read before user is loaded, so changes
+        made while user is loaded drop the entry.
+
+        """
+        fields = user._meta.concrete_fields
+        entry = {
+            "user_id": user.pk,
+            "version": version,
+            "token": token,
+            "model": type(user),
+            "field_names": [field.attname for field in fields],
+            "values": [getattr(user, field.attname) for field in fields],
+            "expires_at": min(time.time() + self.timeout, token["exp"]),
+        }
+        with self._lock:
+            self._entries[raw_token] = entry
+            self._entries.move_to_end(raw_token)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Remove all tokens of user in all processes, e.g. when user was changed."""
+        bump_user_version(user_id)
+        with self._lock:
+            for raw_token in [
+                raw_token
+                for raw_token, entry in self._entries.items()
+                if entry["user_id"] == user_id
+            ]:
+                del self._entries[raw_token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_user_cache = TokenUserCache(
+    size=settings.TOKEN_USER_CACHE_SIZE,
+    timeout=settings.TOKEN_USER_CACHE_TIMEOUT,
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication which resolves users through `token_user_cache`."""
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        return self.authenticate_token(raw_token)
+
+    def authenticate_token(self, raw_token: Union[str, bytes]) -> tuple:
+        """Get user and validated token for `raw_token`."""
+        if isinstance(raw_token, bytes):
+            raw_token = raw_token.decode()
+        if cached := token_user_cache.get(raw_token):
+            return cached
+        validated_token = self.get_validated_token(raw_token)
+        version = get_user_version(
+            validated_token.get(api_settings.USER_ID_CLAIM),
+        )
+        user = self.get_user(validated_token)
+        token_user_cache.set(raw_token, validated_token, user, version)
+        return user, validated_token
+
+
+class SchemeAuthentication(authentication.BaseAuthentication):
+    """Authentication which picks backend by scheme of Authorization header.
+
+    JWT header types use `CachedJWTAuthentication`, `Token` uses DRF token
+    authentication and requests without header use session, so only one
+    backend runs for request.
+
+    """
+
+    def __init__(self):
+        self.jwt = CachedJWTAuthentication()
+        self.token = authentication.TokenAuthentication()
+        self.session = authentication.SessionAuthentication()
+
+    def get_authenticator(
+        self,
+        request,
+    ) -> Optional[authentication.BaseAuthentication]:
+        header = authentication.get_authorization_header(request).split()
+        if not header:
+            return self.session
+        if header[0] in AUTH_HEADER_TYPE_BYTES:
+            return self.jwt
+        if header[0].lower() == self.token.keyword.lower().encode():
+            return self.token
+        return None
+
+    def authenticate(self, request):
+        authenticator = self.get_authenticator(request)
+        if authenticator is None:
+            return None
+        return authenticator.authenticate(request)
+
+    def authenticate_header(self, request) -> str:
+        return self.jwt.authenticate_header(request)
@@ -1,10 +1,11 @@
 import json
 from typing import Optional
 
-from apps.common.mixins.consumers import ActionHandlerMixin
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from rest_framework.exceptions import ValidationError
 
+from apps.core.mixins.consumers import ActionHandlerMixin
+
 
 class BaseConsumer(
     AsyncJsonWebsocketConsumer,
@@ -0,0 +1,9 @@
+from rest_framework import exceptions, status
+
+
+class ConflictError(exceptions.APIException):
+    """Exception for requests conflicting with current state of object."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Объект был изменен другим запросом"
+    default_code = "conflict"
@@ -4,13 +4,14 @@ from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 from channels.sessions import CookieMiddleware, SessionMiddleware
 from django.contrib.auth.models import AnonymousUser
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import (
     AuthenticationFailed,
     InvalidToken,
     TokenError,
 )
 
+from apps.core.authentication import CachedJWTAuthentication
+
 AUTH_COOKIE_KEY = "authorization"
 
 
@@ -23,10 +24,10 @@ class JWTCookieAuthMiddleware(BaseMiddleware):
     @staticmethod
     @database_sync_to_async
     def get_user(token):
-        jwt_auth = JWTAuthentication()
+        jwt_auth = CachedJWTAuthentication()
 
         try:
-            user = jwt_auth.get_user(jwt_auth.get_validated_token(token))
+            user, _ = jwt_auth.authenticate_token(token)
         except (AuthenticationFailed, InvalidToken, TokenError, KeyError):
             user = AnonymousUser()
 
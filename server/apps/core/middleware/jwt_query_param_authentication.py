@@ -2,13 +2,14 @@ from urllib.parse import parse_qs
 
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import (
     AuthenticationFailed,
     InvalidToken,
     TokenError,
 )
 
+from apps.core.authentication import CachedJWTAuthentication
+
 QUERY_TOKEN_KEY = "token"
 
 
@@ -21,10 +22,10 @@ class JWTQueryParamAuthMiddleware:
     @staticmethod
     @database_sync_to_async
     def get_user(token):
-        jwt_auth = JWTAuthentication()
+        jwt_auth = CachedJWTAuthentication()
 
         try:
-            user = jwt_auth.get_user(jwt_auth.get_validated_token(token))
+            user, _ = jwt_auth.authenticate_token(token)
         except (AuthenticationFailed, InvalidToken, TokenError, KeyError):
             user = AnonymousUser()
 
@@ -37,6 +38,9 @@ class JWTQueryParamAuthMiddleware:
         qs = scope["query_string"].decode("utf8")
         token = parse_qs(qs).get(QUERY_TOKEN_KEY, [""])[0]
 
-        scope["user"] = await self.get_user(token)
+        if token:
+            scope["user"] = await self.get_user(token)
+        else:
+            scope.setdefault("user", AnonymousUser())
 
         return await self.inner(scope, receive, send)
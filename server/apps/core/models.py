@@ -1,3 +1,5 @@
+import copy
+
 from django.core.exceptions import ValidationError
 from django_extensions.db.models import TimeStampedModel
 
@@ -29,18 +31,105 @@ class BaseModel(TimeStampedModel):
         if errors:
             raise ValidationError(errors)
 
-    def save(self, **kwargs):
-        """Overriden for get update fields when object update."""
-        if self.pk:
-            cls = self.__class__
-            old = cls.objects.get(pk=self.pk)
-            changed_fields = []
-            for field in cls._meta.get_fields():
-                if hasattr(old, field.name) and hasattr(self, field.name):
-                    if getattr(old, field.name) != getattr(self, field.name):
-                        changed_fields.append(field.name)
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Overriden for remember values loaded from database."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance.get_tracked_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        """Overriden for remember reloaded values.
+
+        Only values of refreshed fields are remembered, so changes of other
+        fields are kept when deferred field is loaded.
+
+        """
+        super().refresh_from_db(using=using, fields=fields)
+        loaded_values = self.get_tracked_values()
+        if fields is not None and hasattr(self, "_loaded_values"):
+            refreshed_fields = {
+                self._meta.get_field(name).attname
+                for name in fields
+            }
+            loaded_values = {
+                **self._loaded_values,
+                **{
+                    key: value
+                    for key, value in loaded_values.items()
+                    if key in refreshed_fields
+                },
+            }
+        self._loaded_values = loaded_values
+
+    def get_tracked_values(self) -> dict:
+        """Get values of concrete fields, which are not deferred."""
+        deferred_fields = self.get_deferred_fields()
+        values = {}
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred_fields:
+                continue
+            value = getattr(self, field.attname)
+            if isinstance(value, (dict, list)):
+                value = copy.deepcopy(value)
+            values[field.attname] = value
+        return values
+
+    def get_changed_fields(self) -> list:
+        """Get names of fields changed since object was loaded.
+
+        Deferred fields, which were set without loading, are changed too.
+
+        """
+        loaded_values = getattr(self, "_loaded_values", {})
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__ and (
+                field.attname not in loaded_values
+                or loaded_values[field.attname] != getattr(self, field.attname)
+            )
+        ]
+
+    def save(self, *, track_changes: bool = True, **kwargs):
+        """Overriden for get update fields when object update.
+
+        Changed fields are found by comparing values with ones remembered
+        when object was loaded, so update doesn't read row again. Pass
+        `track_changes=False` to save all fields, e.g. in bulk scripts.
+
+        """
+        if all([
+            track_changes,
+            self.pk,
+            not self._state.adding,
+            "update_fields" not in kwargs,
+            hasattr(self, "_loaded_values"),
+        ]):
+            changed_fields = self.get_changed_fields()
+            update_modified = kwargs.get(
+                "update_modified",
+                getattr(self, "update_modified", True),
+            )
+            if changed_fields and update_modified:
+                changed_fields.append("modified")
             kwargs["update_fields"] = changed_fields
         super().save(**kwargs)
+        loaded_values = self.get_tracked_values()
+        if kwargs.get("update_fields") is not None:
+            update_fields = {
+                self._meta.get_field(name).attname
+                for name in kwargs["update_fields"]
+            }
+            loaded_values = {
+                **getattr(self, "_loaded_values", {}),
+                **{
+                    key: value
+                    for key, value in loaded_values.items()
+                    if key in update_fields
+                },
+            }
+        self._loaded_values = loaded_values
 
     class Meta:
         abstract = True
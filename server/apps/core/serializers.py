@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 
 
@@ -9,3 +10,79 @@ class BaseSerializer(serializers.ModelSerializer):
         super().__init__(*args, **kwargs)
         self._request = self.context.get("request")
         self._user = getattr(self._request, "user", None)
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field resolved in bulk by `BulkListSerializer`.
+
+    When serializer is used with `many=True`, parent list serializer loads
+    all objects with one query, otherwise field works as usual.
+
+    """
+
+    def to_internal_value(self, data):
+        """Take object from resolved by list serializer if possible."""
+        resolved = getattr(self.parent, "_bulk_resolved", None) or {}
+        objects = resolved.get(self.field_name, {})
+        if str(data) in objects:
+            return objects[str(data)]
+        return super().to_internal_value(data)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """List serializer which resolves `BulkPrimaryKeyRelatedField` in bulk.
+
+    Primary keys of every bulk field are collected from all items and loaded
+    with one `IN` query per field. Missing primary keys are reported together.
+
+    """
+
+    def to_internal_value(self, data):
+        """Resolve related objects before validating each item."""
+        if isinstance(data, list):
+            self.child._bulk_resolved = self.resolve_related(data)
+        try:
+            return super().to_internal_value(data)
+        finally:
+            self.child._bulk_resolved = None
+
+    def get_bulk_fields(self) -> dict:
+        """Get writable bulk fields of child serializer."""
+        return {
+            name: field
+            for name, field in self.child.fields.items()
+            if isinstance(field, BulkPrimaryKeyRelatedField)
+            and not field.read_only
+        }
+
+    def resolve_related(self, data: list) -> dict:
+        """Load objects of bulk fields and collect missing primary keys."""
+        resolved = {}
+        errors = {}
+        for name, field in self.get_bulk_fields().items():
+            pk_field = field.get_queryset().model._meta.pk
+            pks = {}
+            for item in data:
+                if not isinstance(item, dict) or item.get(name) is None:
+                    continue
+                try:
+                    pks[str(item[name])] = pk_field.to_python(item[name])
+                except (DjangoValidationError, TypeError):
+                    # Let field report incorrect type for this item
+                    continue
+            objects = field.get_queryset().in_bulk(set(pks.values()))
+            missing = [key for key, pk in pks.items() if pk not in objects]
+            if missing:
+                errors[name] = [
+                    field.error_messages["does_not_exist"].format(
+                        pk_value=", ".join(missing),
+                    ),
+                ]
+            resolved[name] = {
+                key: objects[pk]
+                for key, pk in pks.items()
+                if pk in objects
+            }
+        if errors:
+            raise serializers.ValidationError(errors)
+        return resolved
@@ -1,2 +1,12 @@
 from .email import send_email  # noqa F401
-from .pagination import PaginationObject  # noqa F401
+from .media import (  # noqa F401
+    delete_files,
+    delete_files_on_commit,
+    delete_unreferenced_files,
+    get_referenced_files,
+    iter_batches,
+    iter_files,
+)
+from .pagination import CursorPaginationObject, PaginationObject  # noqa F401
+from .text import normalize  # noqa F401
+from .versions import bump_version, get_version  # noqa F401
@@ -0,0 +1,75 @@
+import logging
+from itertools import islice
+from typing import Iterable, Iterator
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import Storage
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def delete_files(storage: Storage, names: Iterable[str]) -> None:
+    """Delete files from `storage`, failures are logged and skipped."""
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.exception("Failed to delete file %s", name)
+
+
+def get_referenced_files(names: list) -> set:
+    """Get `names` referenced by rows of `MEDIA_REFERENCE_MODELS`."""
+    referenced = set()
+    for label in settings.MEDIA_REFERENCE_MODELS:
+        referenced |= apps.get_model(label).get_referenced_files(names)
+    return referenced
+
+
+def delete_unreferenced_files(storage: Storage, names: Iterable[str]) -> None:
+    """Delete files which no row references.
+
+    Content addressed files are shared by rows with same content, so file
+    of deleted row is kept while other rows use it. Files of storage without
+    `delete_on_commit` are left to `sweep_media`.
+
+    """
+    if not getattr(storage, "delete_on_commit", True):
+        return
+    names = list(names)
+    referenced = get_referenced_files(names)
+    delete_files(storage, [name for name in names if name not in referenced])
+
+
+def delete_files_on_commit(storage: Storage, names: Iterable[str]) -> None:
+    """Delete files which are not referenced when transaction is committed.
+
+    Files are kept if transaction is rolled back, so rows and files are
+    never out of sync.
+
+    """
+    names = [name for name in names if name]
+    if names:
+        transaction.on_commit(
+            lambda: delete_unreferenced_files(storage, names),
+        )
+
+
+def iter_files(storage: Storage, path: str = "") -> Iterator[str]:
+    """Walk `storage` from `path` and yield names of files one by one."""
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield f"{path}/{name}" if path else name
+    for directory in directories:
+        yield from iter_files(
+            storage,
+            f"{path}/{directory}" if path else directory,
+        )
+
+
+def iter_batches(items: Iterable, size: int) -> Iterator[list]:
+    """Split `items` to lists of `size` items."""
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
@@ -1,11 +1,58 @@
+import json
+from functools import partial
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
 from rest_framework import pagination, response
 
 
+def get_plan_rows(plan) -> int:
+    """Get estimated rows from JSON plan, parsed by driver or not."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_approximate_count(queryset: QuerySet) -> int:
+    """Get number of rows in `queryset` estimated by planner.
+
+    Estimation is read from `EXPLAIN` of PostgreSQL, so table and index
+    are not scanned. Other databases don't expose estimation and get exact
+    count. `EXPLAIN` is run with cursor, as `QuerySet.explain()` returns
+    repr of plan parsed by psycopg2 instead of JSON.
+
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return get_plan_rows(plan)
+
+
+class CountedPaginator(Paginator):
+    """Paginator with number of objects counted beforehand."""
+
+    def __init__(self, object_list, per_page, count: int, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
 class PaginationObject(pagination.PageNumberPagination):
     """Class for paginate object."""
 
     page_size_query_param = 'page_size'
     page_size = 9
+    max_page_size = 100
+
+    def paginate_counted_queryset(self, queryset, request, count: int, view=None):
+        """Paginate `queryset` with known `count`, so no `COUNT(*)` is run."""
+        self.django_paginator_class = partial(CountedPaginator, count=count)
+        return self.paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
         """Overriden for get links on previous and next pages."""
@@ -20,3 +67,46 @@ class PaginationObject(pagination.PageNumberPagination):
                 "results": data,
             },
         )
+
+
+class CursorPaginationObject(pagination.CursorPagination):
+    """Class for paginate object by cursor.
+
+    Page is read by `WHERE id > <cursor>`, so deep pages are as fast as
+    first one and no `COUNT(*)` is run. Total is returned only on request
+    with `count=exact` or `count=approximate` query param, approximate one
+    is taken from planner statistics.
+
+    """
+
+    page_size_query_param = 'page_size'
+    page_size = 9
+    max_page_size = 100
+    ordering = "id"
+    count_query_param = "count"
+    count_modes = ("exact", "approximate")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = self.get_count(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset: QuerySet, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode not in self.count_modes:
+            return None
+        if mode == "approximate":
+            return get_approximate_count(queryset)
+        return queryset.count()
+
+    def get_paginated_response(self, data):
+        """Overriden for get links on previous and next pages."""
+        page = {
+            "links": {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+            },
+        }
+        if self.count is not None:
+            page["count"] = self.count
+        page["results"] = data
+        return response.Response(page)
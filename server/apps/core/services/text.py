@@ -0,0 +1,3 @@
+def normalize(text: str) -> str:
+    """Get `text` in lower case with "ё" replaced by "е" for matching."""
+    return text.lower().replace("ё", "е")
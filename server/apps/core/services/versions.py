@@ -0,0 +1,28 @@
+import time
+
+from django.core.cache import cache
+
+
+def get_version(key: str) -> int:
+    """Get version stored in cache under `key`.
+
+    Missing version is seeded with current time in nanoseconds, so versions
+    don't repeat after cache was cleared or restarted.
+
+    """
+    version = cache.get(key)
+    if version is None:
+        seed = time.time_ns()
+        cache.add(key, seed, timeout=None)
+        version = cache.get(key, seed)
+    return version
+
+
+def bump_version(key: str) -> int:
+    """Increment version stored in cache under `key`."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        seed = time.time_ns()
+        cache.add(key, seed, timeout=None)
+        return cache.get(key, seed)
@@ -0,0 +1,56 @@
+import hashlib
+import os
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, Storage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage which names files by sha256 of their content.
+
+    Same content is stored once under `blobs/<hash>.<ext>`, so uploading
+    existing file doesn't write it again. Blob is never changed after write
+    and can be served with immutable cache headers. Blob can be shared by
+    several rows, so it has to be deleted only when no row references it.
+
+    Upload of existing content doesn't write blob, so its row can be not
+    committed yet, when other row stops referencing blob. So blobs are not
+    deleted on commit, `sweep_media` deletes them when they are old enough,
+    and reused blob is touched to become new again.
+
+    """
+
+    prefix = "blobs"
+    delete_on_commit = False
+
+    def get_hash(self, content) -> str:
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        content.seek(0)
+        return sha256.hexdigest()
+
+    def get_blob_name(self, name: str, content) -> str:
+        digest = self.get_hash(content)
+        suffix = PurePosixPath(name).suffix.lower()
+        return f"{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{suffix}"
+
+    def _save(self, name: str, content) -> str:
+        name = self.get_blob_name(name, content)
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return super()._save(name, content)
+        return name
+
+
+def get_media_storage() -> Storage:
+    """Get storage of uploaded images.
+
+    Content addressed storage is used when `CONTENT_ADDRESSED_MEDIA` is set.
+
+    """
+    if settings.CONTENT_ADDRESSED_MEDIA:
+        return ContentAddressedStorage()
+    return FileSystemStorage()
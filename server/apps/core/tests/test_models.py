@@ -0,0 +1,106 @@
+import pytest
+from django.db import connection, models
+from django.test.utils import isolate_apps
+
+from apps.core.models import BaseModel
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def tracked_model():
+    """Create table for concrete model based on BaseModel."""
+    with isolate_apps("apps.core"):
+        class TrackedModel(BaseModel):
+            name = models.CharField(max_length=128)
+            price = models.DecimalField(max_digits=11, decimal_places=2)
+
+            class Meta:
+                app_label = "core"
+
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(TrackedModel)
+    yield TrackedModel
+    with connection.schema_editor() as schema_editor:
+        schema_editor.delete_model(TrackedModel)
+
+
+def test_update_changed_fields(
+    tracked_model,
+    django_assert_num_queries,
+) -> None:
+    instance = tracked_model.objects.create(name="Name", price=10)
+    instance = tracked_model.objects.get(pk=instance.pk)
+    instance.name = "New name"
+    with django_assert_num_queries(1) as context:
+        instance.save()
+    query = context.captured_queries[0]["sql"]
+    assert query.startswith("UPDATE")
+    assert '"price"' not in query
+    assert '"modified"' in query
+    assert tracked_model.objects.get(pk=instance.pk).name == "New name"
+
+
+def test_update_without_changes(
+    tracked_model,
+    django_assert_num_queries,
+) -> None:
+    instance = tracked_model.objects.create(name="Name", price=10)
+    instance = tracked_model.objects.get(pk=instance.pk)
+    with django_assert_num_queries(0):
+        instance.save()
+
+
+def test_update_after_save(
+    tracked_model,
+    django_assert_num_queries,
+) -> None:
+    instance = tracked_model.objects.create(name="Name", price=10)
+    instance.price = 20
+    with django_assert_num_queries(1):
+        instance.save()
+    with django_assert_num_queries(0):
+        instance.save()
+    assert tracked_model.objects.get(pk=instance.pk).price == 20
+
+
+def test_update_without_tracking(
+    tracked_model,
+    django_assert_num_queries,
+) -> None:
+    instance = tracked_model.objects.create(name="Name", price=10)
+    instance = tracked_model.objects.get(pk=instance.pk)
+    with django_assert_num_queries(1) as context:
+        instance.save(track_changes=False)
+    assert '"price"' in context.captured_queries[0]["sql"]
+
+
+def test_update_deferred_field(
+    tracked_model,
+) -> None:
+    instance = tracked_model.objects.create(name="Name", price=10)
+    instance = tracked_model.objects.only("id").get(pk=instance.pk)
+    instance.name = "New name"
+    instance.save()
+    instance = tracked_model.objects.get(pk=instance.pk)
+    assert (instance.name, instance.price) == ("New name", 10)
+
+
+def test_update_after_loading_deferred_field(
+    tracked_model,
+) -> None:
+    instance = tracked_model.objects.create(name="Name", price=10)
+    instance = tracked_model.objects.only("id", "name").get(pk=instance.pk)
+    instance.name = "New name"
+    assert instance.price == 10
+    instance.save()
+    instance = tracked_model.objects.get(pk=instance.pk)
+    assert (instance.name, instance.price) == ("New name", 10)
+
+
+def test_save_with_positional_args(
+    tracked_model,
+) -> None:
+    instance = tracked_model.objects.create(name="Name", price=10)
+    with pytest.raises(TypeError):
+        instance.save(True)
@@ -0,0 +1,69 @@
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.core.services import CursorPaginationObject, PaginationObject
+from apps.core.services.pagination import get_plan_rows
+from apps.orders.factories import OrderFactory
+from apps.orders.models import Order
+
+pytestmark = pytest.mark.django_db
+
+ORDERS_COUNT = 5
+
+
+def get_request(**params) -> Request:
+    return Request(APIRequestFactory().get("/", params))
+
+
+@pytest.mark.parametrize(
+    "paginator_class",
+    [PaginationObject, CursorPaginationObject],
+)
+def test_page_size_is_capped(paginator_class) -> None:
+    paginator = paginator_class()
+    assert paginator.get_page_size(get_request(page_size=10 ** 6)) == 100
+
+
+def test_cursor_pages_without_count() -> None:
+    orders = OrderFactory.create_batch(size=ORDERS_COUNT)
+    paginator = CursorPaginationObject()
+    page = paginator.paginate_queryset(
+        Order.objects.all(),
+        get_request(page_size=2),
+    )
+    data = paginator.get_paginated_response(
+        [order.id for order in page],
+    ).data
+    assert "count" not in data
+    assert data["results"] == [order.id for order in orders[:2]]
+    assert data["links"]["next"] is not None
+
+
+@pytest.mark.parametrize("mode", ["exact", "approximate"])
+def test_cursor_pages_with_count(mode) -> None:
+    OrderFactory.create_batch(size=ORDERS_COUNT)
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE orders_order")
+    paginator = CursorPaginationObject()
+    page = paginator.paginate_queryset(
+        Order.objects.all(),
+        get_request(count=mode),
+    )
+    data = paginator.get_paginated_response(
+        [order.id for order in page],
+    ).data
+    assert data["count"] == ORDERS_COUNT
+
+
+@pytest.mark.parametrize(
+    "plan",
+    [
+        [{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 42}}],
+        '[{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 42}}]',
+    ],
+)
+def test_plan_rows_of_parsed_and_raw_plan(plan) -> None:
+    assert get_plan_rows(plan) == 42
@@ -0,0 +1,59 @@
+import os
+import time
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from apps.core.storage import ContentAddressedStorage
+from apps.orders.factories import DishImagesFactory
+from apps.orders.models import DishImages
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def storage(monkeypatch) -> ContentAddressedStorage:
+    """Store dish images by content."""
+    storage = ContentAddressedStorage()
+    monkeypatch.setattr(
+        DishImages._meta.get_field("image"),
+        "storage",
+        storage,
+    )
+    return storage
+
+
+def test_save_same_content_once(storage) -> None:
+    name = storage.save("dishes/first.PNG", ContentFile(b"image"))
+    assert name.startswith("blobs/")
+    assert name.endswith(".png")
+    assert storage.save("dishes/second.png", ContentFile(b"image")) == name
+    assert storage.save("dishes/third.png", ContentFile(b"other")) != name
+    directories, files = storage.listdir(name.rsplit("/", 1)[0])
+    assert files == [name.rsplit("/", 1)[1]]
+
+
+def test_save_same_content_touches_blob(storage) -> None:
+    name = storage.save("dishes/first.png", ContentFile(b"image"))
+    os.utime(storage.path(name), (0, 0))
+    assert storage.save("dishes/second.png", ContentFile(b"image")) == name
+    assert os.path.getmtime(storage.path(name)) > time.time() - 60
+
+
+def test_delete_shared_image(
+    storage,
+    django_capture_on_commit_callbacks,
+) -> None:
+    first, second = DishImagesFactory.create_batch(size=2)
+    assert first.image.name == second.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert storage.exists(second.image.name)
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    # blob can be reused by upload not committed yet, so only sweep deletes it
+    assert storage.exists(second.image.name)
+    call_command("sweep_media", "--min-age=0", stdout=StringIO())
+    assert not storage.exists(second.image.name)
@@ -26,6 +26,19 @@ class DishAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(models.Ingredient)
+class IngredientAdmin(admin.ModelAdmin):
+    """Class representation of Ingredient model in admin panel."""
+
+    list_display = (
+        "id",
+        "name",
+    )
+    search_fields = (
+        "name",
+    )
+
+
 @admin.register(models.Order)
 class OrderAdmin(admin.ModelAdmin):
     """Class representation of Order model in admin panel."""
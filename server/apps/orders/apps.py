@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class OrdersConfig(AppConfig):
     name = 'apps.orders'
+
+    def ready(self):
+        from . import signals  # noqa F401
@@ -0,0 +1,130 @@
+from typing import Optional
+
+from channels.db import database_sync_to_async
+from django.http import QueryDict
+
+from apps.core.consumer import BaseConsumer
+from apps.users.models import Employee, User
+
+from .serializers import OrderTrackingQuerySerializer
+from .services import (
+    get_order_tracking,
+    get_order_tracking_group,
+    get_order_version,
+    get_restaurant_group,
+)
+
+
+class RestaurantOrdersConsumer(BaseConsumer):
+    """Consumer to push changes of orders to staff of restaurant.
+
+    Sends `orders.changed`, `lines.changed` and `stop_list.changed` events
+    to employees of restaurant, clients and anonymous users are rejected.
+
+    """
+
+    @staticmethod
+    @database_sync_to_async
+    def get_restaurant_id(user: User) -> Optional[int]:
+        if not user.is_authenticated or user.is_client:
+            return None
+        try:
+            return user.employee.restaurant_id
+        except Employee.DoesNotExist:
+            return None
+
+    async def connect(self) -> None:
+        restaurant_id = await self.get_restaurant_id(self.scope["user"])
+        if restaurant_id is None:
+            await self.close()
+            return
+        self.group_name = get_restaurant_group(restaurant_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code: int) -> None:
+        if self.group_name:
+            await self.channel_layer.group_discard(
+                self.group_name,
+                self.channel_name,
+            )
+
+    async def orders_changed(self, event: dict) -> None:
+        await self.send_event_response(event)
+
+    async def lines_changed(self, event: dict) -> None:
+        await self.send_event_response(event)
+
+    async def stop_list_changed(self, event: dict) -> None:
+        await self.send_event_response(event)
+
+
+class OrderTrackingConsumer(BaseConsumer):
+    """Consumer to push statuses of order to its trackers.
+
+    Sends `order.changed` with statuses of order when its version grows
+    after `since` query param, clients may track only their own orders.
+    Statuses of each version are cached, so trackers don't query DB.
+
+    """
+
+    version: int = -1
+
+    @staticmethod
+    @database_sync_to_async
+    def get_tracking(order_id: int, version: Optional[int] = None) -> Optional[dict]:
+        if version is None:
+            version = get_order_version(order_id)
+        return get_order_tracking(order_id, version)
+
+    @staticmethod
+    @database_sync_to_async
+    def can_track(user: User, tracking: Optional[dict]) -> bool:
+        if tracking is None or not user.is_authenticated:
+            return False
+        return not user.is_client or tracking["client_user"] == user.id
+
+    async def connect(self) -> None:
+        user = self.scope["user"]
+        order_id = self.scope["url_route"]["kwargs"]["order_id"]
+        serializer = OrderTrackingQuerySerializer(
+            data=QueryDict(self.scope["query_string"]),
+        )
+        tracking = await self.get_tracking(order_id)
+        if (
+            not serializer.is_valid() or
+            not await self.can_track(user, tracking)
+        ):
+            await self.close()
+            return
+        self.version = serializer.validated_data.get("since", self.version)
+        self.group_name = get_order_tracking_group(order_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        # order could change before tracker was added to group
+        await self.send_tracking(await self.get_tracking(order_id))
+
+    async def disconnect(self, code: int) -> None:
+        if self.group_name:
+            await self.channel_layer.group_discard(
+                self.group_name,
+                self.channel_name,
+            )
+
+    async def send_tracking(self, tracking: Optional[dict]) -> None:
+        if tracking is None or tracking["version"] <= self.version:
+            return
+        self.version = tracking["version"]
+        data = tracking.copy()
+        data.pop("client_user")
+        await self.send_json({"type": "order.changed", "body": data})
+
+    async def order_changed(self, event: dict) -> None:
+        version = event["body"]["version"]
+        if version > self.version:
+            await self.send_tracking(
+                await self.get_tracking(
+                    self.scope["url_route"]["kwargs"]["order_id"],
+                    version,
+                ),
+            )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.models import DishImages
+from apps.orders.services import process_dish_image
+
+
+class Command(BaseCommand):
+    help = "Render variants of dish images, which don't have them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            dest="all",
+            default=False,
+            action="store_true",
+            help="Render variants of all images again.",
+        )
+
+    def handle(self, *args, **options):
+        images = DishImages.objects.order_by("id")
+        if not options["all"]:
+            images = images.filter(variants={})
+        count = 0
+        for image_id in images.values_list("id", flat=True).iterator():
+            process_dish_image(image_id, eager=True)
+            count += 1
+        self.stdout.write(f"Processed {count} images")
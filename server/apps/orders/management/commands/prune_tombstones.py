@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.services import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete tombstones of menu older than MENU_TOMBSTONE_RETENTION_DAYS"
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Deleted {prune_tombstones()} tombstones")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.services import reconcile_dish_sales
+
+
+class Command(BaseCommand):
+    help = "Recount sales counters of dishes from lines of orders"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            default=500,
+            type=int,
+            help="Number of counters inserted with one query.",
+        )
+
+    def handle(self, *args, **options):
+        count = reconcile_dish_sales(options["batch_size"])
+        self.stdout.write(f"Reconciled sales of {count} dishes")
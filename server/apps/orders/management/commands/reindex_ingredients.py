@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.models import Dish
+from apps.orders.services import index_dish_ingredients
+
+
+class Command(BaseCommand):
+    help = "Parse ingredients of all dishes from their compound"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            default=500,
+            type=int,
+            help="Number of dishes reindexed with one transaction.",
+        )
+
+    def handle(self, *args, **options):
+        dishes = Dish.objects.only("id", "compound").order_by("id")
+        count = 0
+        last_id = 0
+        while True:
+            chunk = list(
+                dishes.filter(id__gt=last_id)[:options["batch_size"]],
+            )
+            if not chunk:
+                break
+            count += index_dish_ingredients(chunk)
+            last_id = chunk[-1].pk
+        self.stdout.write(f"Reindexed ingredients of {count} dishes")
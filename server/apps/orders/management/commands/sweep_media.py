@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core.services import (
+    delete_files,
+    get_referenced_files,
+    iter_batches,
+    iter_files,
+)
+
+
+class Command(BaseCommand):
+    help = "Delete files from media, which no model references"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            dest="dry_run",
+            default=False,
+            action="store_true",
+            help="Print orphaned files without deleting them.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            default=500,
+            type=int,
+            help="Number of files checked with one query per model.",
+        )
+        parser.add_argument(
+            "--min-age",
+            dest="min_age",
+            default=60 * 60,
+            type=int,
+            help="Skip files modified less than this number of seconds ago.",
+        )
+
+    def handle(self, *args, **options):
+        modified_before = timezone.now() - timedelta(seconds=options["min_age"])
+        checked = 0
+        orphans_count = 0
+        for names in iter_batches(
+            iter_files(default_storage),
+            options["batch_size"],
+        ):
+            checked += len(names)
+            referenced = get_referenced_files(names)
+            orphans = [
+                name
+                for name in names
+                if name not in referenced and
+                default_storage.get_modified_time(name) < modified_before
+            ]
+            orphans_count += len(orphans)
+            if options["dry_run"]:
+                for name in orphans:
+                    self.stdout.write(name)
+                continue
+            delete_files(default_storage, orphans)
+        action = "Found" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            f"{action} {orphans_count} orphaned of {checked} files",
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderanddishes',
+            index=models.Index(condition=models.Q(('status__in', ('WAITING_FOR_COOKING', 'COOKING'))), fields=['status', 'order'], name='orders_line_active_idx'),
+        ),
+    ]
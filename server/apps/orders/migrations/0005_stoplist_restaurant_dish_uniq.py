@@ -0,0 +1,36 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:11
+
+from django.db import migrations, models
+
+
+def delete_duplicate_stop_lists(apps, schema_editor):
+    StopList = apps.get_model('orders', 'StopList')
+    duplicates = StopList.objects.values(
+        'restaurant', 'dish',
+    ).annotate(
+        keep_id=models.Min('id'),
+        total=models.Count('id'),
+    ).filter(total__gt=1)
+    for duplicate in duplicates:
+        StopList.objects.filter(
+            restaurant=duplicate['restaurant'],
+            dish=duplicate['dish'],
+        ).exclude(id=duplicate['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_orderanddishes_active_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_duplicate_stop_lists,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='stoplist',
+            constraint=models.UniqueConstraint(fields=('restaurant', 'dish'), name='orders_stoplist_restaurant_dish_uniq'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:14
+
+import apps.orders.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_stoplist_restaurant_dish_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dishimages',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Высота'),
+        ),
+        migrations.AddField(
+            model_name='dishimages',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Уменьшенные копии'),
+        ),
+        migrations.AddField(
+            model_name='dishimages',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Ширина'),
+        ),
+        migrations.AlterField(
+            model_name='dishimages',
+            name='image',
+            field=models.ImageField(height_field='height', upload_to=apps.orders.models.get_directory_path, verbose_name='Картинка', width_field='width'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:17
+
+import apps.core.storage
+import apps.orders.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_dishimages_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dishimages',
+            name='image',
+            field=models.ImageField(height_field='height', storage=apps.core.storage.get_media_storage, upload_to=apps.orders.models.get_directory_path, verbose_name='Картинка', width_field='width'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:18
+
+from django.db import migrations, models
+import django.utils.timezone
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_media_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('category', 'Категория'), ('dish', 'Блюдо'), ('dish_image', 'Картинка блюда'), ('stop_list', 'Стоп лист ресторана')], max_length=32, verbose_name='Модель')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Id удаленного объекта')),
+                ('deleted', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Время удаления')),
+            ],
+            options={
+                'verbose_name': 'Удаленный объект меню',
+                'verbose_name_plural': 'Удаленные объекты меню',
+            },
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='created',
+            field=django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='created'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='modified',
+            field=django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified'),
+        ),
+        migrations.AddField(
+            model_name='dish',
+            name='created',
+            field=django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='created'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='dish',
+            name='modified',
+            field=django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified'),
+        ),
+        migrations.AddField(
+            model_name='dishimages',
+            name='created',
+            field=django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='created'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='dishimages',
+            name='modified',
+            field=django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified'),
+        ),
+        migrations.AddField(
+            model_name='stoplist',
+            name='created',
+            field=django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='created'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='stoplist',
+            name='modified',
+            field=django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['modified'], name='orders_category_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dish',
+            index=models.Index(fields=['modified'], name='orders_dish_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dishimages',
+            index=models.Index(fields=['modified'], name='orders_dishimages_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stoplist',
+            index=models.Index(fields=['modified'], name='orders_stoplist_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted'], name='orders_tombstone_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,125 @@
+from django.db import migrations
+
+# SQL is copied from search service as it was when migration was written,
+# so later changes of service don't change history of database. Name weights
+# most, description weights least in rank of both databases.
+POSTGRES_CREATE_SEARCH_SQL = (
+    """
+    ALTER TABLE orders_dish ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(short_description, '')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(compound, '')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS orders_dish_search_idx
+    ON orders_dish USING GIN (search_vector)
+    """,
+)
+POSTGRES_DROP_SEARCH_SQL = (
+    "DROP INDEX IF EXISTS orders_dish_search_idx",
+    "ALTER TABLE orders_dish DROP COLUMN IF EXISTS search_vector",
+)
+SQLITE_CREATE_SEARCH_SQL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS orders_dish_fts USING fts5(
+        name, short_description, compound, description,
+        content='orders_dish',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS orders_dish_fts_insert
+    AFTER INSERT ON orders_dish BEGIN
+        INSERT INTO orders_dish_fts(
+            rowid, name, short_description, compound, description
+        ) VALUES (
+            new.id, new.name, new.short_description, new.compound,
+            new.description
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS orders_dish_fts_delete
+    AFTER DELETE ON orders_dish BEGIN
+        INSERT INTO orders_dish_fts(
+            orders_dish_fts, rowid, name, short_description, compound,
+            description
+        ) VALUES (
+            'delete', old.id, old.name, old.short_description, old.compound,
+            old.description
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS orders_dish_fts_update
+    AFTER UPDATE ON orders_dish BEGIN
+        INSERT INTO orders_dish_fts(
+            orders_dish_fts, rowid, name, short_description, compound,
+            description
+        ) VALUES (
+            'delete', old.id, old.name, old.short_description, old.compound,
+            old.description
+        );
+        INSERT INTO orders_dish_fts(
+            rowid, name, short_description, compound, description
+        ) VALUES (
+            new.id, new.name, new.short_description, new.compound,
+            new.description
+        );
+    END
+    """,
+    "INSERT INTO orders_dish_fts(orders_dish_fts) VALUES ('rebuild')",
+)
+SQLITE_DROP_SEARCH_SQL = (
+    "DROP TRIGGER IF EXISTS orders_dish_fts_insert",
+    "DROP TRIGGER IF EXISTS orders_dish_fts_delete",
+    "DROP TRIGGER IF EXISTS orders_dish_fts_update",
+    "DROP TABLE IF EXISTS orders_dish_fts",
+)
+
+
+def execute_vendor_sql(schema_editor, postgres_sql, sqlite_sql):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for sql in postgres_sql:
+            schema_editor.execute(sql)
+    elif vendor == "sqlite":
+        for sql in sqlite_sql:
+            schema_editor.execute(sql)
+
+
+def create_dish_search(apps, schema_editor):
+    """Create search index of dishes.
+
+    PostgreSQL gets generated `tsvector` column with GIN index, SQLite gets
+    FTS5 table kept in sync by triggers.
+
+    """
+    execute_vendor_sql(
+        schema_editor,
+        POSTGRES_CREATE_SEARCH_SQL,
+        SQLITE_CREATE_SEARCH_SQL,
+    )
+
+
+def drop_dish_search(apps, schema_editor):
+    execute_vendor_sql(
+        schema_editor,
+        POSTGRES_DROP_SEARCH_SQL,
+        SQLITE_DROP_SEARCH_SQL,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_menu_timestamps_tombstones'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_dish_search, drop_dish_search),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0009_dish_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ingredient',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=128, unique=True, verbose_name='Название')),
+            ],
+            options={
+                'verbose_name': 'Ингредиент',
+                'verbose_name_plural': 'Ингредиенты',
+            },
+        ),
+        migrations.AddField(
+            model_name='dish',
+            name='ingredients',
+            field=models.ManyToManyField(blank=True, related_name='dishes', to='orders.Ingredient', verbose_name='Ингредиенты'),
+        ),
+    ]
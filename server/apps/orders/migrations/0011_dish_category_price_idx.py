@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0010_dish_ingredients'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dish',
+            index=models.Index(fields=['category', 'price'], name='orders_dish_category_price_idx'),
+        ),
+    ]
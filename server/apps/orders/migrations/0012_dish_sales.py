@@ -0,0 +1,77 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def fill_dish_sales(apps, schema_editor):
+    """Count sales of existing lines for all time.
+
+    Existing lines have no creation time, so they are not counted in
+    windows.
+
+    """
+    DishSales = apps.get_model('orders', 'DishSales')
+    OrderAndDishes = apps.get_model('orders', 'OrderAndDishes')
+    counts = OrderAndDishes.objects.exclude(
+        order__status='CANCEL',
+    ).values('dish_id').annotate(total=models.Count('id')).order_by('dish_id')
+    DishSales.objects.bulk_create(
+        [DishSales(dish_id=row['dish_id'], total=row['total']) for row in counts],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_dish_category_price_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DishSales',
+            fields=[
+                ('dish', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sales', serialize=False, to='orders.dish', verbose_name='Блюдо')),
+                ('total', models.IntegerField(default=0, verbose_name='Продано за все время')),
+                ('day', models.IntegerField(default=0, verbose_name='Продано за день')),
+                ('week', models.IntegerField(default=0, verbose_name='Продано за неделю')),
+                ('month', models.IntegerField(default=0, verbose_name='Продано за месяц')),
+            ],
+            options={
+                'verbose_name': 'Продажи блюда',
+                'verbose_name_plural': 'Продажи блюд',
+            },
+        ),
+        migrations.AddField(
+            model_name='orderanddishes',
+            name='created',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Время создания'),
+        ),
+        migrations.AlterField(
+            model_name='orderanddishes',
+            name='created',
+            field=models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True, verbose_name='Время создания'),
+        ),
+        migrations.AddIndex(
+            model_name='dishsales',
+            index=models.Index(fields=['-total', 'dish'], name='orders_dishsales_total_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dishsales',
+            index=models.Index(fields=['-day', 'dish'], name='orders_dishsales_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dishsales',
+            index=models.Index(fields=['-week', 'dish'], name='orders_dishsales_week_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dishsales',
+            index=models.Index(fields=['-month', 'dish'], name='orders_dishsales_month_idx'),
+        ),
+        migrations.RunPython(
+            fill_dish_sales,
+            migrations.RunPython.noop,
+        ),
+    ]
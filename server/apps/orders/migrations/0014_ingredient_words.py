@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_ingredient_words(apps, schema_editor):
+    """Split names of existing ingredients to words."""
+    Ingredient = apps.get_model('orders', 'Ingredient')
+    IngredientWord = apps.get_model('orders', 'IngredientWord')
+    words = []
+    for ingredient_id, name in Ingredient.objects.values_list('id', 'name'):
+        parts = name.split(' ')
+        words.extend(
+            IngredientWord(ingredient_id=ingredient_id, text=' '.join(parts[index:]))
+            for index in range(len(parts))
+        )
+    IngredientWord.objects.bulk_create(words, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0013_dishimages_size_from_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngredientWord',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.CharField(db_index=True, max_length=128, verbose_name='Текст')),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='words', to='orders.ingredient', verbose_name='Ингредиент')),
+            ],
+            options={
+                'verbose_name': 'Слово ингредиента',
+                'verbose_name_plural': 'Слова ингредиентов',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='ingredientword',
+            constraint=models.UniqueConstraint(fields=('ingredient', 'text'), name='orders_ingredientword_ingredient_text_uniq'),
+        ),
+        migrations.RunPython(fill_ingredient_words, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,14 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils import timezone
 
+from apps.core.models import BaseModel
+from apps.core.storage import get_media_storage
+
 
 def get_directory_path(instance, filename) -> str:
     return (
@@ -18,7 +24,7 @@ def validate_arrival_time(arrival_time) -> None:
         )
 
 
-class Category(models.Model):
+class Category(BaseModel):
     name = models.CharField(
         max_length=128,
         verbose_name="Название",
@@ -27,12 +33,69 @@ class Category(models.Model):
     class Meta:
         verbose_name = "Категория"
         verbose_name_plural = "Категории"
+        indexes = (
+            models.Index(
+                fields=("modified",),
+                name="orders_category_modified_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"Category {self.name}"
 
 
-class Dish(models.Model):
+class Ingredient(models.Model):
+    """Normalized ingredient parsed from compound of dishes."""
+
+    name = models.CharField(
+        max_length=128,
+        unique=True,
+        verbose_name="Название",
+    )
+
+    class Meta:
+        verbose_name = "Ингредиент"
+        verbose_name_plural = "Ингредиенты"
+
+    def __str__(self) -> str:
+        return f"Ingredient {self.name}"
+
+
+class IngredientWord(models.Model):
+    """Part of ingredient name starting from one of its words.
+
+    "грецкие орехи" has words "грецкие орехи" and "орехи", so ingredients
+    with word starting with query are found by prefix of indexed text.
+
+    """
+
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name="words",
+        verbose_name="Ингредиент",
+    )
+    text = models.CharField(
+        max_length=128,
+        db_index=True,
+        verbose_name="Текст",
+    )
+
+    class Meta:
+        verbose_name = "Слово ингредиента"
+        verbose_name_plural = "Слова ингредиентов"
+        constraints = (
+            models.UniqueConstraint(
+                fields=("ingredient", "text"),
+                name="orders_ingredientword_ingredient_text_uniq",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"IngredientWord {self.text}"
+
+
+class Dish(BaseModel):
     category = models.ForeignKey(
         Category,
         on_delete=models.CASCADE,
@@ -69,20 +132,52 @@ class Dish(models.Model):
         related_name="dish",
         verbose_name="Отзыв",
     )
+    ingredients = models.ManyToManyField(
+        Ingredient,
+        blank=True,
+        related_name="dishes",
+        verbose_name="Ингредиенты",
+    )
 
     class Meta:
         verbose_name = "Блюдо"
         verbose_name_plural = "Блюда"
+        indexes = (
+            models.Index(
+                fields=("modified",),
+                name="orders_dish_modified_idx",
+            ),
+            models.Index(
+                fields=("category", "price"),
+                name="orders_dish_category_price_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"Dish {self.name} {self.category} {self.price} {self.description}"
 
 
-class DishImages(models.Model):
+class DishImages(BaseModel):
     image = models.ImageField(
         upload_to=get_directory_path,
+        storage=get_media_storage,
         verbose_name="Картинка",
     )
+    width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Ширина",
+    )
+    height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Высота",
+    )
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Уменьшенные копии",
+    )
     dish = models.ForeignKey(
         Dish,
         on_delete=models.CASCADE,
@@ -93,10 +188,38 @@ class DishImages(models.Model):
     class Meta:
         verbose_name = "Картинка блюда"
         verbose_name_plural = "Картинки блюд"
+        indexes = (
+            models.Index(
+                fields=("modified",),
+                name="orders_dishimages_modified_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"Order {self.dish}"
 
+    def get_file_names(self) -> list:
+        """Get names of original image and its variants in storage."""
+        return [
+            self.image.name,
+            *(variant["name"] for variant in self.variants.values()),
+        ]
+
+    @classmethod
+    def get_referenced_files(cls, names: list) -> set:
+        """Get `names` which are original images or variants of images.
+
+        Variants are looked up by names from `DISH_IMAGE_VARIANTS` setting.
+
+        """
+        lookup = models.Q(image__in=names)
+        for variant in settings.DISH_IMAGE_VARIANTS:
+            lookup |= models.Q(**{f"variants__{variant}__name__in": names})
+        referenced = set()
+        for image in cls.objects.filter(lookup).only("image", "variants"):
+            referenced.update(image.get_file_names())
+        return referenced.intersection(names)
+
 
 class Order(models.Model):
 
@@ -158,6 +281,11 @@ class OrderAndDishes(models.Model):
         DONE = "DONE", "Готово"
         DELIVERED = "DELIVERED", "Выдано"
 
+    ACTIVE_STATUSES = (
+        Statuses.WAITING_FOR_COOKING,
+        Statuses.COOKING,
+    )
+
     status = models.TextField(
         choices=Statuses.choices,
         default=Statuses.WAITING_FOR_COOKING,
@@ -188,10 +316,26 @@ class OrderAndDishes(models.Model):
         default="",
         verbose_name="Комментарий",
     )
+    # lines created before this field was added have no time
+    created = models.DateTimeField(
+        default=timezone.now,
+        null=True,
+        blank=True,
+        verbose_name="Время создания",
+    )
 
     class Meta:
         verbose_name = "Заказ и блюдо"
         verbose_name_plural = "Заказы и блюда"
+        indexes = (
+            models.Index(
+                fields=("status", "order"),
+                condition=models.Q(
+                    status__in=("WAITING_FOR_COOKING", "COOKING"),
+                ),
+                name="orders_line_active_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"OrderAndDish {self.order} {self.dish}"
@@ -228,7 +372,7 @@ class RestaurantAndOrder(models.Model):
         return f"RestaurantAndOrder {self.arrival_time} {self.order} {self.restaurant}"
 
 
-class StopList(models.Model):
+class StopList(BaseModel):
     dish = models.ForeignKey(
         Dish,
         related_name="stop_list",
@@ -245,6 +389,119 @@ class StopList(models.Model):
     class Meta:
         verbose_name = "Стоп лист ресторана"
         verbose_name_plural = "Стоп листы ресторанов"
+        constraints = (
+            models.UniqueConstraint(
+                fields=("restaurant", "dish"),
+                name="orders_stoplist_restaurant_dish_uniq",
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=("modified",),
+                name="orders_stoplist_modified_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"StopList with dish: {self.dish}, restaurant: {self.restaurant}"
+
+
+class DishSales(models.Model):
+    """Counters of sold dishes for all time and for recent windows.
+
+    Counters are changed when lines of orders are created or cancelled and
+    recounted from lines by `reconcile_dish_sales` command, which also moves
+    old sales out of windows, so it's run hourly by `scheduler` service.
+
+    """
+
+    WINDOWS = {
+        "day": timedelta(days=1),
+        "week": timedelta(days=7),
+        "month": timedelta(days=30),
+    }
+
+    dish = models.OneToOneField(
+        Dish,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="sales",
+        verbose_name="Блюдо",
+    )
+    total = models.IntegerField(
+        default=0,
+        verbose_name="Продано за все время",
+    )
+    day = models.IntegerField(
+        default=0,
+        verbose_name="Продано за день",
+    )
+    week = models.IntegerField(
+        default=0,
+        verbose_name="Продано за неделю",
+    )
+    month = models.IntegerField(
+        default=0,
+        verbose_name="Продано за месяц",
+    )
+
+    class Meta:
+        verbose_name = "Продажи блюда"
+        verbose_name_plural = "Продажи блюд"
+        indexes = (
+            models.Index(
+                fields=("-total", "dish"),
+                name="orders_dishsales_total_idx",
+            ),
+            models.Index(
+                fields=("-day", "dish"),
+                name="orders_dishsales_day_idx",
+            ),
+            models.Index(
+                fields=("-week", "dish"),
+                name="orders_dishsales_week_idx",
+            ),
+            models.Index(
+                fields=("-month", "dish"),
+                name="orders_dishsales_month_idx",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"DishSales {self.dish_id} {self.total}"
+
+
+class Tombstone(models.Model):
+    """Record about deleted row of menu, which clients remove on sync."""
+
+    class Models(models.TextChoices):
+        CATEGORY = "category", "Категория"
+        DISH = "dish", "Блюдо"
+        DISH_IMAGE = "dish_image", "Картинка блюда"
+        STOP_LIST = "stop_list", "Стоп лист ресторана"
+
+    model = models.CharField(
+        max_length=32,
+        choices=Models.choices,
+        verbose_name="Модель",
+    )
+    object_id = models.PositiveIntegerField(
+        verbose_name="Id удаленного объекта",
+    )
+    deleted = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Время удаления",
+    )
+
+    class Meta:
+        verbose_name = "Удаленный объект меню"
+        verbose_name_plural = "Удаленные объекты меню"
+        indexes = (
+            models.Index(
+                fields=("deleted",),
+                name="orders_tombstone_deleted_idx",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"Tombstone {self.model} {self.object_id}"
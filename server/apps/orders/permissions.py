@@ -1,14 +1,18 @@
 from rest_framework import permissions
 
-from apps.users.models import Employee, User
+from apps.users.auth import get_principal
+from apps.users.models import Employee
 
 
-def check_role_employee(user: User, role: str) -> bool:
-    if user.is_client:
+def check_role_employee(request, *roles: str) -> bool:
+    principal = get_principal(request)
+    if principal is None:
         return False
-    if user.employee.role == role:
-        return True
-    return False
+    return principal.is_employee(*roles)
+
+
+def is_client(request) -> bool:
+    return get_principal(request).is_client
 
 
 class DishCategoryPermissions(permissions.BasePermission):
@@ -20,11 +24,11 @@ class DishCategoryPermissions(permissions.BasePermission):
         ]):
             if not request.user.is_authenticated:
                 return False
-            return not request.user.is_client
+            return not is_client(request)
         if request.method == "GET":
             return True
         if request.user.is_authenticated:
-            return check_role_employee(request.user, Employee.Roles.MANAGER)
+            return check_role_employee(request, Employee.Roles.MANAGER)
         return False
 
     def has_object_permission(self, request, view, obj) -> bool:
@@ -32,7 +36,7 @@ class DishCategoryPermissions(permissions.BasePermission):
             request.method in ("PUT", "PATCH", "DELETE")
             and request.user.is_authenticated
         ):
-            return check_role_employee(request.user, Employee.Roles.MANAGER)
+            return check_role_employee(request, Employee.Roles.MANAGER)
         return True
 
 
@@ -42,24 +46,24 @@ class OrderPermissions(permissions.BasePermission):
         if all([
             request.method == "GET",
             view.action == "list",
-            request.user.is_client,
+            is_client(request),
         ]):
             return False
         if request.method == "POST":
-            return check_role_employee(request.user, Employee.Roles.WAITER)
+            return check_role_employee(request, Employee.Roles.WAITER)
         return True
 
     def has_object_permission(self, request, view, obj) -> bool:
         if request.method == "GET":
-            if request.user.is_client:
-                return obj.client.user == request.user
-            return check_role_employee(request.user, Employee.Roles.WAITER)
+            if is_client(request):
+                return obj.client_id == get_principal(request).client_id
+            return check_role_employee(request, Employee.Roles.WAITER)
         if request.method == "DELETE" and (
-            check_role_employee(request.user, Employee.Roles.WAITER)
+            check_role_employee(request, Employee.Roles.WAITER)
         ):
             return True
         if request.method in ("PUT", "PATCH"):
-            return not request.user.is_client
+            return not is_client(request)
         return False
 
 
@@ -71,65 +75,82 @@ class RestaurantAndOrdersPermissions(permissions.BasePermission):
         if all([
             request.method == "GET",
             view.action == "list",
-            request.user.is_client,
+            is_client(request),
         ]):
             return False
-        if request.user.is_client:
+        if is_client(request):
             return True
-        return any([
-            request.user.employee.role == Employee.Roles.HOSTESS,
-            request.user.employee.role == Employee.Roles.WAITER,
-        ])
+        return check_role_employee(
+            request,
+            Employee.Roles.HOSTESS,
+            Employee.Roles.WAITER,
+        )
 
     def has_object_permission(self, request, view, obj) -> bool:
         if request.method == "GET":
             return (
-                obj.order.client.user == request.user
-                or not request.user.is_client
+                not is_client(request)
+                or obj.order.client_id == get_principal(request).client_id
             )
         if request.method in ("PUT", "PATCH", "DELETE"):
-            if request.user.is_client:
+            if is_client(request):
                 return False
-            return any([
-                request.user.employee.role == Employee.Roles.HOSTESS,
-                request.user.employee.role == Employee.Roles.WAITER,
-            ])
+            return check_role_employee(
+                request,
+                Employee.Roles.HOSTESS,
+                Employee.Roles.WAITER,
+            )
         return True
 
 
 class StopListPermission(permissions.BasePermission):
 
     def has_permission(self, request, view) -> bool:
-        if request.user.is_client:
+        if is_client(request):
             return False
-        if request.method == "GET" and any([
-            check_role_employee(request.user, Employee.Roles.COOK),
-            check_role_employee(request.user, Employee.Roles.WAITER),
-        ]):
+        if request.method == "GET" and check_role_employee(
+            request,
+            Employee.Roles.COOK,
+            Employee.Roles.WAITER,
+        ):
             return True
         if request.method == "POST":
-            return check_role_employee(request.user, Employee.Roles.COOK)
-        return check_role_employee(request.user, Employee.Roles.COOK)
+            return check_role_employee(request, Employee.Roles.COOK)
+        return check_role_employee(request, Employee.Roles.COOK)
 
     def has_object_permission(self, request, view, obj) -> bool:
         if request.method == "DELETE":
-            return check_role_employee(request.user, Employee.Roles.COOK)
+            return check_role_employee(request, Employee.Roles.COOK)
 
 
 class OrderAndDishesPermission(permissions.BasePermission):
 
     def has_permission(self, request, view) -> bool:
-        if request.user.is_client:
+        if is_client(request):
             return False
+        if view.action in ("queue", "claim"):
+            return check_role_employee(
+                request,
+                Employee.Roles.COOK,
+                Employee.Roles.CHEF,
+                Employee.Roles.SOUS_CHEF,
+            )
+        if view.action == "bulk_status":
+            return check_role_employee(
+                request,
+                Employee.Roles.COOK,
+                Employee.Roles.WAITER,
+            )
         return True
 
     def has_object_permission(self, request, view, obj) -> bool:
         if request.method in ("PATCH", "PUT"):
-            return any([
-                check_role_employee(request.user, Employee.Roles.COOK),
-                check_role_employee(request.user, Employee.Roles.CHEF),
-                check_role_employee(request.user, Employee.Roles.SOUS_CHEF),
-                check_role_employee(request.user, Employee.Roles.WAITER),
-            ])
+            return check_role_employee(
+                request,
+                Employee.Roles.COOK,
+                Employee.Roles.CHEF,
+                Employee.Roles.SOUS_CHEF,
+                Employee.Roles.WAITER,
+            )
         if request.method == "DELETE":
-            return check_role_employee(request.user, Employee.Roles.WAITER)
+            return check_role_employee(request, Employee.Roles.WAITER)
@@ -1,11 +1,39 @@
 from collections import OrderedDict
 from decimal import Decimal
 
-from apps.core.serializers import BaseSerializer, serializers
+from django.db import transaction
+from django.utils.functional import cached_property
+from rest_framework.validators import UniqueTogetherValidator
+
+from apps.core.serializers import (
+    BaseSerializer,
+    BulkListSerializer,
+    BulkPrimaryKeyRelatedField,
+    serializers,
+)
 from apps.restaurants.models import Restaurant
+from apps.users.auth import get_principal
 from apps.users.models import Client, Employee
 
 from . import models
+from .services.notifications import notify_order_created
+from .services.popularity import POPULAR_DISHES_WINDOWS, count_dish_sales
+from .services.stop_list import get_stopped_dishes
+from .services.transitions import can_transit, transit
+
+
+def validate_stop_list(restaurant_id: int, dishes: list) -> None:
+    """Reject all `dishes` which are in stop list of restaurant at once."""
+    stopped = get_stopped_dishes(
+        restaurant_id,
+        [item["dish"].pk for item in dishes],
+    )
+    if stopped:
+        raise serializers.ValidationError({
+            "dishes": [
+                f"Блюда {', '.join(map(str, stopped))} в стоп листе ресторана",
+            ],
+        })
 
 
 class CategorySerializer(BaseSerializer):
@@ -20,23 +48,58 @@ class CategorySerializer(BaseSerializer):
 
 class DishImageSerializer(BaseSerializer):
 
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = models.DishImages
         fields = (
             "id",
             "dish",
             "image",
+            "width",
+            "height",
+            "srcset",
+        )
+        read_only_fields = (
+            "width",
+            "height",
         )
         write_only_fields = (
             "dish",
         )
 
+    def get_srcset(self, instance: models.DishImages) -> list:
+        """Get variants and original sorted by width for `srcset`."""
+        storage = instance.image.storage
+        sources = [
+            {
+                "url": storage.url(variant["name"]),
+                "width": variant["width"],
+                "height": variant["height"],
+            }
+            for variant in instance.variants.values()
+        ]
+        if instance.width:
+            sources.append({
+                "url": instance.image.url,
+                "width": instance.width,
+                "height": instance.height,
+            })
+        if self._request is not None:
+            for source in sources:
+                source["url"] = self._request.build_absolute_uri(source["url"])
+        return sorted(sources, key=lambda source: source["width"])
+
 
 class DishSerializer(BaseSerializer):
 
     category = serializers.PrimaryKeyRelatedField(
         queryset=models.Category.objects.all(),
     )
+    images = DishImageSerializer(
+        many=True,
+        read_only=True,
+    )
 
     class Meta:
         model = models.Dish
@@ -49,26 +112,184 @@ class DishSerializer(BaseSerializer):
             "price",
             "compound",
             "weight",
+            "images",
         )
 
+    @cached_property
+    def _category_serializer(self) -> CategorySerializer:
+        return CategorySerializer()
+
     def to_representation(self, instance: models.Dish) -> OrderedDict:
         data = super().to_representation(instance)
-        new_info = {
-            "images": DishImageSerializer(instance.images.all(), many=True).data,
-            "category": CategorySerializer(instance=instance.category).data,
-        }
-        data.update(new_info)
+        data["category"] = self._category_serializer.to_representation(
+            instance.category,
+        )
         return data
 
 
+class DishChangesSerializer(BaseSerializer):
+
+    class Meta:
+        model = models.Dish
+        fields = (
+            "id",
+            "category",
+            "name",
+            "description",
+            "short_description",
+            "price",
+            "compound",
+            "weight",
+        )
+
+
+class PopularDishSerializer(BaseSerializer):
+
+    dish = DishSerializer(
+        read_only=True,
+    )
+    sales = serializers.SerializerMethodField()
+
+    class Meta:
+        model = models.DishSales
+        fields = (
+            "dish",
+            "sales",
+        )
+
+    def get_sales(self, instance: models.DishSales) -> int:
+        return getattr(instance, self.context["window"])
+
+
+class MenuChangesQuerySerializer(serializers.Serializer):
+
+    since = serializers.IntegerField(
+        min_value=0,
+        required=False,
+    )
+
+
+class DishSearchQuerySerializer(serializers.Serializer):
+
+    q = serializers.CharField(
+        max_length=100,
+    )
+
+
+class DishIngredientsQuerySerializer(serializers.Serializer):
+
+    exclude = serializers.ListField(
+        child=serializers.CharField(max_length=128),
+        max_length=20,
+        default=list,
+    )
+    include = serializers.ListField(
+        child=serializers.CharField(max_length=128),
+        max_length=20,
+        default=list,
+    )
+
+
+class DishFacetsQuerySerializer(serializers.Serializer):
+
+    category = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=50,
+        default=list,
+    )
+    price_min = serializers.DecimalField(
+        max_digits=11,
+        decimal_places=2,
+        min_value=0,
+        required=False,
+    )
+    price_max = serializers.DecimalField(
+        max_digits=11,
+        decimal_places=2,
+        min_value=0,
+        required=False,
+    )
+    weight_min = serializers.DecimalField(
+        max_digits=11,
+        decimal_places=3,
+        min_value=0,
+        required=False,
+    )
+    weight_max = serializers.DecimalField(
+        max_digits=11,
+        decimal_places=3,
+        min_value=0,
+        required=False,
+    )
+
+    def validate(self, attrs: dict) -> dict:
+        for field in ("price", "weight"):
+            minimum = attrs.get(f"{field}_min")
+            maximum = attrs.get(f"{field}_max")
+            if None not in (minimum, maximum) and minimum > maximum:
+                raise serializers.ValidationError(
+                    {f"{field}_min": ["Минимум не может быть больше максимума"]},
+                )
+        return attrs
+
+
+class PopularDishesQuerySerializer(serializers.Serializer):
+
+    window = serializers.ChoiceField(
+        choices=POPULAR_DISHES_WINDOWS,
+        default="week",
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=50,
+        default=10,
+    )
+
+
+class IngredientSerializer(BaseSerializer):
+
+    class Meta:
+        model = models.Ingredient
+        fields = (
+            "id",
+            "name",
+        )
+
+
+class DishAutocompleteQuerySerializer(serializers.Serializer):
+
+    q = serializers.CharField(
+        max_length=100,
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=50,
+        default=10,
+    )
+
+
+class MenuCategorySerializer(CategorySerializer):
+
+    dishes = DishSerializer(
+        many=True,
+        read_only=True,
+    )
+
+    class Meta(CategorySerializer.Meta):
+        fields = CategorySerializer.Meta.fields + (
+            "dishes",
+        )
+
+
 class DishCommentSerializer(BaseSerializer):
 
-    dish = serializers.PrimaryKeyRelatedField(
+    dish = BulkPrimaryKeyRelatedField(
         queryset=models.Dish.objects.all(),
     )
 
     class Meta:
         model = models.OrderAndDishes
+        list_serializer_class = BulkListSerializer
         fields = (
             "id",
             "dish",
@@ -148,6 +369,17 @@ class OrderAndDishSerializer(BaseSerializer):
             for key, value in data.items()
         ])
 
+    def validate_status(self, value: str) -> str:
+        if self.instance and not can_transit(
+            type(self.instance),
+            self.instance.status,
+            value,
+        ):
+            raise serializers.ValidationError(
+                f"Нельзя изменить статус с {self.instance.status} на {value}",
+            )
+        return value
+
     def validate(self, attrs: OrderedDict) -> OrderedDict:
         if self.instance:
             if (
@@ -175,6 +407,78 @@ class OrderAndDishSerializer(BaseSerializer):
                 )
         return attrs
 
+    def update(
+        self,
+        instance: models.OrderAndDishes,
+        validated_data: OrderedDict,
+    ) -> models.OrderAndDishes:
+        transit(
+            instance,
+            validated_data.pop("status", instance.status),
+            **validated_data,
+        )
+        return instance
+
+
+class KitchenQueueSerializer(BaseSerializer):
+
+    dish_name = serializers.CharField(
+        source="dish.name",
+        read_only=True,
+    )
+
+    class Meta:
+        model = models.OrderAndDishes
+        fields = (
+            "id",
+            "status",
+            "order",
+            "dish",
+            "dish_name",
+            "comment",
+            "employee",
+        )
+        read_only_fields = fields
+
+
+class ClaimLineSerializer(serializers.Serializer):
+
+    categories = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+    )
+
+
+class BulkStatusSerializer(serializers.Serializer):
+
+    STATUSES_BY_ROLE = {
+        Employee.Roles.COOK: (
+            models.OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+            models.OrderAndDishes.Statuses.COOKING,
+            models.OrderAndDishes.Statuses.DONE,
+        ),
+        Employee.Roles.WAITER: (
+            models.OrderAndDishes.Statuses.DELIVERED,
+        ),
+    }
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=100,
+    )
+    status = serializers.ChoiceField(
+        choices=models.OrderAndDishes.Statuses.choices,
+    )
+
+    def validate_status(self, value: str) -> str:
+        role = get_principal(self.context["request"]).role
+        if value not in self.STATUSES_BY_ROLE.get(role, ()):
+            raise serializers.ValidationError(
+                "Сотрудник не может установить этот статус",
+            )
+        return value
+
 
 class OrderSerializer(BaseSerializer):
 
@@ -216,6 +520,17 @@ class OrderSerializer(BaseSerializer):
             for key, value in data.items()
         ])
 
+    def validate_status(self, value: str) -> str:
+        if self.instance and not can_transit(
+            type(self.instance),
+            self.instance.status,
+            value,
+        ):
+            raise serializers.ValidationError(
+                f"Нельзя изменить статус с {self.instance.status} на {value}",
+            )
+        return value
+
     def validate(self, attrs: OrderedDict) -> OrderedDict:
         if self.instance:
             if (
@@ -229,6 +544,10 @@ class OrderSerializer(BaseSerializer):
                 raise serializers.ValidationError(
                     "Работник может изменить только статус и комментарий к заказу",
                 )
+            return attrs
+        restaurant_id = self.context.get("restaurant_id")
+        if restaurant_id is not None:
+            validate_stop_list(restaurant_id, attrs["dishes"])
         return attrs
 
     def create(self, validated_data: OrderedDict) -> models.Order:
@@ -236,17 +555,20 @@ class OrderSerializer(BaseSerializer):
         validated_data.update(
             {"price": sum([Decimal(item["dish"].price) for item in dishes])}
         )
-        order = models.Order.objects.create(**validated_data)
-        models.OrderAndDishes.objects.bulk_create(
-            [
-                models.OrderAndDishes(
-                    order=order,
-                    dish=item["dish"],
-                    comment=item.get("comment", ""),
-                )
-                for item in dishes
-            ],
-        )
+        with transaction.atomic():
+            order = models.Order.objects.create(**validated_data)
+            lines = models.OrderAndDishes.objects.bulk_create(
+                [
+                    models.OrderAndDishes(
+                        order=order,
+                        dish=item["dish"],
+                        comment=item.get("comment", ""),
+                    )
+                    for item in dishes
+                ],
+            )
+            count_dish_sales(lines)
+            notify_order_created(order.pk)
         return order
 
     def update(
@@ -255,21 +577,27 @@ class OrderSerializer(BaseSerializer):
         validated_data: OrderedDict,
     ) -> models.Order:
         validated_data.pop("dishes", None)
-        return super().update(instance, validated_data)
+        transit(
+            instance,
+            validated_data.pop("status", instance.status),
+            **validated_data,
+        )
+        return instance
 
     def to_representation(self, instance: models.Order) -> OrderedDict:
         data = super().to_representation(instance)
-        dishes = instance.dishes.values("id", "dish", "comment")
-        for item in dishes:
-            item["dish"] = models.Dish.objects.get(id=item["dish"])
-        new_info = {
-            "dishes": DishCommentSerializer(dishes, many=True).data,
-            "price": instance.price,
-        }
-        data.update(new_info)
+        data["price"] = instance.price
         return data
 
 
+class OrderTrackingQuerySerializer(serializers.Serializer):
+
+    since = serializers.IntegerField(
+        min_value=0,
+        required=False,
+    )
+
+
 class RestaurantAndOrderSerializer(BaseSerializer):
 
     restaurant = serializers.PrimaryKeyRelatedField(
@@ -303,7 +631,7 @@ class RestaurantAndOrderSerializer(BaseSerializer):
 
     def validate(self, attrs: OrderedDict) -> OrderedDict:
         if self._user.is_client:
-            return attrs
+            return self.check_stop_list(attrs)
         if self.instance:
             if (
                 self._user.employee.role == Employee.Roles.HOSTESS and
@@ -320,9 +648,28 @@ class RestaurantAndOrderSerializer(BaseSerializer):
             raise serializers.ValidationError(
                 "Создавая бронь, хостесс не может создать заказ",
             )
+        return self.check_stop_list(attrs)
+
+    def check_stop_list(self, attrs: OrderedDict) -> OrderedDict:
+        if self.instance or attrs.get("order") is None:
+            return attrs
+        try:
+            validate_stop_list(
+                attrs["restaurant"].pk,
+                attrs["order"]["dishes"],
+            )
+        except serializers.ValidationError as error:
+            raise serializers.ValidationError({"order": error.detail})
         return attrs
 
+    @transaction.atomic
     def create(self, validated_data: OrderedDict) -> models.RestaurantAndOrder:
+        """Create reservation with its order in one transaction.
+
+        So order is sent to restaurant after commit, when its reservation
+        exists.
+
+        """
         order_dict = validated_data.pop("order")
         order = None
         if order_dict is not None:
@@ -363,6 +710,13 @@ class StopListSerializer(BaseSerializer):
             "dish",
             "restaurant",
         )
+        validators = (
+            UniqueTogetherValidator(
+                queryset=models.StopList.objects.all(),
+                fields=("restaurant", "dish"),
+                message="Блюдо уже в стоп листе ресторана",
+            ),
+        )
 
     def validate_dishes(self, dishes) -> list:
         if not dishes:
@@ -370,3 +724,25 @@ class StopListSerializer(BaseSerializer):
                 "Нельзя создать стоп лист без блюд",
             )
         return dishes
+
+
+class StopListToggleSerializer(serializers.Serializer):
+
+    dishes = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=100,
+    )
+    stopped = serializers.BooleanField()
+
+    def validate_dishes(self, dishes: list) -> list:
+        missing = set(dishes) - set(
+            models.Dish.objects.filter(
+                pk__in=dishes,
+            ).values_list("pk", flat=True),
+        )
+        if missing:
+            raise serializers.ValidationError(
+                f"Блюда {', '.join(map(str, sorted(missing)))} не существуют",
+            )
+        return dishes
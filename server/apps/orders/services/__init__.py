@@ -0,0 +1,39 @@
+from .autocomplete import autocomplete_dishes, dish_name_index  # noqa F401
+from .changes import build_menu_changes, create_tombstone, prune_tombstones  # noqa F401
+from .facets import filter_dishes_by_facets, get_dish_facets  # noqa F401
+from .images import process_dish_image  # noqa F401
+from .ingredients import (  # noqa F401
+    filter_dishes_by_ingredients,
+    index_dish_ingredients,
+    parse_compound,
+)
+from .kitchen import claim_next_line, get_kitchen_queue, get_restaurant_lines  # noqa F401
+from .menu import (  # noqa F401
+    get_menu_snapshot,
+    get_menu_version,
+    get_restaurant_menu,
+    invalidate_menu,
+)
+from .notifications import (  # noqa F401
+    get_order_tracking_group,
+    get_restaurant_group,
+    notify_status_changed,
+    notify_stop_list_changed,
+)
+from .popularity import (  # noqa F401
+    count_dish_sales,
+    get_popular_dishes,
+    reconcile_dish_sales,
+    remember_deleted_order,
+    uncount_deleted_line,
+)
+from .search import restore_sqlite_search_triggers, search_dishes  # noqa F401
+from .stop_list import (  # noqa F401
+    get_stop_list_version,
+    get_stopped_dish_ids,
+    get_stopped_dishes,
+    invalidate_stop_list,
+    set_stopped_dishes,
+)
+from .tracking import get_order_tracking, get_order_version  # noqa F401
+from .transitions import bulk_transit, can_transit, get_sources, transit  # noqa F401
@@ -0,0 +1,208 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.core.services import normalize
+
+from .. import models
+from .menu import get_menu_version
+
+
+def get_tokens(text: str) -> list:
+    return re.findall(r"\w+", normalize(text))
+
+
+def get_trigrams(text: str) -> set:
+    """Get trigrams of words of `text` padded like in `pg_trgm`."""
+    trigrams = set()
+    for token in get_tokens(text):
+        token = f"  {token} "
+        trigrams.update(token[i:i + 3] for i in range(len(token) - 2))
+    return trigrams
+
+
+class DishNameIndex:
+    """In-process index of dish names for autocomplete.
+
+    Words of names are kept in sorted list, so dishes with words starting
+    with typed prefix are found by binary search. Trigrams of names are used,
+    when no name starts with typed words, so names with typos are found too.
+    Index is synced with DB only when menu version changes, and then only
+    dishes changed or deleted since last sync are loaded.
+
+    """
+
+    def __init__(self, trigrams: bool = True):
+        self.trigrams_enabled = trigrams
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        self.version = None
+        self.synced_at = None
+        self._names = {}
+        self._tokens = []
+        self._trigrams = defaultdict(set)
+
+    def add(self, dish_id: int, name: str) -> None:
+        self.remove(dish_id)
+        self._names[dish_id] = name
+        for token in set(get_tokens(name)):
+            insort(self._tokens, (token, dish_id))
+        if self.trigrams_enabled:
+            for trigram in get_trigrams(name):
+                self._trigrams[trigram].add(dish_id)
+
+    def remove(self, dish_id: int) -> None:
+        name = self._names.pop(dish_id, None)
+        if name is None:
+            return
+        for token in set(get_tokens(name)):
+            position = bisect_left(self._tokens, (token, dish_id))
+            if self._tokens[position:position + 1] == [(token, dish_id)]:
+                del self._tokens[position]
+        if self.trigrams_enabled:
+            for trigram in get_trigrams(name):
+                self._trigrams[trigram].discard(dish_id)
+                if not self._trigrams[trigram]:
+                    del self._trigrams[trigram]
+
+    def find_prefix(self, prefix: str) -> set:
+        """Get ids of dishes with word starting with `prefix`."""
+        dish_ids = set()
+        position = bisect_left(self._tokens, (prefix,))
+        while position < len(self._tokens):
+            token, dish_id = self._tokens[position]
+            if not token.startswith(prefix):
+                break
+            dish_ids.add(dish_id)
+            position += 1
+        return dish_ids
+
+    def find_similar(self, query: str) -> dict:
+        """Get similarity of dishes sharing at least half of query trigrams."""
+        trigrams = get_trigrams(query)
+        if not trigrams:
+            return {}
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+        return {
+            dish_id: count / len(trigrams)
+            for dish_id, count in shared.items()
+            if count / len(trigrams) >= settings.DISH_AUTOCOMPLETE_SIMILARITY
+        }
+
+    def search(self, query: str, limit: int) -> list:
+        """Get ids and names of dishes for typed `query`.
+
+        Dishes with all words starting with typed words go first, names
+        starting with query go before others. Similar names are returned
+        only when nothing matched by prefix.
+
+        """
+        tokens = get_tokens(query)
+        if not tokens:
+            return []
+        with self._lock:
+            dish_ids = None
+            for token in tokens:
+                found = self.find_prefix(token)
+                dish_ids = found if dish_ids is None else dish_ids & found
+            query = normalize(query).strip()
+            if dish_ids:
+                ranked = heapq.nsmallest(
+                    limit,
+                    dish_ids,
+                    key=lambda dish_id: (
+                        not normalize(self._names[dish_id]).startswith(query),
+                        normalize(self._names[dish_id]),
+                        dish_id,
+                    ),
+                )
+            elif self.trigrams_enabled:
+                similarity = self.find_similar(query)
+                ranked = heapq.nsmallest(
+                    limit,
+                    similarity,
+                    key=lambda dish_id: (-similarity[dish_id], dish_id),
+                )
+            else:
+                ranked = []
+            return [
+                {"id": dish_id, "name": self._names[dish_id]}
+                for dish_id in ranked
+            ]
+
+    def sync(
+        self,
+        version: int,
+        changed: Iterable[tuple],
+        deleted: Iterable[int],
+        synced_at,
+        full: bool,
+    ) -> None:
+        with self._lock:
+            if full:
+                self.clear()
+            for dish_id in deleted:
+                self.remove(dish_id)
+            for dish_id, name in changed:
+                self.add(dish_id, name)
+            self.version = version
+            self.synced_at = synced_at
+
+
+dish_name_index = DishNameIndex(
+    trigrams=settings.DISH_AUTOCOMPLETE_TRIGRAMS,
+)
+
+
+def sync_dish_name_index(index: Optional[DishNameIndex] = None) -> DishNameIndex:
+    """Load dishes changed since last sync of `index` if menu was changed.
+
+    Rows changed a bit before last sync are loaded again, as their
+    transactions could be committed later. Index is loaded whole on first
+    use or when tombstones since last sync could be pruned.
+
+    """
+    index = index or dish_name_index
+    version = get_menu_version()
+    if index.version == version:
+        return index
+    now = timezone.now()
+    synced_at = index.synced_at
+    full = synced_at is None or synced_at < now - timedelta(
+        days=settings.MENU_TOMBSTONE_RETENTION_DAYS,
+    )
+    dishes = models.Dish.objects.all()
+    deleted = []
+    if not full:
+        changed_after = synced_at - timedelta(
+            seconds=settings.MENU_CHANGES_OVERLAP,
+        )
+        dishes = dishes.filter(modified__gte=changed_after)
+        deleted = models.Tombstone.objects.filter(
+            model=models.Tombstone.Models.DISH,
+            deleted__gte=changed_after,
+        ).values_list("object_id", flat=True)
+    index.sync(
+        version,
+        list(dishes.values_list("id", "name")),
+        list(deleted),
+        now,
+        full,
+    )
+    return index
+
+
+def autocomplete_dishes(query: str, limit: int) -> list:
+    """Get ids and names of dishes for typed `query` from in-process index."""
+    return sync_dish_name_index().search(query, limit)
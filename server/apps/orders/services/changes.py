@@ -0,0 +1,107 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from .. import models, serializers
+
+TOMBSTONE_MODELS = {
+    models.Category: models.Tombstone.Models.CATEGORY,
+    models.Dish: models.Tombstone.Models.DISH,
+    models.DishImages: models.Tombstone.Models.DISH_IMAGE,
+    models.StopList: models.Tombstone.Models.STOP_LIST,
+}
+
+
+def get_changes_token(moment: datetime) -> int:
+    """Get token of `moment`, which client sends on next sync."""
+    return int(moment.timestamp() * 1_000_000)
+
+
+def parse_changes_token(token: int) -> datetime:
+    return datetime.fromtimestamp(token / 1_000_000, tz=dt_timezone.utc)
+
+
+def build_menu_changes(since: Optional[int] = None) -> dict:
+    """Get rows of menu changed and deleted after `since` token.
+
+    Rows changed a bit before token are returned again, because transaction
+    can commit row later than its `modified` time, so clients have to upsert
+    rows by id. Whole menu is returned, when there is no token or it is older
+    than kept tombstones, and `full` is set, so client replaces its menu.
+
+    """
+    menu_changes = {
+        "categories": (
+            models.Category,
+            serializers.CategorySerializer,
+            models.Tombstone.Models.CATEGORY,
+        ),
+        "dishes": (
+            models.Dish,
+            serializers.DishChangesSerializer,
+            models.Tombstone.Models.DISH,
+        ),
+        "images": (
+            models.DishImages,
+            serializers.DishImageSerializer,
+            models.Tombstone.Models.DISH_IMAGE,
+        ),
+        "stop_list": (
+            models.StopList,
+            serializers.StopListSerializer,
+            models.Tombstone.Models.STOP_LIST,
+        ),
+    }
+    now = timezone.now()
+    changed_after = None
+    if since is not None:
+        changed_after = parse_changes_token(since) - timedelta(
+            seconds=settings.MENU_CHANGES_OVERLAP,
+        )
+        if changed_after < now - timedelta(
+            days=settings.MENU_TOMBSTONE_RETENTION_DAYS,
+        ):
+            changed_after = None
+    changes = {
+        "token": get_changes_token(now),
+        "full": changed_after is None,
+    }
+    deleted = defaultdict(list)
+    if changed_after is not None:
+        tombstones = models.Tombstone.objects.filter(
+            deleted__gte=changed_after,
+        ).order_by("id").values_list("model", "object_id")
+        for model, object_id in tombstones:
+            deleted[model].append(object_id)
+    for key, (model, serializer_class, tombstone_model) in menu_changes.items():
+        queryset = model.objects.order_by("id")
+        if changed_after is not None:
+            queryset = queryset.filter(modified__gte=changed_after)
+        changes[key] = serializer_class(queryset, many=True).data
+    changes["deleted"] = {
+        key: deleted[tombstone_model]
+        for key, (_, _, tombstone_model) in menu_changes.items()
+    }
+    return changes
+
+
+def create_tombstone(instance) -> None:
+    """Remember deleted row of menu."""
+    models.Tombstone.objects.create(
+        model=TOMBSTONE_MODELS[type(instance)],
+        object_id=instance.pk,
+    )
+
+
+def prune_tombstones() -> int:
+    """Delete tombstones older than `MENU_TOMBSTONE_RETENTION_DAYS`."""
+    deleted, _ = models.Tombstone.objects.filter(
+        deleted__lt=timezone.now() - timedelta(
+            days=settings.MENU_TOMBSTONE_RETENTION_DAYS,
+        ),
+    ).delete()
+    return deleted
@@ -0,0 +1,110 @@
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from .. import models
+
+
+def get_range_lookup(
+    field: str,
+    minimum: Optional[Decimal] = None,
+    maximum: Optional[Decimal] = None,
+) -> Q:
+    """Get lookup of `field` from `minimum` inclusive to `maximum` exclusive."""
+    lookup = Q()
+    if minimum is not None:
+        lookup &= Q(**{f"{field}__gte": minimum})
+    if maximum is not None:
+        lookup &= Q(**{f"{field}__lt": maximum})
+    return lookup
+
+
+def get_dish_lookups(
+    category: Iterable[int] = (),
+    price_min: Optional[Decimal] = None,
+    price_max: Optional[Decimal] = None,
+    weight_min: Optional[Decimal] = None,
+    weight_max: Optional[Decimal] = None,
+) -> dict:
+    """Get lookups of dishes for each facet by selected filters."""
+    category = list(category)
+    return {
+        "category": Q(category_id__in=category) if category else Q(),
+        "price": get_range_lookup("price", price_min, price_max),
+        "weight": get_range_lookup("weight", weight_min, weight_max),
+    }
+
+
+def get_dish_facets(**filters) -> dict:
+    """Get number of filtered dishes and counts of each facet value.
+
+    Counts of a facet are taken with filters of other facets, so they show
+    how many dishes are found if value is selected. All counts are got with
+    one query grouped by category, where price and weight buckets are
+    counted with conditional aggregation, and then summed for selected
+    categories.
+
+    """
+    lookups = get_dish_lookups(**filters)
+    price_ranges = settings.DISH_PRICE_FACETS
+    weight_ranges = settings.DISH_WEIGHT_FACETS
+    aggregates = {
+        "matched": Count("id", filter=lookups["price"] & lookups["weight"]),
+    }
+    for index, price_range in enumerate(price_ranges):
+        aggregates[f"price_{index}"] = Count(
+            "id",
+            filter=get_range_lookup("price", *price_range) & lookups["weight"],
+        )
+    for index, weight_range in enumerate(weight_ranges):
+        aggregates[f"weight_{index}"] = Count(
+            "id",
+            filter=get_range_lookup("weight", *weight_range) & lookups["price"],
+        )
+    rows = list(
+        models.Dish.objects.values(
+            "category_id",
+        ).annotate(
+            **aggregates,
+        ).order_by("category_id"),
+    )
+    categories = set(filters.get("category") or ())
+    selected = [
+        row
+        for row in rows
+        if not categories or row["category_id"] in categories
+    ]
+    return {
+        "count": sum(row["matched"] for row in selected),
+        "category": [
+            {"id": row["category_id"], "count": row["matched"]}
+            for row in rows
+        ],
+        "price": [
+            {
+                "min": minimum,
+                "max": maximum,
+                "count": sum(row[f"price_{index}"] for row in selected),
+            }
+            for index, (minimum, maximum) in enumerate(price_ranges)
+        ],
+        "weight": [
+            {
+                "min": minimum,
+                "max": maximum,
+                "count": sum(row[f"weight_{index}"] for row in selected),
+            }
+            for index, (minimum, maximum) in enumerate(weight_ranges)
+        ],
+    }
+
+
+def filter_dishes_by_facets(queryset=None, **filters):
+    """Get dishes matching all selected filters."""
+    if queryset is None:
+        queryset = models.Dish.objects.all()
+    for lookup in get_dish_lookups(**filters).values():
+        queryset = queryset.filter(lookup)
+    return queryset
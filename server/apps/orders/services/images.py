@@ -0,0 +1,158 @@
+import io
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import PurePosixPath
+from typing import Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from apps.core.services import delete_unreferenced_files
+
+from .. import models
+from .menu import invalidate_menu
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Get process pool of current process, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.DISH_IMAGE_PROCESSING_WORKERS,
+            )
+        return _executor
+
+
+def render_variants(content: bytes, widths: dict, quality: int) -> dict:
+    """Render WebP variants of image which are not wider than `widths`.
+
+    Function runs in worker process, so only bytes are passed to it and
+    returned from it. Size of original image is returned too, so it's
+    saved without opening file when image is loaded from DB.
+
+    """
+    with Image.open(io.BytesIO(content)) as original:
+        image = ImageOps.exif_transpose(original)
+        variants = {}
+        for name, width in widths.items():
+            variant = image.copy()
+            variant.thumbnail((width, image.height))
+            if variant.mode not in ("RGB", "RGBA"):
+                variant = variant.convert(
+                    "RGBA" if variant.mode in ("LA", "P") else "RGB",
+                )
+            buffer = io.BytesIO()
+            variant.save(buffer, format="WEBP", quality=quality)
+            variants[name] = {
+                "content": buffer.getvalue(),
+                "width": variant.width,
+                "height": variant.height,
+            }
+        return {
+            "width": image.width,
+            "height": image.height,
+            "variants": variants,
+        }
+
+
+def get_variant_name(image_name: str, variant: str) -> str:
+    """Get storage name of `variant` next to original image."""
+    path = PurePosixPath(image_name)
+    return str(path.with_name(f"{path.stem}_{variant}.webp"))
+
+
+def save_variants(image_id: int, image_name: str, rendered: dict) -> bool:
+    """Save rendered variants and record them and size on image.
+
+    Variants are dropped if image was deleted or replaced while they were
+    rendered.
+
+    """
+    storage = models.DishImages._meta.get_field("image").storage
+    saved = {
+        variant: {
+            "name": storage.save(
+                get_variant_name(image_name, variant),
+                ContentFile(data["content"]),
+            ),
+            "width": data["width"],
+            "height": data["height"],
+        }
+        for variant, data in rendered["variants"].items()
+    }
+    updated = models.DishImages.objects.filter(
+        pk=image_id,
+        image=image_name,
+    ).update(
+        width=rendered["width"],
+        height=rendered["height"],
+        variants=saved,
+        modified=timezone.now(),
+    )
+    if not updated:
+        delete_unreferenced_files(
+            storage,
+            [data["name"] for data in saved.values()],
+        )
+        return False
+    invalidate_menu()
+    return True
+
+
+def variants_rendered(image_id: int, image_name: str, future: Future) -> None:
+    """Save variants rendered by process pool."""
+    try:
+        if error := future.exception():
+            logger.error(
+                "Failed to render variants of image %s",
+                image_id,
+                exc_info=error,
+            )
+            return
+        save_variants(image_id, image_name, future.result())
+    finally:
+        # callback runs in thread of pool, which keeps own connection
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+def process_dish_image(image_id: int, eager: Optional[bool] = None) -> None:
+    """Render variants of dish image.
+
+    Variants are rendered by process pool, so request is not blocked,
+    unless `eager` or `DISH_IMAGE_PROCESSING_EAGER` is set.
+
+    """
+    image = models.DishImages.objects.filter(pk=image_id).first()
+    if image is None or not image.image:
+        return
+    try:
+        with image.image.open("rb") as file:
+            content = file.read()
+    except FileNotFoundError:
+        logger.warning("File of image %s is missing", image_id)
+        return
+    args = (
+        content,
+        settings.DISH_IMAGE_VARIANTS,
+        settings.DISH_IMAGE_QUALITY,
+    )
+    if eager is None:
+        eager = settings.DISH_IMAGE_PROCESSING_EAGER
+    if eager:
+        save_variants(image.pk, image.image.name, render_variants(*args))
+        return
+    future = get_executor().submit(render_variants, *args)
+    future.add_done_callback(
+        lambda future: variants_rendered(image.pk, image.image.name, future),
+    )
@@ -0,0 +1,128 @@
+import re
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+from apps.core.services import normalize
+
+from .. import models
+
+INGREDIENT_MAX_LENGTH = 128
+
+# Ingredients are listed with commas, semicolons, lines or sentences, and
+# parts of compound ingredients are put in brackets.
+INGREDIENT_SEPARATORS = re.compile(r"[,;:()\[\]\n]|\.(?=\s|$)")
+
+
+def normalize_ingredient(name: str) -> str:
+    """Get name of ingredient in lower case without extra spaces."""
+    name = " ".join(normalize(name).split())
+    return name.strip(" .-*")[:INGREDIENT_MAX_LENGTH].strip()
+
+
+def parse_compound(compound: str) -> list:
+    """Get normalized names of ingredients from compound of dish."""
+    names = {}
+    for part in INGREDIENT_SEPARATORS.split(compound):
+        name = normalize_ingredient(part)
+        if name and not name.isdigit():
+            names[name] = None
+    return list(names)
+
+
+def get_ingredient_words(name: str) -> list:
+    """Get parts of normalized ingredient name starting from each word."""
+    parts = name.split(" ")
+    return [" ".join(parts[index:]) for index in range(len(parts))]
+
+
+def index_dish_ingredients(dishes: Iterable[models.Dish]) -> int:
+    """Replace ingredients of `dishes` with ones parsed from their compound.
+
+    Missing ingredients and their words are created with one query each and
+    links of all `dishes` are replaced with one delete and one insert, so
+    chunks of dishes are reindexed with fixed number of queries.
+
+    """
+    ingredients_by_dish = {
+        dish.pk: parse_compound(dish.compound)
+        for dish in dishes
+    }
+    if not ingredients_by_dish:
+        return 0
+    names = set().union(*ingredients_by_dish.values())
+    through = models.Dish.ingredients.through
+    with transaction.atomic():
+        models.Ingredient.objects.bulk_create(
+            [models.Ingredient(name=name) for name in names],
+            ignore_conflicts=True,
+        )
+        ingredient_ids = dict(
+            models.Ingredient.objects.filter(
+                name__in=names,
+            ).values_list("name", "id"),
+        )
+        models.IngredientWord.objects.bulk_create(
+            [
+                models.IngredientWord(ingredient_id=ingredient_id, text=text)
+                for name, ingredient_id in ingredient_ids.items()
+                for text in get_ingredient_words(name)
+            ],
+            ignore_conflicts=True,
+        )
+        through.objects.filter(dish_id__in=ingredients_by_dish).delete()
+        through.objects.bulk_create([
+            through(dish_id=dish_id, ingredient_id=ingredient_ids[name])
+            for dish_id, dish_names in ingredients_by_dish.items()
+            for name in dish_names
+        ])
+    return len(ingredients_by_dish)
+
+
+def get_ingredient_lookup(name: str) -> Q:
+    """Get lookup of ingredients with word starting with `name`.
+
+    So "орех" matches "орехи" and "грецкие орехи", which is needed to
+    exclude allergens from compound written in different words. Words are
+    matched by prefix, which uses index of their text.
+
+    """
+    return Q(
+        ingredient__in=models.IngredientWord.objects.filter(
+            text__startswith=name,
+        ).values("ingredient"),
+    )
+
+
+def filter_dishes_by_ingredients(
+    queryset: Optional[QuerySet] = None,
+    exclude: Iterable[str] = (),
+    include: Iterable[str] = (),
+) -> QuerySet:
+    """Get dishes without any of `exclude` and with all of `include`.
+
+    Dishes are filtered with subqueries over links of dishes and ingredients,
+    which use indexes of links, so only indexed words of distinct ingredients
+    are matched by prefix instead of compound text of every dish.
+
+    """
+    if queryset is None:
+        queryset = models.Dish.objects.all()
+    through = models.Dish.ingredients.through
+    exclude = {normalize_ingredient(name) for name in exclude} - {""}
+    include = {normalize_ingredient(name) for name in include} - {""}
+    if exclude:
+        lookup = Q()
+        for name in exclude:
+            lookup |= get_ingredient_lookup(name)
+        queryset = queryset.exclude(
+            id__in=through.objects.filter(lookup).values("dish_id"),
+        )
+    for name in include:
+        queryset = queryset.filter(
+            id__in=through.objects.filter(
+                get_ingredient_lookup(name),
+            ).values("dish_id"),
+        )
+    return queryset
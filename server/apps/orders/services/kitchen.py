@@ -0,0 +1,67 @@
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, QuerySet
+
+from apps.users.models import Employee
+
+from .. import models
+from .transitions import transit
+
+
+def get_restaurant_lines(restaurant_id: int) -> QuerySet:
+    """Get lines of orders of restaurant."""
+    return models.OrderAndDishes.objects.filter(
+        Exists(
+            models.RestaurantAndOrder.objects.filter(
+                order=OuterRef("order"),
+                restaurant=restaurant_id,
+            ),
+        ),
+    )
+
+
+def get_kitchen_queue(restaurant_id: int) -> QuerySet:
+    """Get lines waiting for cooking or cooking in restaurant, oldest first.
+
+    Filter by status matches condition of `orders_line_active_idx`, so only
+    active lines are read even when table has a lot of finished ones.
+
+    """
+    return get_restaurant_lines(restaurant_id).filter(
+        status__in=models.OrderAndDishes.ACTIVE_STATUSES,
+    ).select_related(
+        "dish",
+    ).order_by("id")
+
+
+def claim_next_line(
+    employee: Employee,
+    categories: Optional[Iterable[int]] = None,
+) -> Optional[models.OrderAndDishes]:
+    """Assign oldest unassigned waiting line in restaurant to `employee`.
+
+    Line is locked with `SELECT ... FOR UPDATE SKIP LOCKED`, so concurrent
+    cooks skip lines claimed by each other instead of waiting for them and
+    each of them gets a distinct line. Only claimed row is locked.
+
+    """
+    queryset = get_kitchen_queue(employee.restaurant_id).filter(
+        status=models.OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+        employee__isnull=True,
+    )
+    if categories:
+        queryset = queryset.filter(dish__category__in=categories)
+    with transaction.atomic():
+        line = queryset.select_for_update(
+            skip_locked=True,
+            of=("self",),
+        ).first()
+        if line is None:
+            return None
+        transit(
+            line,
+            models.OrderAndDishes.Statuses.COOKING,
+            employee=employee,
+        )
+    return line
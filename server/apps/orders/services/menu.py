@@ -0,0 +1,113 @@
+from typing import Optional
+
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Prefetch
+
+from apps.core.services import bump_version, get_version
+from apps.restaurants.models import Restaurant
+
+from .. import models, serializers
+
+MENU_VERSION_KEY = "menu:version"
+MENU_SNAPSHOT_KEY = "menu:snapshot:{version}"
+MENU_SNAPSHOT_TIMEOUT = 60 * 60 * 24
+RESTAURANT_MENU_KEY = "menu:restaurant:{restaurant_id}:{version}:{stop_list_version}"
+
+
+def get_menu_version() -> int:
+    """Get current version of menu."""
+    return get_version(MENU_VERSION_KEY)
+
+
+def invalidate_menu() -> int:
+    """Bump menu version, so next request rebuilds snapshot."""
+    return bump_version(MENU_VERSION_KEY)
+
+
+def build_menu_snapshot(version: int) -> dict:
+    """Build menu with categories, dishes and images in 3 queries."""
+    categories = models.Category.objects.prefetch_related(
+        Prefetch(
+            "dishes",
+            queryset=models.Dish.objects.prefetch_related(
+                "images",
+            ).order_by("id"),
+        ),
+    ).order_by("id")
+    return {
+        "version": version,
+        "categories": serializers.MenuCategorySerializer(
+            categories,
+            many=True,
+        ).data,
+    }
+
+
+def get_menu_snapshot(version: int) -> dict:
+    """Get snapshot of menu for `version` from cache or build it."""
+    key = MENU_SNAPSHOT_KEY.format(version=version)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_menu_snapshot(version)
+        cache.set(key, snapshot, MENU_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def get_available_dish_ids(restaurant_id: int) -> set:
+    """Get ids of dishes which are not in stop list of restaurant."""
+    return set(
+        models.Dish.objects.filter(
+            ~Exists(
+                models.StopList.objects.filter(
+                    dish=OuterRef("pk"),
+                    restaurant=restaurant_id,
+                ),
+            ),
+        ).values_list("id", flat=True),
+    )
+
+
+def build_restaurant_menu(
+    restaurant_id: int,
+    version: int,
+    stop_list_version: int,
+) -> Optional[dict]:
+    """Build menu of restaurant without dishes in its stop list.
+
+    Dishes are taken from shared menu snapshot, so they are serialized once
+    for all restaurants and only ids of available dishes are queried.
+
+    """
+    if not Restaurant.objects.filter(pk=restaurant_id).exists():
+        return None
+    dish_ids = get_available_dish_ids(restaurant_id)
+    categories = []
+    for category in get_menu_snapshot(version)["categories"]:
+        dishes = [dish for dish in category["dishes"] if dish["id"] in dish_ids]
+        if dishes:
+            categories.append({**category, "dishes": dishes})
+    return {
+        "version": version,
+        "stop_list_version": stop_list_version,
+        "restaurant": restaurant_id,
+        "categories": categories,
+    }
+
+
+def get_restaurant_menu(
+    restaurant_id: int,
+    version: int,
+    stop_list_version: int,
+) -> Optional[dict]:
+    """Get menu of restaurant for versions from cache or build it."""
+    key = RESTAURANT_MENU_KEY.format(
+        restaurant_id=restaurant_id,
+        version=version,
+        stop_list_version=stop_list_version,
+    )
+    menu = cache.get(key)
+    if menu is None:
+        menu = build_restaurant_menu(restaurant_id, version, stop_list_version)
+        if menu is not None:
+            cache.set(key, menu, MENU_SNAPSHOT_TIMEOUT)
+    return menu
@@ -0,0 +1,156 @@
+import logging
+from collections import defaultdict
+from typing import Iterable
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from .. import models
+from .tracking import bump_order_version
+
+logger = logging.getLogger(__name__)
+
+RESTAURANT_GROUP = "restaurant_{restaurant_id}_orders"
+ORDER_TRACKING_GROUP = "order_{order_id}_tracking"
+
+
+def send_to_group(group: str, message: dict) -> None:
+    """Send `message` to channel group and log failure.
+
+    Messages are sent after commit, so changes are already saved and
+    request must not fail when channel layer is down.
+
+    """
+    try:
+        async_to_sync(get_channel_layer().group_send)(group, message)
+    except Exception:
+        logger.exception("Failed to send %s to %s", message["type"], group)
+
+
+def get_restaurant_group(restaurant_id: int) -> str:
+    """Get name of channel group of restaurant staff."""
+    return RESTAURANT_GROUP.format(restaurant_id=restaurant_id)
+
+
+def notify_restaurant(restaurant_id: int, event: str, body: dict) -> None:
+    """Send `event` to staff of restaurant connected to orders channel."""
+    send_to_group(
+        get_restaurant_group(restaurant_id),
+        {"type": event, "body": body},
+    )
+
+
+def get_order_tracking_group(order_id: int) -> str:
+    """Get name of channel group of order trackers."""
+    return ORDER_TRACKING_GROUP.format(order_id=order_id)
+
+
+def notify_order_trackers(order_ids: Iterable[int]) -> None:
+    """Bump tracking versions of orders and send them to their trackers."""
+    for order_id in set(order_ids):
+        send_to_group(
+            get_order_tracking_group(order_id),
+            {
+                "type": "order.changed",
+                "body": {"version": bump_order_version(order_id)},
+            },
+        )
+
+
+def notify_orders(ids: Iterable[int]) -> None:
+    """Send new statuses of orders to their restaurants and trackers.
+
+    Restaurant of order is taken from its reservation, orders created by
+    employee without reservation belong to restaurant of employee.
+
+    """
+    orders = defaultdict(list)
+    order_ids = []
+    for pk, status, restaurant_id, employee_restaurant_id in (
+        models.Order.objects.filter(
+            pk__in=ids,
+        ).values_list(
+            "id",
+            "status",
+            "restaurant_and_order__restaurant",
+            "employee__restaurant",
+        )
+    ):
+        order_ids.append(pk)
+        restaurant_id = restaurant_id or employee_restaurant_id
+        if restaurant_id is not None:
+            orders[restaurant_id].append({"id": pk, "status": status})
+    notify_order_trackers(order_ids)
+    for restaurant_id, items in orders.items():
+        notify_restaurant(restaurant_id, "orders.changed", {"orders": items})
+
+
+def notify_lines(ids: Iterable[int]) -> None:
+    """Send new statuses of order lines to their restaurants and trackers."""
+    send_lines(models.OrderAndDishes.objects.filter(pk__in=ids))
+
+
+def send_lines(lines) -> None:
+    """Send statuses of `lines` queryset to their restaurants and trackers."""
+    lines_by_restaurant = defaultdict(list)
+    order_ids = []
+    for pk, order_id, status, employee_id, restaurant_id, employee_restaurant_id in (
+        lines.values_list(
+            "id",
+            "order",
+            "status",
+            "employee",
+            "order__restaurant_and_order__restaurant",
+            "order__employee__restaurant",
+        )
+    ):
+        order_ids.append(order_id)
+        restaurant_id = restaurant_id or employee_restaurant_id
+        if restaurant_id is not None:
+            lines_by_restaurant[restaurant_id].append({
+                "id": pk,
+                "order": order_id,
+                "status": status,
+                "employee": employee_id,
+            })
+    notify_order_trackers(order_ids)
+    for restaurant_id, items in lines_by_restaurant.items():
+        notify_restaurant(restaurant_id, "lines.changed", {"lines": items})
+
+
+def notify_status_changed(model: type, ids: Iterable[int]) -> None:
+    """Send new statuses of `model` objects when transaction is committed.
+
+    Objects are read after commit, so restaurants of new orders are known
+    and rolled back changes are not sent.
+
+    """
+    ids = list(ids)
+    if model is models.Order:
+        transaction.on_commit(lambda: notify_orders(ids))
+    elif model is models.OrderAndDishes:
+        transaction.on_commit(lambda: notify_lines(ids))
+
+
+def notify_order_created(order_id: int) -> None:
+    """Send lines of new order when transaction is committed.
+
+    Lines are created with `bulk_create`, which doesn't send `post_save`,
+    so they are read by order after commit.
+
+    """
+    transaction.on_commit(
+        lambda: send_lines(
+            models.OrderAndDishes.objects.filter(order=order_id).order_by("id"),
+        ),
+    )
+
+
+def notify_stop_list_changed(stop_list: models.StopList, stopped: bool) -> None:
+    """Send change of restaurant stop list when transaction is committed."""
+    restaurant_id = stop_list.restaurant_id
+    body = {"dish": stop_list.dish_id, "stopped": stopped}
+    transaction.on_commit(
+        lambda: notify_restaurant(restaurant_id, "stop_list.changed", body),
+    )
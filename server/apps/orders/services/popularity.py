@@ -0,0 +1,182 @@
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .. import models
+
+DishSales = models.DishSales
+
+POPULAR_DISHES_WINDOWS = ("total", *DishSales.WINDOWS)
+
+
+def get_sales_deltas(lines: Iterable[tuple], sign: int) -> dict:
+    """Get changes of counters of each dish for `(dish_id, created)` lines."""
+    now = timezone.now()
+    deltas = defaultdict(Counter)
+    for dish_id, created in lines:
+        deltas[dish_id]["total"] += sign
+        if created is None:
+            continue
+        for window, period in DishSales.WINDOWS.items():
+            if created >= now - period:
+                deltas[dish_id][window] += sign
+    return deltas
+
+
+def update_dish_sales(lines: Iterable[tuple], sign: int) -> None:
+    """Add `sign` to counters of dishes of `(dish_id, created)` lines.
+
+    Dishes with same changes are updated with one `UPDATE ... SET
+    total = total + 1`, so concurrent orders don't overwrite each other.
+    Counters are created only for sales, so uncounted lines of deleted
+    dishes don't insert counters referencing missing dishes.
+
+    """
+    deltas = get_sales_deltas(lines, sign)
+    if not deltas:
+        return
+    if sign > 0:
+        DishSales.objects.bulk_create(
+            [DishSales(dish_id=dish_id) for dish_id in deltas],
+            ignore_conflicts=True,
+        )
+    dishes_by_delta = defaultdict(list)
+    for dish_id, delta in deltas.items():
+        dishes_by_delta[tuple(sorted(delta.items()))].append(dish_id)
+    for delta, dish_ids in dishes_by_delta.items():
+        DishSales.objects.filter(dish_id__in=dish_ids).update(**{
+            field: F(field) + value
+            for field, value in delta
+            if value
+        })
+
+
+def count_dish_sales(lines: Iterable[models.OrderAndDishes]) -> None:
+    """Count created `lines` when transaction is committed."""
+    lines = [(line.dish_id, line.created) for line in lines]
+    transaction.on_commit(lambda: update_dish_sales(lines, 1))
+
+
+def uncount_dish_sales(lines: Iterable[tuple]) -> None:
+    """Uncount `(dish_id, created)` lines when transaction is committed."""
+    lines = list(lines)
+    transaction.on_commit(lambda: update_dish_sales(lines, -1))
+
+
+class DeletedLines:
+    """Lines deleted in transaction, which are uncounted on commit.
+
+    Statuses of their orders are read with one query on commit, and
+    statuses of orders deleted with lines are remembered before delete,
+    so cascades don't query order of every line.
+
+    """
+
+    def __init__(self) -> None:
+        self.lines = []
+        self.order_statuses = {}
+        self.flushed = False
+
+    @classmethod
+    def get(cls) -> "DeletedLines":
+        """Get deleted lines of current transaction.
+
+        Delete signals are sent inside transaction of collector, so lines
+        are flushed once when it's committed.
+
+        """
+        connection = transaction.get_connection()
+        for _, func in reversed(connection.run_on_commit):
+            if isinstance(func, cls) and not func.flushed:
+                return func
+        deleted = cls()
+        transaction.on_commit(deleted)
+        return deleted
+
+    def __call__(self) -> None:
+        self.flushed = True
+        if not self.lines:
+            return
+        cancel = models.Order.Statuses.CANCEL
+        statuses = {
+            **self.order_statuses,
+            **dict(
+                models.Order.objects.filter(
+                    pk__in={order_id for order_id, _, _ in self.lines},
+                ).values_list("id", "status"),
+            ),
+        }
+        update_dish_sales(
+            [
+                (dish_id, created)
+                for order_id, dish_id, created in self.lines
+                if statuses.get(order_id, cancel) != cancel
+            ],
+            -1,
+        )
+
+
+def uncount_deleted_line(line: models.OrderAndDishes) -> None:
+    """Uncount deleted line, if its order wasn't cancelled, on commit."""
+    DeletedLines.get().lines.append(
+        (line.order_id, line.dish_id, line.created),
+    )
+
+
+def remember_deleted_order(order: models.Order) -> None:
+    """Remember status of order, whose lines are uncounted on commit."""
+    DeletedLines.get().order_statuses[order.pk] = order.status
+
+
+def uncount_cancelled_orders(order_ids: Iterable[int]) -> None:
+    """Uncount lines of cancelled orders when transaction is committed."""
+    uncount_dish_sales(
+        models.OrderAndDishes.objects.filter(
+            order_id__in=list(order_ids),
+        ).values_list("dish_id", "created"),
+    )
+
+
+def reconcile_dish_sales(batch_size: int = 500) -> int:
+    """Recount counters of all dishes from lines of not cancelled orders.
+
+    Counters drift when sales leave windows or lines are changed without
+    signals, so they are replaced with counts got by one aggregate query.
+
+    """
+    now = timezone.now()
+    counts = models.OrderAndDishes.objects.exclude(
+        order__status=models.Order.Statuses.CANCEL,
+    ).values(
+        "dish_id",
+    ).annotate(
+        total=Count("id"),
+        **{
+            window: Count("id", filter=Q(created__gte=now - period))
+            for window, period in DishSales.WINDOWS.items()
+        },
+    ).order_by("dish_id")
+    sales = [DishSales(**row) for row in counts]
+    with transaction.atomic():
+        DishSales.objects.all().delete()
+        DishSales.objects.bulk_create(sales, batch_size=batch_size)
+    return len(sales)
+
+
+def get_popular_dishes(window: str, limit: int) -> list:
+    """Get counters of dishes sold most in `window`, read by its index."""
+    return list(
+        DishSales.objects.filter(
+            **{f"{window}__gt": 0},
+        ).select_related(
+            "dish__category",
+        ).prefetch_related(
+            "dish__images",
+        ).order_by(
+            f"-{window}",
+            "dish_id",
+        )[:limit],
+    )
@@ -0,0 +1,150 @@
+import re
+from typing import Optional
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+
+from .. import models
+
+SEARCH_MAX_TERMS = 10
+
+# Search index is created by migrations, triggers of SQLite are restored
+# here, so they must match ones created by `0009_dish_search` migration.
+SQLITE_SEARCH_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS orders_dish_fts_insert
+    AFTER INSERT ON orders_dish BEGIN
+        INSERT INTO orders_dish_fts(
+            rowid, name, short_description, compound, description
+        ) VALUES (
+            new.id, new.name, new.short_description, new.compound,
+            new.description
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS orders_dish_fts_delete
+    AFTER DELETE ON orders_dish BEGIN
+        INSERT INTO orders_dish_fts(
+            orders_dish_fts, rowid, name, short_description, compound,
+            description
+        ) VALUES (
+            'delete', old.id, old.name, old.short_description, old.compound,
+            old.description
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS orders_dish_fts_update
+    AFTER UPDATE ON orders_dish BEGIN
+        INSERT INTO orders_dish_fts(
+            orders_dish_fts, rowid, name, short_description, compound,
+            description
+        ) VALUES (
+            'delete', old.id, old.name, old.short_description, old.compound,
+            old.description
+        );
+        INSERT INTO orders_dish_fts(
+            rowid, name, short_description, compound, description
+        ) VALUES (
+            new.id, new.name, new.short_description, new.compound,
+            new.description
+        );
+    END
+    """,
+)
+SQLITE_REBUILD_SEARCH_SQL = (
+    "INSERT INTO orders_dish_fts(orders_dish_fts) VALUES ('rebuild')"
+)
+
+
+def restore_sqlite_search_triggers(using: str) -> None:
+    """Restore triggers of FTS5 table, which SQLite drops with table.
+
+    SQLite migrations rebuild `orders_dish` to alter it, and triggers of old
+    table are dropped, so they are created again and index is rebuilt.
+
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name = 'orders_dish_fts'",
+        )
+        if cursor.fetchone() is None:
+            return
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' "
+            "AND name LIKE 'orders_dish_fts_%'",
+        )
+        if cursor.fetchone()[0] == len(SQLITE_SEARCH_TRIGGERS_SQL):
+            return
+        for sql in SQLITE_SEARCH_TRIGGERS_SQL:
+            cursor.execute(sql)
+        cursor.execute(SQLITE_REBUILD_SEARCH_SQL)
+
+
+def get_search_terms(query: str) -> list:
+    """Split query to words, so syntax of search query can't be injected."""
+    return re.findall(r"\w+", query.lower())[:SEARCH_MAX_TERMS]
+
+
+def search_dishes(
+    query: str,
+    queryset: Optional[QuerySet] = None,
+) -> QuerySet:
+    """Get dishes matching all words of `query` by prefix, best ones first.
+
+    Dishes are found with GIN index of `tsvector` column on PostgreSQL and
+    with FTS5 table on SQLite.
+
+    """
+    if queryset is None:
+        queryset = models.Dish.objects.all()
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        queryset = queryset.extra(
+            select={
+                "rank": (
+                    "ts_rank_cd(orders_dish.search_vector, "
+                    "to_tsquery('russian', %s))"
+                ),
+            },
+            select_params=(tsquery,),
+            where=(
+                "orders_dish.search_vector @@ to_tsquery('russian', %s)",
+            ),
+            params=(tsquery,),
+        )
+        return queryset.order_by("-rank", "id")
+    if vendor == "sqlite":
+        match = " AND ".join(f'"{term}"*' for term in terms)
+        queryset = queryset.extra(
+            select={
+                "rank": "bm25(orders_dish_fts, 10.0, 5.0, 5.0, 1.0)",
+            },
+            tables=("orders_dish_fts",),
+            where=(
+                "orders_dish_fts.rowid = orders_dish.id",
+                "orders_dish_fts MATCH %s",
+            ),
+            params=(match,),
+        )
+        # bm25 is lower for better matches
+        return queryset.order_by("rank", "id")
+    lookup = None
+    for term in terms:
+        term_lookup = (
+            Q(name__icontains=term) |
+            Q(short_description__icontains=term) |
+            Q(compound__icontains=term) |
+            Q(description__icontains=term)
+        )
+        lookup = term_lookup if lookup is None else lookup & term_lookup
+    return queryset.filter(lookup).order_by("id")
@@ -0,0 +1,92 @@
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.services import bump_version, get_version
+
+from .. import models
+from .notifications import notify_stop_list_changed
+
+STOP_LIST_VERSION_KEY = "stop_list:{restaurant_id}:version"
+STOP_LIST_DISHES_KEY = "stop_list:{restaurant_id}:dishes:{version}"
+STOP_LIST_DISHES_TIMEOUT = 60 * 60 * 24
+
+
+def get_stop_list_version(restaurant_id: int) -> int:
+    """Get current version of restaurant stop list."""
+    return get_version(STOP_LIST_VERSION_KEY.format(restaurant_id=restaurant_id))
+
+
+def invalidate_stop_list(restaurant_id: int) -> int:
+    """Bump stop list version, so restaurant menu and dishes are rebuilt."""
+    return bump_version(STOP_LIST_VERSION_KEY.format(restaurant_id=restaurant_id))
+
+
+def get_stopped_dish_ids(restaurant_id: int) -> frozenset:
+    """Get ids of dishes in stop list of restaurant.
+
+    Set is cached for current stop list version, which is bumped when
+    stop list is changed, so membership of dish is checked without query.
+
+    """
+    key = STOP_LIST_DISHES_KEY.format(
+        restaurant_id=restaurant_id,
+        version=get_stop_list_version(restaurant_id),
+    )
+    dish_ids = cache.get(key)
+    if dish_ids is None:
+        dish_ids = frozenset(
+            models.StopList.objects.filter(
+                restaurant=restaurant_id,
+            ).values_list("dish", flat=True),
+        )
+        cache.set(key, dish_ids, STOP_LIST_DISHES_TIMEOUT)
+    return dish_ids
+
+
+def get_stopped_dishes(restaurant_id: int, dish_ids: Iterable[int]) -> list:
+    """Get sorted ids of `dish_ids` which are in stop list of restaurant."""
+    stopped = get_stopped_dish_ids(restaurant_id)
+    return sorted({dish_id for dish_id in dish_ids if dish_id in stopped})
+
+
+def set_stopped_dishes(
+    restaurant_id: int,
+    dish_ids: Iterable[int],
+    stopped: bool,
+) -> None:
+    """Add dishes to stop list of restaurant or remove them from it.
+
+    Dishes are added with one `INSERT` of dishes not in stop list yet, and
+    removed with one `DELETE`. Restaurant is notified only about dishes
+    whose state was changed.
+
+    """
+    dish_ids = set(dish_ids)
+    if not stopped:
+        # post_delete signals invalidate stop list and notify restaurant
+        models.StopList.objects.filter(
+            restaurant=restaurant_id,
+            dish__in=dish_ids,
+        ).delete()
+        return
+    dish_ids -= set(
+        models.StopList.objects.filter(
+            restaurant=restaurant_id,
+            dish__in=dish_ids,
+        ).values_list("dish", flat=True),
+    )
+    if not dish_ids:
+        return
+    stop_lists = [
+        models.StopList(restaurant_id=restaurant_id, dish_id=dish_id)
+        for dish_id in sorted(dish_ids)
+    ]
+    models.StopList.objects.bulk_create(
+        stop_lists,
+        ignore_conflicts=True,
+    )
+    transaction.on_commit(lambda: invalidate_stop_list(restaurant_id))
+    for stop_list in stop_lists:
+        notify_stop_list_changed(stop_list, stopped=True)
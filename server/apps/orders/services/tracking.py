@@ -0,0 +1,51 @@
+from typing import Optional
+
+from django.core.cache import cache
+
+from apps.core.services import bump_version, get_version
+
+from .. import models
+
+ORDER_VERSION_KEY = "order:{order_id}:version"
+ORDER_TRACKING_KEY = "order:{order_id}:tracking:{version}"
+ORDER_TRACKING_TIMEOUT = 60 * 60
+
+
+def get_order_version(order_id: int) -> int:
+    """Get current version of order tracking."""
+    return get_version(ORDER_VERSION_KEY.format(order_id=order_id))
+
+
+def bump_order_version(order_id: int) -> int:
+    """Bump tracking version of order, so trackers get changes."""
+    return bump_version(ORDER_VERSION_KEY.format(order_id=order_id))
+
+
+def build_order_tracking(order_id: int, version: int) -> Optional[dict]:
+    """Build statuses of order and its lines in 2 queries."""
+    order = models.Order.objects.filter(
+        pk=order_id,
+    ).values("status", "client__user").first()
+    if order is None:
+        return None
+    return {
+        "client_user": order["client__user"],
+        "version": version,
+        "status": order["status"],
+        "lines": list(
+            models.OrderAndDishes.objects.filter(
+                order=order_id,
+            ).order_by("id").values("id", "status"),
+        ),
+    }
+
+
+def get_order_tracking(order_id: int, version: int) -> Optional[dict]:
+    """Get statuses of order for `version` from cache or build them."""
+    key = ORDER_TRACKING_KEY.format(order_id=order_id, version=version)
+    tracking = cache.get(key)
+    if tracking is None:
+        tracking = build_order_tracking(order_id, version)
+        if tracking is not None:
+            cache.set(key, tracking, ORDER_TRACKING_TIMEOUT)
+    return tracking
@@ -0,0 +1,149 @@
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Model, QuerySet
+
+from apps.core.exceptions import ConflictError
+
+from .. import models
+from .notifications import notify_status_changed
+from .popularity import uncount_cancelled_orders
+
+Order = models.Order
+OrderAndDishes = models.OrderAndDishes
+
+ORDER_TRANSITIONS = {
+    Order.Statuses.WAITING_FOR_COOKING: (
+        Order.Statuses.COOKING,
+        Order.Statuses.CANCEL,
+    ),
+    Order.Statuses.COOKING: (
+        Order.Statuses.WAITING_FOR_DELIVERY,
+        Order.Statuses.CANCEL,
+    ),
+    Order.Statuses.WAITING_FOR_DELIVERY: (
+        Order.Statuses.IN_PROCESS_DELIVERY,
+        Order.Statuses.DELIVERED,
+        Order.Statuses.CANCEL,
+    ),
+    Order.Statuses.IN_PROCESS_DELIVERY: (
+        Order.Statuses.DELIVERED,
+    ),
+    Order.Statuses.DELIVERED: (
+        Order.Statuses.PAID,
+        Order.Statuses.FINISHED,
+    ),
+    Order.Statuses.PAID: (
+        Order.Statuses.FINISHED,
+    ),
+    Order.Statuses.FINISHED: (),
+    Order.Statuses.CANCEL: (),
+}
+
+ORDER_AND_DISHES_TRANSITIONS = {
+    OrderAndDishes.Statuses.WAITING_FOR_COOKING: (
+        OrderAndDishes.Statuses.COOKING,
+    ),
+    OrderAndDishes.Statuses.COOKING: (
+        OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+        OrderAndDishes.Statuses.DONE,
+    ),
+    OrderAndDishes.Statuses.DONE: (
+        OrderAndDishes.Statuses.DELIVERED,
+    ),
+    OrderAndDishes.Statuses.DELIVERED: (),
+}
+
+TRANSITIONS = {
+    Order: ORDER_TRANSITIONS,
+    OrderAndDishes: ORDER_AND_DISHES_TRANSITIONS,
+}
+
+
+def can_transit(model: type, source: str, target: str) -> bool:
+    """Check if status of `model` can be changed from `source` to `target`."""
+    return source == target or target in TRANSITIONS[model].get(source, ())
+
+
+def get_sources(model: type, target: str) -> tuple:
+    """Get statuses of `model` which can be changed to `target`."""
+    return tuple(
+        source
+        for source, targets in TRANSITIONS[model].items()
+        if target in targets
+    )
+
+
+def transit(instance: Model, target: str, **fields) -> None:
+    """Change status of `instance` to `target`.
+
+    Status is changed with `UPDATE ... WHERE status = <current status>`, so
+    if another request changed status after `instance` was read, nothing is
+    updated and `ConflictError` is raised. Additional `fields` are updated
+    in the same query.
+
+    """
+    model = type(instance)
+    source = instance.status
+    if source == target and not fields:
+        return
+    updated = model.objects.filter(
+        pk=instance.pk,
+        status=source,
+    ).update(
+        status=target,
+        **fields,
+    )
+    if not updated:
+        raise ConflictError(
+            "Статус был изменен другим сотрудником, обновите данные",
+        )
+    instance.status = target
+    for key, value in fields.items():
+        setattr(instance, key, value)
+    if model is Order and source != target == Order.Statuses.CANCEL:
+        uncount_cancelled_orders([instance.pk])
+    notify_status_changed(model, [instance.pk])
+
+
+def bulk_transit(
+    model: type,
+    ids: Iterable[int],
+    target: str,
+    queryset: Optional[QuerySet] = None,
+) -> dict:
+    """Change status of `model` objects with `ids` to `target`.
+
+    Objects are locked and checked with one query and changed with one
+    `UPDATE`. Returns result for each id: `updated` if object has `target`
+    status now, `not_found` if it doesn't exist or isn't in `queryset` and
+    `conflict` if its status can't be changed to `target`.
+
+    """
+    if queryset is None:
+        queryset = model.objects.all()
+    ids = list(dict.fromkeys(ids))
+    sources = get_sources(model, target)
+    with transaction.atomic():
+        statuses = dict(
+            queryset.filter(
+                pk__in=ids,
+            ).select_for_update(
+                of=("self",),
+            ).order_by("pk").values_list("pk", "status"),
+        )
+        changed = [pk for pk, status in statuses.items() if status in sources]
+        if changed:
+            model.objects.filter(pk__in=changed).update(status=target)
+            if model is Order and target == Order.Statuses.CANCEL:
+                uncount_cancelled_orders(changed)
+            notify_status_changed(model, changed)
+    results = {}
+    for pk in ids:
+        if pk not in statuses:
+            results[pk] = "not_found"
+        elif statuses[pk] in sources or statuses[pk] == target:
+            results[pk] = "updated"
+        else:
+            results[pk] = "conflict"
+    return results
@@ -0,0 +1,115 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.core.services import delete_files_on_commit
+
+from . import models
+from .services import (
+    count_dish_sales,
+    create_tombstone,
+    index_dish_ingredients,
+    invalidate_menu,
+    invalidate_stop_list,
+    notify_status_changed,
+    notify_stop_list_changed,
+    process_dish_image,
+    remember_deleted_order,
+    restore_sqlite_search_triggers,
+    uncount_deleted_line,
+)
+
+
+@receiver(post_save, sender=models.Category)
+@receiver(post_delete, sender=models.Category)
+@receiver(post_save, sender=models.Dish)
+@receiver(post_delete, sender=models.Dish)
+@receiver(post_save, sender=models.DishImages)
+@receiver(post_delete, sender=models.DishImages)
+def menu_changed(**kwargs) -> None:
+    """Invalidate menu snapshot when transaction is committed."""
+    transaction.on_commit(invalidate_menu)
+
+
+@receiver(post_save, sender=models.Dish)
+def dish_saved(instance, created: bool, update_fields, **kwargs) -> None:
+    """Parse ingredients of dish when its compound is changed."""
+    if created or update_fields is None or "compound" in update_fields:
+        index_dish_ingredients([instance])
+
+
+@receiver(post_save, sender=models.DishImages)
+def dish_image_saved(instance, created: bool, update_fields, **kwargs) -> None:
+    """Render variants of uploaded image when transaction is committed."""
+    if created or (update_fields and "image" in update_fields):
+        image_id = instance.pk
+        transaction.on_commit(lambda: process_dish_image(image_id))
+
+
+@receiver(post_delete, sender=models.DishImages)
+def dish_image_deleted(instance, **kwargs) -> None:
+    """Delete image and its variants when transaction is committed."""
+    delete_files_on_commit(instance.image.storage, instance.get_file_names())
+
+
+@receiver(post_delete, sender=models.Category)
+@receiver(post_delete, sender=models.Dish)
+@receiver(post_delete, sender=models.DishImages)
+@receiver(post_delete, sender=models.StopList)
+def menu_row_deleted(instance, **kwargs) -> None:
+    """Remember deleted row, so clients remove it on sync."""
+    create_tombstone(instance)
+
+
+@receiver(post_save, sender=models.StopList)
+@receiver(post_delete, sender=models.StopList)
+def stop_list_changed(instance, **kwargs) -> None:
+    """Invalidate menu of restaurant when transaction is committed."""
+    restaurant_id = instance.restaurant_id
+    transaction.on_commit(lambda: invalidate_stop_list(restaurant_id))
+
+
+@receiver(post_save, sender=models.Order)
+@receiver(post_save, sender=models.OrderAndDishes)
+def status_changed(sender, instance, **kwargs) -> None:
+    """Send order or line to restaurant channel."""
+    notify_status_changed(sender, [instance.pk])
+
+
+@receiver(post_save, sender=models.OrderAndDishes)
+def order_line_created(instance, created: bool, **kwargs) -> None:
+    """Count sale of dish added to order."""
+    if created:
+        count_dish_sales([instance])
+
+
+@receiver(pre_delete, sender=models.Order)
+def order_deleting(instance, **kwargs) -> None:
+    """Remember status of order, whose lines are deleted with it."""
+    remember_deleted_order(instance)
+
+
+@receiver(post_delete, sender=models.OrderAndDishes)
+def order_line_deleted(instance, **kwargs) -> None:
+    """Uncount sale of deleted line, if its order wasn't cancelled."""
+    uncount_deleted_line(instance)
+
+
+@receiver(post_save, sender=models.StopList)
+def stop_list_created(instance, created: bool, **kwargs) -> None:
+    """Send dish added to stop list to restaurant channel."""
+    if created:
+        notify_stop_list_changed(instance, stopped=True)
+
+
+@receiver(post_delete, sender=models.StopList)
+def stop_list_deleted(instance, **kwargs) -> None:
+    """Send dish removed from stop list to restaurant channel."""
+    notify_stop_list_changed(instance, stopped=False)
+
+
+@receiver(post_migrate)
+def search_index_migrated(sender, using: str, **kwargs) -> None:
+    """Restore search triggers dropped when SQLite rebuilt dishes table."""
+    if sender.label == "orders":
+        restore_sqlite_search_triggers(using)
@@ -2,12 +2,13 @@ import pytest
 from django.urls import reverse_lazy
 from rest_framework import status
 
-from apps.orders.factories import CategoryFactory
+from apps.orders.factories import CategoryFactory, DishFactory, DishImagesFactory
 from apps.orders.models import Category
 
 pytestmark = pytest.mark.django_db
 
 COUNT_CATEGORIES = 3
+COUNT_DISHES = 5
 
 
 def test_create_category_by_manager(
@@ -280,3 +281,33 @@ def test_remove_category_by_not_auth(
         ),
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_read_category_dishes_queries(
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    category = CategoryFactory.create()
+    for dish in DishFactory.create_batch(size=COUNT_DISHES, category=category):
+        DishImagesFactory.create(dish=dish)
+    with django_assert_num_queries(4):
+        response = api_client.get(
+            reverse_lazy(
+                "api:categories-dishes",
+                kwargs={"pk": category.pk},
+            ),
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == COUNT_DISHES
+
+
+def test_read_category_dishes_not_found(
+    api_client,
+) -> None:
+    response = api_client.get(
+        reverse_lazy(
+            "api:categories-dishes",
+            kwargs={"pk": 0},
+        ),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,295 @@
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.db import transaction
+from django.urls import reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.orders.factories import (
+    DishFactory,
+    OrderAndDishesFactory,
+    RestaurantAndOrderFactory,
+    StopListFactory,
+)
+from apps.orders.models import Order, OrderAndDishes
+from apps.orders.services import get_order_version, notifications, transit
+from apps.users.factories import ClientFactory, EmployeeFactory, UserFactory
+from apps.users.models import Employee
+from config.asgi import application
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def get_communicator(user) -> WebsocketCommunicator:
+    return WebsocketCommunicator(
+        application,
+        f"ws/orders?token={AccessToken.for_user(user)}",
+    )
+
+
+@database_sync_to_async
+def start_cooking(line: OrderAndDishes) -> None:
+    with transaction.atomic():
+        transit(line, OrderAndDishes.Statuses.COOKING)
+
+
+@async_to_sync
+async def receive_line_change(user, line: OrderAndDishes) -> dict:
+    communicator = get_communicator(user)
+    connected, _ = await communicator.connect()
+    assert connected
+    await start_cooking(line)
+    response = await communicator.receive_json_from()
+    await communicator.disconnect()
+    return response
+
+
+def test_receive_line_status_by_cook(
+    cook,
+) -> None:
+    line = OrderAndDishesFactory.create(
+        order=RestaurantAndOrderFactory.create(restaurant=cook.restaurant).order,
+        status=OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+    )
+    response = receive_line_change(cook.user, line)
+    assert response == {
+        "type": "lines.changed",
+        "body": {
+            "lines": [{
+                "id": line.id,
+                "order": line.order_id,
+                "status": OrderAndDishes.Statuses.COOKING,
+                "employee": line.employee_id,
+            }],
+        },
+    }
+
+
+@async_to_sync
+async def receive_stop_list_change(user, restaurant) -> tuple:
+    communicator = get_communicator(user)
+    connected, _ = await communicator.connect()
+    assert connected
+    stop_list = await database_sync_to_async(StopListFactory.create)(
+        restaurant=restaurant,
+    )
+    response = await communicator.receive_json_from()
+    await communicator.disconnect()
+    return stop_list, response
+
+
+def test_receive_stop_list_by_waiter(
+    waiter,
+) -> None:
+    stop_list, response = receive_stop_list_change(
+        waiter.user,
+        waiter.restaurant,
+    )
+    assert response == {
+        "type": "stop_list.changed",
+        "body": {"dish": stop_list.dish_id, "stopped": True},
+    }
+
+
+@async_to_sync
+async def connect(user) -> bool:
+    communicator = get_communicator(user)
+    connected, _ = await communicator.connect()
+    await communicator.disconnect()
+    return connected
+
+
+def test_connect_by_client(
+    client,
+) -> None:
+    assert not connect(client.user)
+
+
+def test_connect_by_user_without_employee() -> None:
+    assert not connect(UserFactory.create())
+
+
+@database_sync_to_async
+def post(user, url: str, data: dict) -> dict:
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+    response = api_client.post(url, data=data, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.data
+
+
+@async_to_sync
+async def receive_new_order(user, author, url: str, data: dict) -> tuple:
+    communicator = get_communicator(user)
+    connected, _ = await communicator.connect()
+    assert connected
+    created = await post(author, url, data)
+    responses = [
+        await communicator.receive_json_from(),
+        await communicator.receive_json_from(),
+    ]
+    await communicator.disconnect()
+    return created, responses
+
+
+def assert_new_order_received(order: Order, responses: list) -> None:
+    line = order.dishes.get()
+    assert responses == [
+        {
+            "type": "orders.changed",
+            "body": {"orders": [{"id": order.id, "status": order.status}]},
+        },
+        {
+            "type": "lines.changed",
+            "body": {
+                "lines": [{
+                    "id": line.id,
+                    "order": order.id,
+                    "status": line.status,
+                    "employee": None,
+                }],
+            },
+        },
+    ]
+
+
+def test_receive_order_created_by_waiter(
+    cook,
+) -> None:
+    waiter = EmployeeFactory.create(
+        role=Employee.Roles.WAITER,
+        restaurant=cook.restaurant,
+    )
+    created, responses = receive_new_order(
+        cook.user,
+        waiter.user,
+        reverse_lazy("api:orders-list"),
+        {"dishes": [{"dish": DishFactory.create().id}]},
+    )
+    assert_new_order_received(Order.objects.get(id=created["id"]), responses)
+
+
+def test_receive_order_reserved_by_client(
+    cook,
+    client,
+) -> None:
+    created, responses = receive_new_order(
+        cook.user,
+        client.user,
+        reverse_lazy("api:restaurantAndOrders-list"),
+        {
+            "order": {"dishes": [{"dish": DishFactory.create().id}]},
+            "restaurant": cook.restaurant_id,
+            "arrival_time": timezone.now() + timedelta(hours=1),
+            "place_number": 1,
+        },
+    )
+    assert_new_order_received(
+        Order.objects.get(id=created["order"]["id"]),
+        responses,
+    )
+
+
+def get_tracking_communicator(user, order_id: int, since=None) -> WebsocketCommunicator:
+    query = f"token={AccessToken.for_user(user)}"
+    if since is not None:
+        query += f"&since={since}"
+    return WebsocketCommunicator(
+        application,
+        f"ws/orders/{order_id}/track?{query}",
+    )
+
+
+@async_to_sync
+async def receive_tracking(user, order_id: int) -> dict:
+    communicator = get_tracking_communicator(user, order_id)
+    connected, _ = await communicator.connect()
+    assert connected
+    response = await communicator.receive_json_from()
+    await communicator.disconnect()
+    return response
+
+
+def test_track_order_by_client(
+    client,
+) -> None:
+    line = OrderAndDishesFactory.create(
+        order__client=client,
+    )
+    response = receive_tracking(client.user, line.order_id)
+    assert response["type"] == "order.changed"
+    assert response["body"]["version"] == get_order_version(line.order_id)
+    assert response["body"]["status"] == line.order.status
+    assert response["body"]["lines"] == [{"id": line.id, "status": line.status}]
+
+
+@async_to_sync
+async def wait_tracking_change(user, line: OrderAndDishes) -> tuple:
+    since = await database_sync_to_async(get_order_version)(line.order_id)
+    communicator = get_tracking_communicator(user, line.order_id, since)
+    connected, _ = await communicator.connect()
+    assert connected
+    assert await communicator.receive_nothing()
+    await start_cooking(line)
+    response = await communicator.receive_json_from()
+    await communicator.disconnect()
+    return since, response
+
+
+def test_track_order_changed_while_waiting_by_client(
+    client,
+) -> None:
+    line = OrderAndDishesFactory.create(
+        order__client=client,
+        order__status=Order.Statuses.WAITING_FOR_COOKING,
+        status=OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+    )
+    since, response = wait_tracking_change(client.user, line)
+    assert response["type"] == "order.changed"
+    assert response["body"]["version"] > since
+    assert response["body"]["lines"] == [
+        {"id": line.id, "status": OrderAndDishes.Statuses.COOKING},
+    ]
+
+
+@async_to_sync
+async def connect_tracking(user, order_id: int) -> bool:
+    communicator = get_tracking_communicator(user, order_id)
+    connected, _ = await communicator.connect()
+    await communicator.disconnect()
+    return connected
+
+
+def test_track_order_by_other_client(
+    client,
+) -> None:
+    line = OrderAndDishesFactory.create(
+        order__client=ClientFactory.create(),
+    )
+    assert not connect_tracking(client.user, line.order_id)
+
+
+def test_create_order_without_channel_layer_by_waiter(
+    waiter,
+    monkeypatch,
+    caplog,
+) -> None:
+    def get_channel_layer():
+        raise ConnectionError("Channel layer is down")
+
+    monkeypatch.setattr(notifications, "get_channel_layer", get_channel_layer)
+    api_client = APIClient()
+    api_client.force_authenticate(user=waiter.user)
+    response = api_client.post(
+        reverse_lazy("api:orders-list"),
+        data={"dishes": [{"dish": DishFactory.create().id}]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert "Failed to send orders.changed" in caplog.text
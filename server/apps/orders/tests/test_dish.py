@@ -1,13 +1,17 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 from django.urls import reverse_lazy
 from rest_framework import status
 
-from apps.orders.factories import CategoryFactory, DishFactory
-from apps.orders.models import Dish
+from apps.orders.factories import CategoryFactory, DishFactory, DishImagesFactory
+from apps.orders.models import Dish, Ingredient, IngredientWord
 
 pytestmark = pytest.mark.django_db
 
 DISH_COUNT = 3
+IMAGES_PER_DISH_COUNT = 2
 
 
 def test_create_dish_by_manager(
@@ -360,3 +364,253 @@ def test_remove_dish_by_not_auth(
         ),
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.parametrize("page_size", [1, 5, 9])
+def test_read_dishes_queries(
+    page_size,
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    for dish in DishFactory.create_batch(size=page_size):
+        DishImagesFactory.create_batch(
+            size=IMAGES_PER_DISH_COUNT,
+            dish=dish,
+        )
+    with django_assert_num_queries(3):
+        response = api_client.get(
+            reverse_lazy("api:dishes-list"),
+            data={"page_size": page_size},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == page_size
+    assert all(
+        len(dish["images"]) == IMAGES_PER_DISH_COUNT
+        for dish in response.data["results"]
+    )
+
+
+def test_read_dish_queries(
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    dish = DishFactory.create()
+    DishImagesFactory.create_batch(
+        size=IMAGES_PER_DISH_COUNT,
+        dish=dish,
+    )
+    with django_assert_num_queries(2):
+        response = api_client.get(
+            reverse_lazy(
+                "api:dishes-detail",
+                kwargs={"pk": dish.pk},
+            ),
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["category"]["id"] == dish.category.pk
+
+
+def test_search_dishes(
+    api_client,
+) -> None:
+    by_name = DishFactory.create(name="Борщ украинский", compound="свекла")
+    by_compound = DishFactory.create(name="Суп дня", compound="борщевая основа")
+    DishFactory.create(name="Солянка", compound="мясо, оливки")
+    response = api_client.get(
+        reverse_lazy("api:dishes-search"),
+        data={"q": "БОРЩ"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 2
+    assert [item["id"] for item in response.data["results"]] == [
+        by_name.pk,
+        by_compound.pk,
+    ]
+    response = api_client.get(
+        reverse_lazy("api:dishes-search"),
+        data={"q": 'борщ" свекл*'},
+    )
+    assert [item["id"] for item in response.data["results"]] == [by_name.pk]
+
+
+def test_search_changed_dishes(
+    api_client,
+) -> None:
+    dish = DishFactory.create(name="Уха")
+    dish.name = "Уха по-фински"
+    dish.save()
+    response = api_client.get(
+        reverse_lazy("api:dishes-search"),
+        data={"q": "фински"},
+    )
+    assert [item["id"] for item in response.data["results"]] == [dish.pk]
+    dish.delete()
+    response = api_client.get(
+        reverse_lazy("api:dishes-search"),
+        data={"q": "уха"},
+    )
+    assert response.data["results"] == []
+
+
+def test_autocomplete_dishes(
+    api_client,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+) -> None:
+    caesar = DishFactory.create(name="Салат Цезарь")
+    DishFactory.create(name="Салат греческий")
+    cesar_roll = DishFactory.create(name="Цезарь ролл")
+    api_client.get(
+        reverse_lazy("api:dishes-autocomplete"),
+        data={"q": "warm up"},
+    )
+    with django_assert_num_queries(0):
+        response = api_client.get(
+            reverse_lazy("api:dishes-autocomplete"),
+            data={"q": "цез"},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == [
+        {"id": cesar_roll.pk, "name": "Цезарь ролл"},
+        {"id": caesar.pk, "name": "Салат Цезарь"},
+    ]
+    response = api_client.get(
+        reverse_lazy("api:dishes-autocomplete"),
+        data={"q": "салат цезр"},
+    )
+    assert response.data[0]["id"] == caesar.pk
+    with django_capture_on_commit_callbacks(execute=True):
+        caesar.name = "Салат Оливье"
+        caesar.save()
+    response = api_client.get(
+        reverse_lazy("api:dishes-autocomplete"),
+        data={"q": "оливье"},
+    )
+    assert response.data == [{"id": caesar.pk, "name": "Салат Оливье"}]
+    with django_capture_on_commit_callbacks(execute=True):
+        cesar_roll.delete()
+    response = api_client.get(
+        reverse_lazy("api:dishes-autocomplete"),
+        data={"q": "цезарь"},
+    )
+    assert response.data == []
+
+
+def test_filter_dishes_by_ingredients(api_client) -> None:
+    salad = DishFactory.create(
+        compound="Огурцы, томаты; грецкий орех (дробленый).",
+    )
+    cheesecake = DishFactory.create(compound="Сливочный сыр, сахар, яйца")
+    soup = DishFactory.create(compound="Томаты\nлук, ёлочная соль")
+    assert sorted(salad.ingredients.values_list("name", flat=True)) == [
+        "грецкий орех",
+        "дробленый",
+        "огурцы",
+        "томаты",
+    ]
+    response = api_client.get(
+        reverse_lazy("api:dishes-by-ingredients"),
+        data={"exclude": ["Грецкий  орех", "яйца"]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [dish["id"] for dish in response.data["results"]] == [soup.pk]
+    response = api_client.get(
+        reverse_lazy("api:dishes-by-ingredients"),
+        data={"include": ["томаты", "елочная соль"]},
+    )
+    assert [dish["id"] for dish in response.data["results"]] == [soup.pk]
+    cheesecake.compound = "Творог, сахар"
+    cheesecake.save()
+    response = api_client.get(
+        reverse_lazy("api:dishes-by-ingredients"),
+        data={"exclude": ["грецкий орех", "яйца"]},
+    )
+    assert [dish["id"] for dish in response.data["results"]] == [
+        cheesecake.pk,
+        soup.pk,
+    ]
+    nuts = DishFactory.create(compound="Мед, грецкие орехи")
+    assert sorted(
+        IngredientWord.objects.filter(
+            ingredient__name="грецкие орехи",
+        ).values_list("text", flat=True),
+    ) == ["грецкие орехи", "орехи"]
+    for name in ("орехи", "Орех", "грецкие орехи"):
+        response = api_client.get(
+            reverse_lazy("api:dishes-by-ingredients"),
+            data={"exclude": [name]},
+        )
+        assert nuts.pk not in [dish["id"] for dish in response.data["results"]]
+    response = api_client.get(
+        reverse_lazy("api:dishes-by-ingredients"),
+        data={"exclude": ["ехи"]},
+    )
+    assert nuts.pk in [dish["id"] for dish in response.data["results"]]
+    response = api_client.get(reverse_lazy("api:dishes-ingredients"))
+    assert "яйца" not in [
+        ingredient["name"] for ingredient in response.data["results"]
+    ]
+
+
+def test_reindex_ingredients_command() -> None:
+    dishes = DishFactory.create_batch(3, compound="мука, вода")
+    Dish.ingredients.through.objects.all().delete()
+    Ingredient.objects.all().delete()
+    stdout = StringIO()
+    call_command("reindex_ingredients", batch_size=2, stdout=stdout)
+    assert "Reindexed ingredients of 3 dishes" in stdout.getvalue()
+    for dish in dishes:
+        assert sorted(dish.ingredients.values_list("name", flat=True)) == [
+            "вода",
+            "мука",
+        ]
+
+
+def test_dish_facets(api_client, django_assert_num_queries) -> None:
+    soups = CategoryFactory.create(name="Супы")
+    salads = CategoryFactory.create(name="Салаты")
+    cheap_soup = DishFactory.create(category=soups, price=250, weight=300)
+    DishFactory.create(category=soups, price=450, weight=500)
+    cheap_salad = DishFactory.create(category=salads, price=200, weight=150)
+    DishFactory.create(category=salads, price=1200, weight=250)
+    # facets, page and images of page
+    with django_assert_num_queries(3):
+        response = api_client.get(
+            reverse_lazy("api:dishes-facets"),
+            data={"price_max": 300, "category": [soups.pk, salads.pk]},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 2
+    assert [dish["id"] for dish in response.data["results"]] == [
+        cheap_soup.pk,
+        cheap_salad.pk,
+    ]
+    facets = response.data["facets"]
+    assert facets["category"] == [
+        {"id": soups.pk, "count": 1},
+        {"id": salads.pk, "count": 1},
+    ]
+    assert [price["count"] for price in facets["price"]] == [2, 1, 0, 1]
+    assert [weight["count"] for weight in facets["weight"]] == [1, 1, 0]
+    response = api_client.get(
+        reverse_lazy("api:dishes-facets"),
+        data={"category": soups.pk, "weight_min": 200, "weight_max": 400},
+    )
+    assert [dish["id"] for dish in response.data["results"]] == [
+        cheap_soup.pk,
+    ]
+    facets = response.data["facets"]
+    assert facets["category"] == [
+        {"id": soups.pk, "count": 1},
+        {"id": salads.pk, "count": 1},
+    ]
+    assert [price["count"] for price in facets["price"]] == [1, 0, 0, 0]
+    assert [weight["count"] for weight in facets["weight"]] == [0, 1, 1]
+
+
+def test_dish_facets_invalid_range(api_client) -> None:
+    response = api_client.get(
+        reverse_lazy("api:dishes-facets"),
+        data={"price_min": 500, "price_max": 100},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,9 +1,14 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 from django.urls import reverse_lazy
 from rest_framework import status
 
 from apps.orders.factories import DishFactory, DishImagesFactory
 from apps.orders.models import Dish, DishImages
+from apps.orders.serializers import DishImageSerializer
+from apps.orders.services import process_dish_image
 
 pytestmark = pytest.mark.django_db
 
@@ -158,3 +163,80 @@ def test_delete_dish_images_by_not_auth(
         id__in=[image.id for image in dish_images]
     ).exists()
     assert Dish.objects.get(id=dish.id).images.all().exists()
+
+
+def test_create_dish_images_renders_variants_by_manager(
+    manager,
+    api_client,
+    settings,
+    django_capture_on_commit_callbacks,
+) -> None:
+    dish = DishFactory.create()
+    dish_image = DishImagesFactory.build(image__width=1200, image__height=800)
+    api_client.force_authenticate(user=manager.user)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            reverse_lazy("api:dish-images-list"),
+            data={"images": [dish_image.image], "dish": dish.pk},
+        )
+    assert response.status_code == status.HTTP_201_CREATED
+    image = DishImages.objects.get(dish=dish)
+    assert (image.width, image.height) == (1200, 800)
+    assert set(image.variants) == set(settings.DISH_IMAGE_VARIANTS)
+    for name, width in settings.DISH_IMAGE_VARIANTS.items():
+        variant = image.variants[name]
+        assert variant["name"].endswith(f"_{name}.webp")
+        assert variant["width"] == width
+        assert image.image.storage.exists(variant["name"])
+    srcset = DishImageSerializer(image).data["srcset"]
+    assert [source["width"] for source in srcset] == sorted(
+        [*settings.DISH_IMAGE_VARIANTS.values(), 1200],
+    )
+
+
+def test_process_dish_images_command(settings) -> None:
+    dish_image = DishImagesFactory.create(image__width=100, image__height=50)
+    assert dish_image.variants == {}
+    call_command("process_dish_images", stdout=StringIO())
+    dish_image.refresh_from_db()
+    assert set(dish_image.variants) == set(settings.DISH_IMAGE_VARIANTS)
+    assert all(
+        (variant["width"], variant["height"]) == (100, 50)
+        for variant in dish_image.variants.values()
+    )
+
+
+def test_dish_image_with_missing_file(api_client) -> None:
+    dish_image = DishImagesFactory.create()
+    DishImages.objects.filter(pk=dish_image.pk).update(
+        image="dishes/legacy_1/missing.jpg",
+        width=None,
+        height=None,
+    )
+    response = api_client.get(reverse_lazy("api:dishes-list"))
+    assert response.status_code == status.HTTP_200_OK
+    call_command("process_dish_images", stdout=StringIO())
+    dish_image.refresh_from_db()
+    assert dish_image.variants == {}
+    assert dish_image.width is None
+
+
+def test_delete_dish_deletes_images_by_manager(
+    manager,
+    api_client,
+    django_capture_on_commit_callbacks,
+) -> None:
+    dish_image = DishImagesFactory.create()
+    process_dish_image(dish_image.pk, eager=True)
+    dish_image.refresh_from_db()
+    names = dish_image.get_file_names()
+    storage = dish_image.image.storage
+    assert len(names) == 3
+    assert all(storage.exists(name) for name in names)
+    api_client.force_authenticate(user=manager.user)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.delete(
+            reverse_lazy("api:dishes-detail", kwargs={"pk": dish_image.dish.pk}),
+        )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert not any(storage.exists(name) for name in names)
@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from apps.orders.factories import DishImagesFactory
+from apps.orders.services import process_dish_image
+from apps.reviews.factories import ReviewImagesFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def sweep_media(*args) -> str:
+    stdout = StringIO()
+    call_command("sweep_media", "--min-age=0", *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+def test_sweep_media() -> None:
+    dish_image = DishImagesFactory.create()
+    process_dish_image(dish_image.pk, eager=True)
+    dish_image.refresh_from_db()
+    review_image = ReviewImagesFactory.create()
+    orphans = [
+        default_storage.save("dishes/orphan.png", ContentFile(b"orphan")),
+        default_storage.save("orphan.txt", ContentFile(b"orphan")),
+    ]
+    referenced = [
+        *dish_image.get_file_names(),
+        review_image.image.name,
+    ]
+    output = sweep_media("--dry-run", "--batch-size=2")
+    assert all(name in output for name in orphans)
+    assert all(default_storage.exists(name) for name in orphans)
+    output = sweep_media("--batch-size=2")
+    assert f"Deleted 2 orphaned of {len(orphans) + len(referenced)}" in output
+    assert not any(default_storage.exists(name) for name in orphans)
+    assert all(default_storage.exists(name) for name in referenced)
+
+
+def test_sweep_media_skips_new_files() -> None:
+    name = default_storage.save("orphan.txt", ContentFile(b"orphan"))
+    stdout = StringIO()
+    call_command("sweep_media", stdout=stdout)
+    assert "Deleted 0 orphaned of 1" in stdout.getvalue()
+    assert default_storage.exists(name)
@@ -0,0 +1,229 @@
+import pytest
+from django.urls import reverse_lazy
+from rest_framework import status
+
+from apps.orders.factories import (
+    CategoryFactory,
+    DishFactory,
+    DishImagesFactory,
+    StopListFactory,
+)
+from apps.restaurants.factories import RestaurantFactory
+
+pytestmark = pytest.mark.django_db
+
+DISHES_COUNT = 3
+
+
+def test_read_menu(
+    api_client,
+) -> None:
+    category = CategoryFactory.create()
+    dishes = DishFactory.create_batch(
+        size=DISHES_COUNT,
+        category=category,
+    )
+    DishImagesFactory.create(dish=dishes[0])
+    response = api_client.get(
+        reverse_lazy("api:menu-list"),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] == f'"menu-{response.data["version"]}"'
+    categories = response.data["categories"]
+    assert [item["id"] for item in categories] == [category.pk]
+    assert len(categories[0]["dishes"]) == DISHES_COUNT
+    assert len(categories[0]["dishes"][0]["images"]) == 1
+
+
+def test_read_menu_queries(
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    for category in CategoryFactory.create_batch(size=DISHES_COUNT):
+        for dish in DishFactory.create_batch(size=DISHES_COUNT, category=category):
+            DishImagesFactory.create(dish=dish)
+    with django_assert_num_queries(3):
+        response = api_client.get(
+            reverse_lazy("api:menu-list"),
+        )
+    assert response.status_code == status.HTTP_200_OK
+    with django_assert_num_queries(0):
+        response = api_client.get(
+            reverse_lazy("api:menu-list"),
+        )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_read_menu_not_modified(
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    DishFactory.create_batch(size=DISHES_COUNT)
+    response = api_client.get(
+        reverse_lazy("api:menu-list"),
+    )
+    with django_assert_num_queries(0):
+        response = api_client.get(
+            reverse_lazy("api:menu-list"),
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_read_menu_after_dish_update(
+    api_client,
+    django_capture_on_commit_callbacks,
+) -> None:
+    dish = DishFactory.create()
+    response = api_client.get(
+        reverse_lazy("api:menu-list"),
+    )
+    etag = response["ETag"]
+    new_name = "New name"
+    with django_capture_on_commit_callbacks(execute=True):
+        dish.name = new_name
+        dish.save()
+    response = api_client.get(
+        reverse_lazy("api:menu-list"),
+        HTTP_IF_NONE_MATCH=etag,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+    assert response.data["categories"][0]["dishes"][0]["name"] == new_name
+
+
+def test_read_menu_after_image_delete(
+    api_client,
+    django_capture_on_commit_callbacks,
+) -> None:
+    image = DishImagesFactory.create()
+    response = api_client.get(
+        reverse_lazy("api:menu-list"),
+    )
+    etag = response["ETag"]
+    with django_capture_on_commit_callbacks(execute=True):
+        image.delete()
+    response = api_client.get(
+        reverse_lazy("api:menu-list"),
+        HTTP_IF_NONE_MATCH=etag,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["categories"][0]["dishes"][0]["images"] == []
+
+
+def test_read_restaurant_menu(
+    api_client,
+) -> None:
+    dishes = DishFactory.create_batch(size=DISHES_COUNT)
+    stop_list = StopListFactory.create(dish=dishes[0])
+    StopListFactory.create(dish=dishes[1])
+    response = api_client.get(
+        reverse_lazy(
+            "api:menu-detail",
+            kwargs={"pk": stop_list.restaurant_id},
+        ),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["restaurant"] == stop_list.restaurant_id
+    assert sorted(
+        dish["id"]
+        for category in response.data["categories"]
+        for dish in category["dishes"]
+    ) == [dish.id for dish in dishes[1:]]
+
+
+def test_read_restaurant_menu_queries(
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    restaurant = RestaurantFactory.create()
+    DishFactory.create_batch(size=DISHES_COUNT)
+    url = reverse_lazy(
+        "api:menu-detail",
+        kwargs={"pk": restaurant.pk},
+    )
+    api_client.get(reverse_lazy("api:menu-list"))
+    with django_assert_num_queries(2):
+        response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    with django_assert_num_queries(0):
+        response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_read_restaurant_menu_after_stop_list_change(
+    api_client,
+    django_capture_on_commit_callbacks,
+) -> None:
+    dish = DishFactory.create()
+    restaurant = RestaurantFactory.create()
+    url = reverse_lazy(
+        "api:menu-detail",
+        kwargs={"pk": restaurant.pk},
+    )
+    etag = api_client.get(url)["ETag"]
+    with django_capture_on_commit_callbacks(execute=True):
+        StopListFactory.create(dish=dish, restaurant=restaurant)
+    response = api_client.get(
+        url,
+        HTTP_IF_NONE_MATCH=etag,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["categories"] == []
+
+
+def test_read_missing_restaurant_menu(
+    api_client,
+) -> None:
+    response = api_client.get(
+        reverse_lazy(
+            "api:menu-detail",
+            kwargs={"pk": 0},
+        ),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_read_menu_changes(
+    api_client,
+    settings,
+) -> None:
+    settings.MENU_CHANGES_OVERLAP = 0
+    dishes = DishFactory.create_batch(size=DISHES_COUNT)
+    stop_list = StopListFactory.create(dish=dishes[1])
+    response = api_client.get(
+        reverse_lazy("api:menu-changes"),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["full"]
+    assert {item["id"] for item in response.data["dishes"]} >= {
+        dish.pk for dish in dishes
+    }
+    dishes[0].price += 1
+    dishes[0].save()
+    stop_list_id = stop_list.pk
+    stop_list.delete()
+    response = api_client.get(
+        reverse_lazy("api:menu-changes"),
+        data={"since": response.data["token"]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.data["full"]
+    assert [item["id"] for item in response.data["dishes"]] == [dishes[0].pk]
+    assert response.data["categories"] == []
+    assert response.data["stop_list"] == []
+    assert response.data["deleted"]["stop_list"] == [stop_list_id]
+    assert response.data["deleted"]["dishes"] == []
+
+
+def test_read_menu_changes_with_expired_token(
+    api_client,
+) -> None:
+    DishFactory.create()
+    response = api_client.get(
+        reverse_lazy("api:menu-changes"),
+        data={"since": 1},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["full"]
+    assert len(response.data["dishes"]) == 1
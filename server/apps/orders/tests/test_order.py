@@ -1,9 +1,22 @@
+from datetime import timedelta
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
+from django.utils import timezone
 from rest_framework import status
 
-from apps.orders.factories import DishFactory, OrderAndDishesFactory, OrderFactory
-from apps.orders.models import Order
+from apps.orders.factories import (
+    DishFactory,
+    OrderAndDishesFactory,
+    OrderFactory,
+    StopListFactory,
+)
+from apps.orders.models import DishSales, Order, OrderAndDishes
+from apps.orders.services import count_dish_sales, get_stopped_dish_ids, transit
 from apps.users.factories import ClientFactory, EmployeeFactory
 
 pytestmark = pytest.mark.django_db
@@ -47,6 +60,33 @@ def test_create_order_by_waiter(
     ).exists()
 
 
+def test_create_order_with_stopped_dishes_by_waiter(
+    waiter,
+    api_client,
+) -> None:
+    dishes = DishFactory.create_batch(
+        size=DISHES_COUNT,
+    )
+    for dish in dishes[:2]:
+        StopListFactory.create(dish=dish, restaurant=waiter.restaurant)
+    stopped = sorted(dish.pk for dish in dishes[:2])
+    api_client.force_authenticate(user=waiter.user)
+    response = api_client.post(
+        reverse_lazy("api:orders-list"),
+        data={
+            "comment": "Some comment",
+            "dishes": [{"dish": dish.id} for dish in dishes],
+        },
+        format='json',
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert (
+        f"Блюда {stopped[0]}, {stopped[1]} в стоп листе ресторана"
+        in response.data["message"]
+    )
+    assert not Order.objects.exists()
+
+
 def test_update_order_by_cook_failed(
     cook,
     waiter,
@@ -85,6 +125,7 @@ def test_update_order_by_cook_success(
     order = OrderFactory.create(
         employee=waiter,
         price=sum([dish.price for dish in dishes]),
+        status=Order.Statuses.WAITING_FOR_COOKING,
     )
     api_client.force_authenticate(user=cook.user)
     new_comment = "New some comment"
@@ -107,6 +148,30 @@ def test_update_order_by_cook_success(
     ).exists()
 
 
+def test_update_order_illegal_transition(
+    cook,
+    waiter,
+    api_client,
+) -> None:
+    order = OrderFactory.create(
+        employee=waiter,
+        status=Order.Statuses.FINISHED,
+    )
+    api_client.force_authenticate(user=cook.user)
+    response = api_client.patch(
+        reverse_lazy(
+            "api:orders-detail",
+            kwargs={"pk": order.pk},
+        ),
+        data={
+            "status": Order.Statuses.COOKING,
+        },
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    order.refresh_from_db()
+    assert order.status == Order.Statuses.FINISHED
+
+
 def test_read_orders_by_waiter(
     waiter,
     api_client,
@@ -400,3 +465,313 @@ def test_remove_order_by_not_auth(
         ),
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_read_orders_queries_by_waiter(
+    waiter,
+    api_client,
+) -> None:
+    dishes = DishFactory.create_batch(
+        size=DISHES_COUNT,
+    )
+    orders = OrderFactory.create_batch(
+        size=ORDERS_COUNT,
+    )
+    for order in orders:
+        OrderAndDishesFactory.create(dish=dishes[0], order=order)
+    api_client.force_authenticate(user=waiter.user)
+    api_client.get(
+        reverse_lazy("api:orders-list"),
+    )
+    with CaptureQueriesContext(connection) as few_lines_context:
+        response = api_client.get(
+            reverse_lazy("api:orders-list"),
+        )
+    assert response.status_code == status.HTTP_200_OK
+    for order in orders:
+        for dish in dishes:
+            OrderAndDishesFactory.create(dish=dish, order=order)
+    with CaptureQueriesContext(connection) as many_lines_context:
+        response = api_client.get(
+            reverse_lazy("api:orders-list"),
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert all(
+        len(order["dishes"]) == DISHES_COUNT + 1
+        for order in response.data["results"]
+    )
+    assert len(few_lines_context) == len(many_lines_context)
+
+
+def test_create_order_queries_by_waiter(
+    waiter,
+    api_client,
+) -> None:
+    dishes = DishFactory.create_batch(
+        size=DISHES_COUNT,
+    )
+    client = ClientFactory.create()
+    api_client.force_authenticate(user=waiter.user)
+    api_client.get(
+        reverse_lazy("api:orders-list"),
+    )
+    get_stopped_dish_ids(waiter.restaurant_id)
+    contexts = []
+    for dishes_slice in (dishes[:1], dishes):
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(
+                reverse_lazy("api:orders-list"),
+                data={
+                    "client": client.pk,
+                    "dishes": [
+                        {"dish": dish.id, "comment": "some comment"}
+                        for dish in dishes_slice
+                    ],
+                },
+                format='json',
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        contexts.append(context)
+    assert len(contexts[0]) == len(contexts[1])
+    assert Order.objects.get(id=response.data["id"]).price == sum(
+        [dish.price for dish in dishes],
+    )
+
+
+def test_create_order_with_missing_dishes_by_waiter(
+    waiter,
+    api_client,
+) -> None:
+    dish = DishFactory.create()
+    missing_ids = [dish.id + 100, dish.id + 200]
+    api_client.force_authenticate(user=waiter.user)
+    response = api_client.post(
+        reverse_lazy("api:orders-list"),
+        data={
+            "dishes": [
+                {"dish": dish_id, "comment": "some comment"}
+                for dish_id in [dish.id, *missing_ids]
+            ],
+        },
+        format='json',
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert f'"{missing_ids[0]}, {missing_ids[1]}"' in response.data["message"]
+
+
+def test_read_order_statuses_by_client(
+    client,
+    api_client,
+) -> None:
+    line = OrderAndDishesFactory.create(
+        order=OrderFactory.create(client=client),
+    )
+    api_client.force_authenticate(user=client.user)
+    response = api_client.get(
+        reverse_lazy(
+            "api:orders-statuses",
+            kwargs={"pk": line.order.pk},
+        ),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["status"] == line.order.status
+    assert response.data["lines"] == [{"id": line.id, "status": line.status}]
+
+
+def test_read_order_statuses_not_modified_by_client(
+    client,
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    order = OrderFactory.create(client=client)
+    api_client.force_authenticate(user=client.user)
+    url = reverse_lazy(
+        "api:orders-statuses",
+        kwargs={"pk": order.pk},
+    )
+    version = api_client.get(url).data["version"]
+    with django_assert_num_queries(0):
+        response = api_client.get(
+            url,
+            data={"since": version},
+        )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_read_order_statuses_changed_by_client(
+    client,
+    api_client,
+    django_capture_on_commit_callbacks,
+) -> None:
+    order = OrderFactory.create(
+        client=client,
+        status=Order.Statuses.WAITING_FOR_COOKING,
+    )
+    api_client.force_authenticate(user=client.user)
+    url = reverse_lazy(
+        "api:orders-statuses",
+        kwargs={"pk": order.pk},
+    )
+    version = api_client.get(url).data["version"]
+    with django_capture_on_commit_callbacks(execute=True):
+        transit(order, Order.Statuses.COOKING)
+    response = api_client.get(
+        url,
+        data={"since": version},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["version"] > version
+    assert response.data["status"] == Order.Statuses.COOKING
+
+
+def test_read_order_statuses_by_other_client(
+    client,
+    api_client,
+) -> None:
+    order = OrderFactory.create(client=ClientFactory.create())
+    api_client.force_authenticate(user=client.user)
+    response = api_client.get(
+        reverse_lazy(
+            "api:orders-statuses",
+            kwargs={"pk": order.pk},
+        ),
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_read_orders_pages_by_waiter(
+    waiter,
+    api_client,
+) -> None:
+    orders = OrderFactory.create_batch(
+        size=ORDERS_COUNT,
+    )
+    api_client.force_authenticate(user=waiter.user)
+    response = api_client.get(
+        reverse_lazy("api:orders-list"),
+        data={"page_size": 2},
+    )
+    ids = [order["id"] for order in response.data["results"]]
+    while response.data["links"]["next"]:
+        response = api_client.get(response.data["links"]["next"])
+        ids += [order["id"] for order in response.data["results"]]
+    assert ids == [order.id for order in orders]
+
+
+def test_popular_dishes_counted_by_orders(
+    waiter,
+    api_client,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+) -> None:
+    soup, salad, tea = DishFactory.create_batch(3)
+    api_client.force_authenticate(user=waiter.user)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            reverse_lazy("api:orders-list"),
+            data={
+                "dishes": [
+                    {"dish": soup.id},
+                    {"dish": soup.id},
+                    {"dish": salad.id},
+                ],
+            },
+            format='json',
+        )
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(
+            reverse_lazy("api:orders-list"),
+            data={"dishes": [{"dish": salad.id}, {"dish": tea.id}]},
+            format='json',
+        )
+    cancelled = Order.objects.get(id=response.data["id"])
+    with django_capture_on_commit_callbacks(execute=True):
+        transit(cancelled, Order.Statuses.CANCEL)
+    with django_capture_on_commit_callbacks(execute=True):
+        cancelled.delete()
+    # counters with dishes and categories, images of dishes
+    with django_assert_num_queries(2):
+        response = api_client.get(
+            reverse_lazy("api:dishes-popular"),
+            data={"window": "day"},
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        (item["dish"]["id"], item["sales"]) for item in response.data
+    ] == [(salad.pk, 1), (tea.pk, 1)]
+
+
+def test_delete_dish_of_counted_lines_by_manager(
+    manager,
+    api_client,
+    django_capture_on_commit_callbacks,
+) -> None:
+    line = OrderAndDishesFactory.create(
+        order__status=Order.Statuses.WAITING_FOR_COOKING,
+    )
+    api_client.force_authenticate(user=manager.user)
+    with django_capture_on_commit_callbacks(execute=True):
+        count_dish_sales([line])
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.delete(
+            reverse_lazy("api:dishes-detail", kwargs={"pk": line.dish_id}),
+        )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert not DishSales.objects.filter(dish=line.dish_id).exists()
+
+
+def get_order_delete_queries(
+    lines_count: int,
+    django_capture_on_commit_callbacks,
+) -> int:
+    dish = DishFactory.create()
+    order = OrderFactory.create(status=Order.Statuses.WAITING_FOR_COOKING)
+    with django_capture_on_commit_callbacks(execute=True):
+        OrderAndDishesFactory.create_batch(lines_count, order=order, dish=dish)
+    with CaptureQueriesContext(connection) as queries:
+        with django_capture_on_commit_callbacks(execute=True):
+            order.delete()
+    assert DishSales.objects.get(dish=dish).total == 0
+    return len(queries)
+
+
+def test_delete_order_uncounts_lines_in_fixed_queries(
+    django_capture_on_commit_callbacks,
+) -> None:
+    assert get_order_delete_queries(
+        1,
+        django_capture_on_commit_callbacks,
+    ) == get_order_delete_queries(
+        4,
+        django_capture_on_commit_callbacks,
+    )
+
+
+def test_reconcile_dish_sales_command(
+    django_capture_on_commit_callbacks,
+) -> None:
+    dish = DishFactory.create()
+    with django_capture_on_commit_callbacks(execute=True):
+        OrderAndDishesFactory.create_batch(
+            2,
+            dish=dish,
+            order__status=Order.Statuses.WAITING_FOR_COOKING,
+        )
+    # line created before lines got creation time
+    OrderAndDishesFactory.create(
+        dish=dish,
+        created=None,
+        order__status=Order.Statuses.WAITING_FOR_COOKING,
+    )
+    cancelled = OrderAndDishesFactory.create(dish=dish)
+    Order.objects.filter(pk=cancelled.order_id).update(
+        status=Order.Statuses.CANCEL,
+    )
+    OrderAndDishes.objects.filter(
+        pk=OrderAndDishes.objects.filter(dish=dish).order_by("id")[0].pk,
+    ).update(created=timezone.now() - timedelta(days=3))
+    stdout = StringIO()
+    call_command("reconcile_dish_sales", stdout=stdout)
+    assert "Reconciled sales of 1 dishes" in stdout.getvalue()
+    sales = DishSales.objects.get(dish=dish)
+    assert (sales.total, sales.day, sales.week, sales.month) == (3, 1, 2, 2)
@@ -1,14 +1,25 @@
 import pytest
+from django.db import connection
 from django.urls import reverse_lazy
 from rest_framework import status
 
-from apps.orders.factories import DishFactory, OrderAndDishesFactory, OrderFactory
+from apps.core.exceptions import ConflictError
+from apps.orders.factories import (
+    CategoryFactory,
+    DishFactory,
+    OrderAndDishesFactory,
+    OrderFactory,
+    RestaurantAndOrderFactory,
+)
 from apps.orders.models import Dish, Order, OrderAndDishes
+from apps.orders.services import get_kitchen_queue, transit
 from apps.users.factories import EmployeeFactory
 from apps.users.models import Employee
 
 pytestmark = pytest.mark.django_db
 
+FINISHED_LINES_COUNT = 300
+
 
 def test_create_order_and_dishes_by_cook(
     cook,
@@ -61,7 +72,7 @@ def test_update_order_and_dishes_by_cook_success(
         status=OrderAndDishes.Statuses.COOKING,
     )
     api_client.force_authenticate(user=cook.user)
-    new_status = OrderAndDishes.Statuses.DELIVERIED
+    new_status = OrderAndDishes.Statuses.DONE
     response = api_client.patch(
         reverse_lazy(
             "api:orderAndDishes-detail",
@@ -80,6 +91,43 @@ def test_update_order_and_dishes_by_cook_success(
     ).exists()
 
 
+def test_update_order_and_dishes_illegal_transition(
+    cook,
+    api_client,
+) -> None:
+    order_and_dishes = OrderAndDishesFactory.create(
+        status=OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+    )
+    api_client.force_authenticate(user=cook.user)
+    response = api_client.patch(
+        reverse_lazy(
+            "api:orderAndDishes-detail",
+            kwargs={"pk": order_and_dishes.pk},
+        ),
+        data={
+            "status": OrderAndDishes.Statuses.DELIVERED,
+        },
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    order_and_dishes.refresh_from_db()
+    assert order_and_dishes.status == OrderAndDishes.Statuses.WAITING_FOR_COOKING
+
+
+def test_transit_order_and_dishes_conflict() -> None:
+    order_and_dishes = OrderAndDishesFactory.create(
+        status=OrderAndDishes.Statuses.COOKING,
+    )
+    OrderAndDishes.objects.filter(
+        pk=order_and_dishes.pk,
+    ).update(
+        status=OrderAndDishes.Statuses.DONE,
+    )
+    with pytest.raises(ConflictError):
+        transit(order_and_dishes, OrderAndDishes.Statuses.WAITING_FOR_COOKING)
+    order_and_dishes.refresh_from_db()
+    assert order_and_dishes.status == OrderAndDishes.Statuses.DONE
+
+
 def test_update_order_and_dishes_by_chef_success(
     chef,
     api_client,
@@ -146,7 +194,7 @@ def test_update_order_and_dishes_by_chef_failed(
         status=OrderAndDishes.Statuses.COOKING,
     )
     api_client.force_authenticate(user=chef.user)
-    new_status = OrderAndDishes.Statuses.DELIVERIED
+    new_status = OrderAndDishes.Statuses.DONE
     response = api_client.patch(
         reverse_lazy(
             "api:orderAndDishes-detail",
@@ -167,7 +215,7 @@ def test_update_order_and_dishes_by_sous_chef_failed(
         status=OrderAndDishes.Statuses.COOKING,
     )
     api_client.force_authenticate(user=sous_chef.user)
-    new_status = OrderAndDishes.Statuses.DELIVERIED
+    new_status = OrderAndDishes.Statuses.DONE
     response = api_client.patch(
         reverse_lazy(
             "api:orderAndDishes-detail",
@@ -292,7 +340,7 @@ def test_update_order_and_dishes_by_waiter_failed(
         status=OrderAndDishes.Statuses.COOKING,
     )
     api_client.force_authenticate(user=waiter.user)
-    new_status = OrderAndDishes.Statuses.DELIVERIED
+    new_status = OrderAndDishes.Statuses.DONE
     response = api_client.patch(
         reverse_lazy(
             "api:orderAndDishes-detail",
@@ -363,7 +411,7 @@ def test_update_order_and_dishes_by_client(
         status=OrderAndDishes.Statuses.COOKING,
     )
     api_client.force_authenticate(user=client.user)
-    new_status = OrderAndDishes.Statuses.DELIVERIED
+    new_status = OrderAndDishes.Statuses.DONE
     response = api_client.patch(
         reverse_lazy(
             "api:orderAndDishes-detail",
@@ -428,7 +476,7 @@ def test_update_order_and_dishes_by_not_auth(
     order_and_dishes = OrderAndDishesFactory.create(
         status=OrderAndDishes.Statuses.COOKING,
     )
-    new_status = OrderAndDishes.Statuses.DELIVERIED
+    new_status = OrderAndDishes.Statuses.DONE
     response = api_client.patch(
         reverse_lazy(
             "api:orderAndDishes-detail",
@@ -452,3 +500,270 @@ def test_delete_order_and_dishes_by_not_auth(
         ),
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def create_queue_lines(restaurant) -> list:
+    order = RestaurantAndOrderFactory.create(restaurant=restaurant).order
+    lines = [
+        OrderAndDishesFactory.create(order=order, status=status)
+        for status in (
+            OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+            OrderAndDishes.Statuses.COOKING,
+            OrderAndDishes.Statuses.DONE,
+            OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+        )
+    ]
+    return [line for line in lines if line.status in OrderAndDishes.ACTIVE_STATUSES]
+
+
+def test_read_kitchen_queue_by_cook(
+    cook,
+    api_client,
+) -> None:
+    lines = create_queue_lines(cook.restaurant)
+    create_queue_lines(RestaurantAndOrderFactory.create().restaurant)
+    api_client.force_authenticate(user=cook.user)
+    response = api_client.get(
+        reverse_lazy("api:orderAndDishes-queue"),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data["results"]] == [
+        line.id for line in lines
+    ]
+    assert response.data["results"][0]["dish_name"] == lines[0].dish.name
+
+
+def test_read_kitchen_queue_pages_by_chef(
+    chef,
+    api_client,
+) -> None:
+    lines = create_queue_lines(chef.restaurant)
+    api_client.force_authenticate(user=chef.user)
+    response = api_client.get(
+        reverse_lazy("api:orderAndDishes-queue"),
+        data={"page_size": 2},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data["results"]] == [
+        line.id for line in lines[:2]
+    ]
+    response = api_client.get(response.data["links"]["next"])
+    assert [item["id"] for item in response.data["results"]] == [
+        line.id for line in lines[2:]
+    ]
+    assert response.data["links"]["next"] is None
+
+
+def test_read_kitchen_queue_by_waiter(
+    waiter,
+    api_client,
+) -> None:
+    api_client.force_authenticate(user=waiter.user)
+    response = api_client.get(
+        reverse_lazy("api:orderAndDishes-queue"),
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def create_unassigned_lines(restaurant, size: int) -> list:
+    order = RestaurantAndOrderFactory.create(restaurant=restaurant).order
+    return OrderAndDishesFactory.create_batch(
+        size=size,
+        order=order,
+        employee=None,
+        status=OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+    )
+
+
+def test_claim_line_by_cook(
+    cook,
+    api_client,
+) -> None:
+    OrderAndDishesFactory.create(
+        order=RestaurantAndOrderFactory.create(restaurant=cook.restaurant).order,
+        status=OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+    )
+    create_unassigned_lines(RestaurantAndOrderFactory.create().restaurant, 1)
+    lines = create_unassigned_lines(cook.restaurant, 2)
+    api_client.force_authenticate(user=cook.user)
+    for line in lines:
+        response = api_client.post(
+            reverse_lazy("api:orderAndDishes-claim"),
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["id"] == line.id
+        assert OrderAndDishes.objects.filter(
+            id=line.id,
+            employee=cook,
+            status=OrderAndDishes.Statuses.COOKING,
+        ).exists()
+    response = api_client.post(
+        reverse_lazy("api:orderAndDishes-claim"),
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_claim_line_by_category(
+    cook,
+    api_client,
+) -> None:
+    lines = create_unassigned_lines(cook.restaurant, 2)
+    category = CategoryFactory.create(name="Claimed category")
+    Dish.objects.filter(id=lines[1].dish_id).update(category=category)
+    api_client.force_authenticate(user=cook.user)
+    response = api_client.post(
+        reverse_lazy("api:orderAndDishes-claim"),
+        data={"categories": [category.id]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["id"] == lines[1].id
+
+
+def test_claim_line_by_waiter(
+    waiter,
+    api_client,
+) -> None:
+    create_unassigned_lines(waiter.restaurant, 1)
+    api_client.force_authenticate(user=waiter.user)
+    response = api_client.post(
+        reverse_lazy("api:orderAndDishes-claim"),
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_bulk_status_by_waiter(
+    waiter,
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    order = RestaurantAndOrderFactory.create(restaurant=waiter.restaurant).order
+    done_lines = OrderAndDishesFactory.create_batch(
+        size=2,
+        order=order,
+        status=OrderAndDishes.Statuses.DONE,
+    )
+    cooking_line = OrderAndDishesFactory.create(
+        order=order,
+        status=OrderAndDishes.Statuses.COOKING,
+    )
+    missing_id = cooking_line.id + 1
+    api_client.force_authenticate(user=waiter.user)
+    api_client.get(reverse_lazy("api:orderAndDishes-queue"))
+    with django_assert_num_queries(4):
+        response = api_client.post(
+            reverse_lazy("api:orderAndDishes-bulk-status"),
+            data={
+                "ids": [line.id for line in done_lines] + [
+                    cooking_line.id,
+                    missing_id,
+                ],
+                "status": OrderAndDishes.Statuses.DELIVERED,
+            },
+            format="json",
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == [
+        {"id": done_lines[0].id, "result": "updated"},
+        {"id": done_lines[1].id, "result": "updated"},
+        {"id": cooking_line.id, "result": "conflict"},
+        {"id": missing_id, "result": "not_found"},
+    ]
+    assert OrderAndDishes.objects.filter(
+        status=OrderAndDishes.Statuses.DELIVERED,
+    ).count() == len(done_lines)
+
+
+def test_bulk_status_of_other_restaurant_by_cook(
+    cook,
+    api_client,
+) -> None:
+    other_line = OrderAndDishesFactory.create(
+        order=RestaurantAndOrderFactory.create().order,
+        status=OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+    )
+    api_client.force_authenticate(user=cook.user)
+    response = api_client.post(
+        reverse_lazy("api:orderAndDishes-bulk-status"),
+        data={
+            "ids": [other_line.id],
+            "status": OrderAndDishes.Statuses.COOKING,
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == [
+        {"id": other_line.id, "result": "not_found"},
+    ]
+    other_line.refresh_from_db()
+    assert other_line.status == OrderAndDishes.Statuses.WAITING_FOR_COOKING
+
+
+def test_bulk_status_by_waiter_failed(
+    waiter,
+    api_client,
+) -> None:
+    line = OrderAndDishesFactory.create(
+        status=OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+    )
+    api_client.force_authenticate(user=waiter.user)
+    response = api_client.post(
+        reverse_lazy("api:orderAndDishes-bulk-status"),
+        data={
+            "ids": [line.id],
+            "status": OrderAndDishes.Statuses.COOKING,
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_bulk_status_by_chef(
+    chef,
+    api_client,
+) -> None:
+    line = OrderAndDishesFactory.create(
+        status=OrderAndDishes.Statuses.WAITING_FOR_COOKING,
+    )
+    api_client.force_authenticate(user=chef.user)
+    response = api_client.post(
+        reverse_lazy("api:orderAndDishes-bulk-status"),
+        data={
+            "ids": [line.id],
+            "status": OrderAndDishes.Statuses.COOKING,
+        },
+        format="json",
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="SQLite doesn't match partial index with query parameters",
+)
+def test_kitchen_queue_uses_active_lines_index(
+    cook,
+) -> None:
+    order = RestaurantAndOrderFactory.create(restaurant=cook.restaurant).order
+    dish = DishFactory.create()
+    OrderAndDishes.objects.bulk_create(
+        [
+            OrderAndDishes(
+                order=order,
+                dish=dish,
+                status=OrderAndDishes.Statuses.DELIVERED,
+            )
+            for _ in range(FINISHED_LINES_COUNT)
+        ],
+    )
+    create_queue_lines(cook.restaurant)
+    with connection.cursor() as cursor:
+        for table in (
+            "orders_orderanddishes",
+            "orders_restaurantandorder",
+            "orders_dish",
+        ):
+            cursor.execute(f"ANALYZE {table}")
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    plan = get_kitchen_queue(cook.restaurant_id).explain()
+    assert "orders_line_active_idx" in plan
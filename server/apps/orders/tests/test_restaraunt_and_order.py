@@ -2,10 +2,18 @@ from datetime import datetime, timedelta
 
 import pytest
 import pytz
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 from rest_framework import status
 
-from apps.orders.factories import DishFactory, OrderFactory, RestaurantAndOrderFactory
+from apps.orders.factories import (
+    DishFactory,
+    OrderAndDishesFactory,
+    OrderFactory,
+    RestaurantAndOrderFactory,
+    StopListFactory,
+)
 from apps.orders.models import RestaurantAndOrder
 from apps.restaurants.factories import RestaurantFactory
 from apps.users.factories import ClientFactory
@@ -13,6 +21,7 @@ from apps.users.factories import ClientFactory
 pytestmark = pytest.mark.django_db
 
 DISH_COUNT = 4
+REST_AND_ORDER_COUNT = 3
 
 
 def test_create_rest_and_order_by_waiter(
@@ -155,6 +164,37 @@ def test_create_rest_and_order_by_client(
     ).exists()
 
 
+def test_create_rest_and_order_with_stopped_dishes_by_client(
+    client,
+    api_client,
+) -> None:
+    restaurant = RestaurantFactory.create()
+    rest_and_order = RestaurantAndOrderFactory.build(
+        restaurant=restaurant,
+    )
+    dishes = DishFactory.create_batch(size=DISH_COUNT)
+    StopListFactory.create(dish=dishes[0], restaurant=restaurant)
+    api_client.force_authenticate(user=client.user)
+    response = api_client.post(
+        reverse_lazy("api:restaurantAndOrders-list"),
+        data={
+            "order": {
+                "dishes": [{"dish": dish.id} for dish in dishes],
+            },
+            "restaurant": restaurant.pk,
+            "arrival_time": rest_and_order.arrival_time,
+            "place_number": rest_and_order.place_number,
+        },
+        format='json',
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert (
+        f"Блюда {dishes[0].pk} в стоп листе ресторана"
+        in response.data["message"]
+    )
+    assert not RestaurantAndOrder.objects.exists()
+
+
 def test_update_rest_and_order_by_client(
     client,
     api_client,
@@ -468,3 +508,37 @@ def test_remove_rest_and_order_by_unauthorised(
         ),
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_read_rest_and_orders_queries_by_waiter(
+    waiter,
+    api_client,
+) -> None:
+    dishes = DishFactory.create_batch(
+        size=DISH_COUNT,
+    )
+    rest_and_orders = RestaurantAndOrderFactory.create_batch(
+        size=REST_AND_ORDER_COUNT,
+    )
+    api_client.force_authenticate(user=waiter.user)
+    api_client.get(
+        reverse_lazy("api:restaurantAndOrders-list"),
+    )
+    with CaptureQueriesContext(connection) as no_lines_context:
+        response = api_client.get(
+            reverse_lazy("api:restaurantAndOrders-list"),
+        )
+    assert response.status_code == status.HTTP_200_OK
+    for rest_and_order in rest_and_orders:
+        for dish in dishes:
+            OrderAndDishesFactory.create(dish=dish, order=rest_and_order.order)
+    with CaptureQueriesContext(connection) as many_lines_context:
+        response = api_client.get(
+            reverse_lazy("api:restaurantAndOrders-list"),
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert all(
+        len(rest_and_order["order"]["dishes"]) == DISH_COUNT
+        for rest_and_order in response.data["results"]
+    )
+    assert len(no_lines_context) == len(many_lines_context)
@@ -4,7 +4,10 @@ from rest_framework import status
 
 from apps.orders.factories import DishFactory, StopListFactory
 from apps.orders.models import StopList
+from apps.orders.services import get_stopped_dishes, set_stopped_dishes
 from apps.restaurants.factories import RestaurantFactory
+from apps.users.factories import EmployeeFactory
+from apps.users.models import Employee
 
 pytestmark = pytest.mark.django_db
 
@@ -306,3 +309,88 @@ def test_delete_stop_list_by_not_auth(
         ),
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_create_duplicate_stop_list_by_cook(
+    cook,
+    api_client,
+) -> None:
+    stop_list = StopListFactory.create()
+    api_client.force_authenticate(user=cook.user)
+    response = api_client.post(
+        reverse_lazy("api:stopList-list"),
+        data={
+            "dish": stop_list.dish.pk,
+            "restaurant": stop_list.restaurant.pk,
+        },
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert StopList.objects.count() == 1
+
+
+def test_toggle_stop_list_by_cook(
+    cook,
+    api_client,
+    django_capture_on_commit_callbacks,
+) -> None:
+    dishes = DishFactory.create_batch(size=3)
+    dish_ids = [dish.pk for dish in dishes]
+    StopListFactory.create(dish=dishes[0], restaurant=cook.restaurant)
+    api_client.force_authenticate(user=cook.user)
+    assert get_stopped_dishes(cook.restaurant_id, dish_ids) == dish_ids[:1]
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            reverse_lazy("api:stopList-toggle"),
+            data={"dishes": dish_ids, "stopped": True},
+            format="json",
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data) == len(dish_ids)
+    assert get_stopped_dishes(cook.restaurant_id, dish_ids) == dish_ids
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            reverse_lazy("api:stopList-toggle"),
+            data={"dishes": dish_ids[1:], "stopped": False},
+            format="json",
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert get_stopped_dishes(cook.restaurant_id, dish_ids) == dish_ids[:1]
+
+
+def test_stop_already_stopped_dishes(
+    django_capture_on_commit_callbacks,
+) -> None:
+    stop_list = StopListFactory.create()
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        set_stopped_dishes(stop_list.restaurant_id, [stop_list.dish_id], True)
+    assert callbacks == []
+    assert StopList.objects.count() == 1
+
+
+def test_toggle_stop_list_by_cook_without_restaurant(
+    api_client,
+) -> None:
+    cook = EmployeeFactory.create(role=Employee.Roles.COOK, restaurant=None)
+    api_client.force_authenticate(user=cook.user)
+    response = api_client.post(
+        reverse_lazy("api:stopList-toggle"),
+        data={"dishes": [DishFactory.create().pk], "stopped": True},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert not StopList.objects.exists()
+
+
+def test_toggle_stop_list_by_waiter(
+    waiter,
+    api_client,
+) -> None:
+    dish = DishFactory.create()
+    api_client.force_authenticate(user=waiter.user)
+    response = api_client.post(
+        reverse_lazy("api:stopList-toggle"),
+        data={"dishes": [dish.pk], "stopped": True},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert not StopList.objects.exists()
@@ -1,16 +1,23 @@
-from rest_framework import decorators, permissions, response, status
+from django.db.models import Prefetch
+from django.http import Http404
+from django.utils.http import parse_etags
+from rest_framework import decorators, permissions, response, status, viewsets
+from rest_framework.generics import get_object_or_404
 
+from apps.core.services import CursorPaginationObject
 from apps.core.views import (
     BaseViewSet,
     CreateDestroyViewSet,
     CreateReadDeleteViewSet,
     CreateUpdateDestroyViewSet,
 )
+from apps.users.auth import get_principal
 
 from .models import (
     Category,
     Dish,
     DishImages,
+    Ingredient,
     Order,
     OrderAndDishes,
     RestaurantAndOrder,
@@ -24,13 +31,51 @@ from .permissions import (
     StopListPermission,
 )
 from .serializers import (
+    BulkStatusSerializer,
     CategorySerializer,
+    ClaimLineSerializer,
+    DishAutocompleteQuerySerializer,
+    DishFacetsQuerySerializer,
     DishImageSerializer,
+    DishIngredientsQuerySerializer,
+    DishSearchQuerySerializer,
     DishSerializer,
+    IngredientSerializer,
+    KitchenQueueSerializer,
+    MenuChangesQuerySerializer,
     OrderAndDishSerializer,
     OrderSerializer,
+    OrderTrackingQuerySerializer,
+    PopularDishesQuerySerializer,
+    PopularDishSerializer,
     RestaurantAndOrderSerializer,
     StopListSerializer,
+    StopListToggleSerializer,
+)
+from .services import (
+    autocomplete_dishes,
+    build_menu_changes,
+    bulk_transit,
+    claim_next_line,
+    filter_dishes_by_facets,
+    filter_dishes_by_ingredients,
+    get_dish_facets,
+    get_kitchen_queue,
+    get_menu_snapshot,
+    get_menu_version,
+    get_order_tracking,
+    get_order_version,
+    get_popular_dishes,
+    get_restaurant_lines,
+    get_restaurant_menu,
+    get_stop_list_version,
+    search_dishes,
+    set_stopped_dishes,
+)
+
+ORDER_DISHES_PREFETCH = Prefetch(
+    "dishes",
+    queryset=OrderAndDishes.objects.order_by("id"),
 )
 
 
@@ -45,9 +90,14 @@ class CategoryViewSet(BaseViewSet):
 
     def get_queryset(self):
         if self.action == "dishes":
-            return Category.objects.prefetch_related(
-                "dishes",
-            ).get(id=self.kwargs["pk"]).dishes.all()
+            category = get_object_or_404(Category, id=self.kwargs["pk"])
+            return Dish.objects.filter(
+                category=category,
+            ).select_related(
+                "category",
+            ).prefetch_related(
+                "images",
+            ).order_by("id")
         return Category.objects.all()
 
     @decorators.action(methods=("GET",), detail=True)
@@ -64,26 +114,121 @@ class DishViewSet(BaseViewSet):
         #     return ReviewSerializer
         if self.action == "orders":
             return OrderSerializer
+        if self.action == "ingredients":
+            return IngredientSerializer
         return DishSerializer
 
-    def perform_destroy(self, instance) -> None:
-        for image in instance.images.all():
-            image.image.storage.delete(image.image.path)
-        instance.delete()
-
     def get_queryset(self):
         if self.action == "reviews":
             return Dish.objects.prefetch_related(
                 "reviews",
             ).get(id=self.kwargs["pk"]).reviews.all()
+        if self.action == "ingredients":
+            return Ingredient.objects.filter(
+                dishes__isnull=False,
+            ).distinct().order_by("name")
         if self.action == "orders":
             orders = Dish.objects.prefetch_related(
                 "orders",
             ).get(
                 id=self.kwargs["pk"],
             ).orders.all().values_list("order", flat=True)
-            return Order.objects.filter(id__in=orders)
-        return Dish.objects.all()
+            return Order.objects.filter(
+                id__in=orders,
+            ).prefetch_related(
+                ORDER_DISHES_PREFETCH,
+            ).order_by("id")
+        return Dish.objects.select_related(
+            "category",
+        ).prefetch_related(
+            "images",
+        ).order_by("id")
+
+    @decorators.action(methods=("GET",), detail=False)
+    def autocomplete(self, request, *args, **kwargs) -> response.Response:
+        """Get ids and names of dishes for typed name from in-process index."""
+        serializer = DishAutocompleteQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return response.Response(
+            autocomplete_dishes(
+                serializer.validated_data["q"],
+                serializer.validated_data["limit"],
+            ),
+        )
+
+    @decorators.action(methods=("GET",), detail=False)
+    def popular(self, request, *args, **kwargs) -> response.Response:
+        """Get dishes sold most for all time or recent window."""
+        serializer = PopularDishesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        window = serializer.validated_data["window"]
+        return response.Response(
+            PopularDishSerializer(
+                get_popular_dishes(window, serializer.validated_data["limit"]),
+                many=True,
+                context={**self.get_serializer_context(), "window": window},
+            ).data,
+        )
+
+    @decorators.action(methods=("GET",), detail=False)
+    def search(self, request, *args, **kwargs) -> response.Response:
+        """Get dishes by words of name, descriptions or compound."""
+        serializer = DishSearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        queryset = search_dishes(
+            serializer.validated_data["q"],
+            Dish.objects.select_related(
+                "category",
+            ).prefetch_related(
+                "images",
+            ),
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @decorators.action(methods=("GET",), detail=False)
+    def ingredients(self, request, *args, **kwargs) -> response.Response:
+        """Get ingredients of dishes, by which dishes are filtered."""
+        return super().list(request, *args, **kwargs)
+
+    @decorators.action(
+        methods=("GET",),
+        detail=False,
+        url_path="by-ingredients",
+    )
+    def by_ingredients(self, request, *args, **kwargs) -> response.Response:
+        """Get dishes without excluded and with included ingredients."""
+        serializer = DishIngredientsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        queryset = filter_dishes_by_ingredients(
+            self.get_queryset(),
+            **serializer.validated_data,
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @decorators.action(methods=("GET",), detail=False)
+    def facets(self, request, *args, **kwargs) -> response.Response:
+        """Get page of filtered dishes with counts of each filter value."""
+        serializer = DishFacetsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        facets = get_dish_facets(**serializer.validated_data)
+        queryset = filter_dishes_by_facets(
+            self.get_queryset(),
+            **serializer.validated_data,
+        )
+        page = self.paginator.paginate_counted_queryset(
+            queryset,
+            request,
+            facets.pop("count"),
+            view=self,
+        )
+        serializer = self.get_serializer(page, many=True)
+        paginated_response = self.get_paginated_response(serializer.data)
+        paginated_response.data["facets"] = facets
+        return paginated_response
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -115,6 +260,69 @@ class DishViewSet(BaseViewSet):
         return super().list(request, *args, **kwargs)
 
 
+class MenuViewSet(viewsets.ViewSet):
+
+    authentication_classes = ()
+    permission_classes = (permissions.AllowAny,)
+
+    def get_response(self, request, etag: str, get_data) -> response.Response:
+        """Get response with `ETag`, data is got only if it was changed."""
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+        }
+        if_none_match = parse_etags(
+            request.META.get("HTTP_IF_NONE_MATCH", ""),
+        )
+        if etag in if_none_match or "*" in if_none_match:
+            return response.Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers=headers,
+            )
+        data = get_data()
+        if data is None:
+            raise Http404
+        return response.Response(
+            data=data,
+            headers=headers,
+        )
+
+    def list(self, request, *args, **kwargs) -> response.Response:
+        version = get_menu_version()
+        return self.get_response(
+            request,
+            f'"menu-{version}"',
+            lambda: get_menu_snapshot(version),
+        )
+
+    @decorators.action(methods=("GET",), detail=False)
+    def changes(self, request, *args, **kwargs) -> response.Response:
+        """Get rows of menu changed or deleted after `since` token."""
+        serializer = MenuChangesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return response.Response(
+            build_menu_changes(serializer.validated_data.get("since")),
+        )
+
+    def retrieve(self, request, pk=None, *args, **kwargs) -> response.Response:
+        """Get menu of restaurant without dishes in its stop list."""
+        try:
+            restaurant_id = int(pk)
+        except ValueError:
+            raise Http404
+        version = get_menu_version()
+        stop_list_version = get_stop_list_version(restaurant_id)
+        return self.get_response(
+            request,
+            f'"menu-{restaurant_id}-{version}-{stop_list_version}"',
+            lambda: get_restaurant_menu(
+                restaurant_id,
+                version,
+                stop_list_version,
+            ),
+        )
+
+
 class DishImageViewSet(CreateDestroyViewSet):
 
     queryset = DishImages.objects.all()
@@ -145,20 +353,68 @@ class DishImageViewSet(CreateDestroyViewSet):
 
 class OrderViewSet(BaseViewSet):
 
-    queryset = Order.objects.all()
+    queryset = Order.objects.prefetch_related(
+        ORDER_DISHES_PREFETCH,
+    ).order_by("id")
     serializer_class = OrderSerializer
+    pagination_class = CursorPaginationObject
     permission_classes = (
         permissions.IsAuthenticated & OrderPermissions,
     )
 
+    def get_serializer_context(self) -> dict:
+        context = super().get_serializer_context()
+        if principal := get_principal(self.request):
+            context["restaurant_id"] = principal.restaurant_id
+        return context
+
     def perform_create(self, serializer) -> None:
         serializer.save(employee=self.request.user.employee)
 
+    @decorators.action(methods=("GET",), detail=True)
+    def statuses(self, request, *args, **kwargs) -> response.Response:
+        """Get statuses of order or 304 if they didn't change after `since`.
+
+        It's conditional GET, which answers at once. Clients wait for changes
+        over `ws/orders/<id>/track` websocket, which sends statuses when
+        version of order grows after `since`.
+
+        """
+        serializer = OrderTrackingQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        since = serializer.validated_data.get("since")
+        try:
+            order_id = int(self.kwargs["pk"])
+        except ValueError:
+            raise Http404
+        version = get_order_version(order_id)
+        tracking = get_order_tracking(order_id, version)
+        if tracking is None:
+            raise Http404
+        if (
+            get_principal(request).is_client and
+            tracking["client_user"] != request.user.id
+        ):
+            self.permission_denied(request)
+        if since is not None and version <= since:
+            return response.Response(status=status.HTTP_304_NOT_MODIFIED)
+        data = tracking.copy()
+        data.pop("client_user")
+        return response.Response(data)
+
 
 class RestaurantAndOrderViewSet(BaseViewSet):
 
-    queryset = RestaurantAndOrder.objects.all()
+    queryset = RestaurantAndOrder.objects.select_related(
+        "order",
+    ).prefetch_related(
+        Prefetch(
+            "order__dishes",
+            queryset=OrderAndDishes.objects.order_by("id"),
+        ),
+    ).order_by("id")
     serializer_class = RestaurantAndOrderSerializer
+    pagination_class = CursorPaginationObject
     permission_classes = (
         permissions.IsAuthenticated & RestaurantAndOrdersPermissions,
     )
@@ -171,12 +427,62 @@ class RestaurantAndOrderViewSet(BaseViewSet):
 
 class OrderAndDishesViewSet(CreateUpdateDestroyViewSet):
 
-    queryset = OrderAndDishes.objects.all()
     serializer_class = OrderAndDishSerializer
+    pagination_class = CursorPaginationObject
     permission_classes = (
         permissions.IsAuthenticated & OrderAndDishesPermission,
     )
 
+    def get_serializer_class(self):
+        if self.action in ("queue", "claim"):
+            return KitchenQueueSerializer
+        return OrderAndDishSerializer
+
+    def get_queryset(self):
+        if self.action == "queue":
+            return get_kitchen_queue(
+                get_principal(self.request).restaurant_id,
+            )
+        return OrderAndDishes.objects.all()
+
+    @decorators.action(methods=("GET",), detail=False)
+    def queue(self, request, *args, **kwargs) -> response.Response:
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @decorators.action(methods=("POST",), detail=False)
+    def claim(self, request, *args, **kwargs) -> response.Response:
+        serializer = ClaimLineSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        line = claim_next_line(
+            request.user.employee,
+            serializer.validated_data.get("categories"),
+        )
+        if line is None:
+            return response.Response(status=status.HTTP_204_NO_CONTENT)
+        return response.Response(self.get_serializer(line).data)
+
+    @decorators.action(methods=("POST",), detail=False, url_path="bulk-status")
+    def bulk_status(self, request, *args, **kwargs) -> response.Response:
+        serializer = BulkStatusSerializer(
+            data=request.data,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        results = bulk_transit(
+            OrderAndDishes,
+            serializer.validated_data["ids"],
+            serializer.validated_data["status"],
+            get_restaurant_lines(get_principal(request).restaurant_id),
+        )
+        return response.Response({
+            "results": [
+                {"id": pk, "result": result}
+                for pk, result in results.items()
+            ],
+        })
+
 
 class StopListViewSet(CreateReadDeleteViewSet):
 
@@ -188,6 +494,29 @@ class StopListViewSet(CreateReadDeleteViewSet):
     def get_queryset(self):
         if self.action == "list":
             return StopList.objects.filter(
-                restaurant=self.request.user.employee.restaurant,
+                restaurant=get_principal(self.request).restaurant_id,
             )
         return StopList.objects.all()
+
+    @decorators.action(methods=("POST",), detail=False)
+    def toggle(self, request, *args, **kwargs) -> response.Response:
+        """Add dishes to stop list of restaurant or remove them from it."""
+        serializer = StopListToggleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        restaurant_id = get_principal(request).restaurant_id
+        if restaurant_id is None:
+            self.permission_denied(
+                request,
+                message="Сотрудник не привязан к ресторану",
+            )
+        set_stopped_dishes(
+            restaurant_id,
+            serializer.validated_data["dishes"],
+            serializer.validated_data["stopped"],
+        )
+        return response.Response(
+            StopListSerializer(
+                StopList.objects.filter(restaurant=restaurant_id),
+                many=True,
+            ).data,
+        )
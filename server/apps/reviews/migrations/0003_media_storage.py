@@ -0,0 +1,20 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:17
+
+import apps.core.storage
+import apps.reviews.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_review_client'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reviewimages',
+            name='image',
+            field=models.ImageField(storage=apps.core.storage.get_media_storage, upload_to=apps.reviews.models.get_directory_path, verbose_name='Картинка'),
+        ),
+    ]
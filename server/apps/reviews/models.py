@@ -1,6 +1,8 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+from apps.core.storage import get_media_storage
+
 
 def get_directory_path(instance, filename) -> str:
     return f"reviews/{instance.review.id}/{filename}"
@@ -39,6 +41,7 @@ class Review(models.Model):
 class ReviewImages(models.Model):
     image = models.ImageField(
         upload_to=get_directory_path,
+        storage=get_media_storage,
         verbose_name="Картинка"
     )
     review = models.ForeignKey(
@@ -54,3 +57,14 @@ class ReviewImages(models.Model):
 
     def __str__(self) -> str:
         return f"ReviewImages {self.image} {self.review}"
+
+    def get_file_names(self) -> list:
+        """Get names of image in storage."""
+        return [self.image.name]
+
+    @classmethod
+    def get_referenced_files(cls, names: list) -> set:
+        """Get `names` which are images of reviews."""
+        return set(
+            cls.objects.filter(image__in=names).values_list("image", flat=True),
+        )
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.core.services import delete_files_on_commit
+
+from . import models
+
+
+@receiver(post_delete, sender=models.ReviewImages)
+def review_image_deleted(instance, **kwargs) -> None:
+    """Delete image when transaction is committed."""
+    delete_files_on_commit(instance.image.storage, instance.get_file_names())
@@ -0,0 +1,112 @@
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import models
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identity of authenticated user, known without queries to DB."""
+
+    user_id: int
+    is_client: bool
+    role: Optional[str] = None
+    restaurant_id: Optional[int] = None
+    employee_id: Optional[int] = None
+    client_id: Optional[int] = None
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "Principal":
+        """Load principal of `user` from DB."""
+        if user.is_client:
+            return cls(
+                user_id=user.pk,
+                is_client=True,
+                client_id=user.client.pk,
+            )
+        try:
+            employee = user.employee
+        except models.Employee.DoesNotExist:
+            return cls(user_id=user.pk, is_client=False)
+        return cls(
+            user_id=user.pk,
+            is_client=False,
+            role=employee.role,
+            restaurant_id=employee.restaurant_id,
+            employee_id=employee.pk,
+        )
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "Principal":
+        """Get principal from claims of JWT token."""
+        return cls(**{
+            key: claims[key]
+            for key in cls.__dataclass_fields__.keys()
+            if key in claims
+        })
+
+    def is_employee(self, *roles: str) -> bool:
+        """Check if principal is employee with one of `roles`."""
+        return not self.is_client and self.role in roles
+
+
+def set_principal_claims(token: RefreshToken, user: models.User) -> None:
+    """Write claims of principal of `user` loaded from DB to `token`."""
+    for key, value in asdict(Principal.from_user(user)).items():
+        token[key] = value
+
+
+class PrincipalRefreshToken(RefreshToken):
+    """Refresh token, which principal claims are reloaded when it's used.
+
+    Otherwise rotated tokens would copy claims from login, and employee
+    moved to other role or restaurant would keep old ones until next login.
+
+    """
+
+    def __init__(self, token=None, verify: bool = True):
+        super().__init__(token, verify)
+        if token is None:
+            return
+        user = models.User.objects.filter(
+            pk=self[api_settings.USER_ID_CLAIM],
+            is_active=True,
+        ).first()
+        if user is None:
+            raise TokenError("Пользователь не найден")
+        set_principal_claims(self, user)
+
+
+def get_token_for_user(user: models.User) -> RefreshToken:
+    """Get refresh token with principal claims of `user`.
+
+    Claims are copied to access tokens, so role of user is known from token.
+
+    """
+    token = PrincipalRefreshToken.for_user(user)
+    set_principal_claims(token, user)
+    return token
+
+
+def get_principal(request) -> Optional[Principal]:
+    """Get principal of request user, cached for request.
+
+    Principal is read from claims of JWT token, for other authentications
+    and tokens issued without claims it is loaded from DB.
+
+    """
+    if not request.user.is_authenticated:
+        return None
+    principal = getattr(request, "_principal", None)
+    if principal is None:
+        claims = getattr(request.auth, "payload", {})
+        if "is_client" in claims:
+            principal = Principal.from_claims(claims)
+        else:
+            principal = Principal.from_user(request.user)
+        request._principal = principal
+    return principal
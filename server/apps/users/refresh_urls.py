@@ -1,6 +1,7 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
+
+from . import views
 
 urlpatterns = [
-    path('', TokenRefreshView.as_view()),
+    path('', views.TokenRefreshAPIView.as_view()),
 ]
@@ -1,14 +1,21 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
 
 from . import models
+from .auth import PrincipalRefreshToken, get_token_for_user
 
 
 class EmployeeAuthSerializer(TokenObtainPairSerializer):
     username = serializers.CharField()
     password = serializers.CharField()
 
+    @classmethod
+    def get_token(cls, user):
+        return get_token_for_user(user)
+
     def validate(self, attrs):
         validated_data = super().validate(attrs)
         if self.user.is_client:
@@ -21,6 +28,11 @@ class EmployeeAuthSerializer(TokenObtainPairSerializer):
         }
 
 
+class PrincipalTokenRefreshSerializer(TokenRefreshSerializer):
+
+    token_class = PrincipalRefreshToken
+
+
 class ClientAuthSerializer(serializers.Serializer):
     phone_number = serializers.CharField()
     password = serializers.CharField()
@@ -29,7 +41,7 @@ class ClientAuthSerializer(serializers.Serializer):
         client = models.Client.objects.filter(
             phone_number=data['phone_number'],
         ).first()
-        refresh = RefreshToken.for_user(client.user)
+        refresh = get_token_for_user(client.user)
         return {
             'access': str(refresh.access_token),
             'refresh': str(refresh),
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.authentication import token_user_cache
+
+from . import models
+
+
+@receiver(post_save, sender=models.User)
+@receiver(post_delete, sender=models.User)
+def user_changed(instance, **kwargs) -> None:
+    """Remove cached tokens of changed user."""
+    token_user_cache.invalidate_user(instance.pk)
@@ -0,0 +1,150 @@
+import pytest
+from django.urls import reverse_lazy
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.core.authentication import bump_user_version
+from apps.orders.factories import StopListFactory
+from apps.users.auth import get_token_for_user
+from apps.users.factories import EmployeeFactory
+from apps.users.models import Employee, User
+
+pytestmark = pytest.mark.django_db
+
+PASSWORD = "Some-password-123"
+
+
+def set_password(user) -> None:
+    user.set_password(PASSWORD)
+    user.save()
+
+
+def test_login_employee_claims(
+    cook,
+    api_client,
+) -> None:
+    set_password(cook.user)
+    response = api_client.post(
+        "/api/v1/staff/login/",
+        data={"username": cook.user.username, "password": PASSWORD},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    token = AccessToken(response.data["access"])
+    assert token["is_client"] is False
+    assert token["role"] == cook.role
+    assert token["restaurant_id"] == cook.restaurant_id
+    assert token["employee_id"] == cook.id
+    assert token["client_id"] is None
+
+
+def test_login_client_claims(
+    client,
+    api_client,
+) -> None:
+    set_password(client.user)
+    response = api_client.post(
+        reverse_lazy("api:clients-login"),
+        data={"phone_number": client.phone_number, "password": PASSWORD},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    token = AccessToken(response.data["access"])
+    assert token["is_client"] is True
+    assert token["client_id"] == client.id
+    assert token["role"] is None
+
+
+def test_read_stop_list_with_claims_queries(
+    cook,
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    StopListFactory.create_batch(size=2, restaurant=cook.restaurant)
+    set_password(cook.user)
+    access = api_client.post(
+        "/api/v1/staff/login/",
+        data={"username": cook.user.username, "password": PASSWORD},
+    ).data["access"]
+    api_client.credentials(HTTP_AUTHORIZATION=f"JWT {access}")
+    # user, count and page of stop list, role of user is read from token
+    with django_assert_num_queries(3):
+        response = api_client.get(reverse_lazy("api:stopList-list"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 2
+
+
+def test_read_stop_list_with_cached_token_queries(
+    cook,
+    api_client,
+    django_assert_num_queries,
+) -> None:
+    StopListFactory.create_batch(size=2, restaurant=cook.restaurant)
+    access = get_token_for_user(cook.user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"JWT {access}")
+    api_client.get(reverse_lazy("api:stopList-list"))
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse_lazy("api:stopList-list"))
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_read_stop_list_after_user_change(
+    cook,
+    api_client,
+) -> None:
+    access = get_token_for_user(cook.user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"JWT {access}")
+    api_client.get(reverse_lazy("api:stopList-list"))
+    cook.user.is_active = False
+    cook.user.save()
+    response = api_client.get(reverse_lazy("api:stopList-list"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_read_stop_list_after_user_change_in_other_process(
+    cook,
+    api_client,
+) -> None:
+    access = get_token_for_user(cook.user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"JWT {access}")
+    api_client.get(reverse_lazy("api:stopList-list"))
+    # other process updates user and bumps its version in shared cache
+    User.objects.filter(pk=cook.user_id).update(is_active=False)
+    bump_user_version(cook.user_id)
+    response = api_client.get(reverse_lazy("api:stopList-list"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_read_stop_list_with_drf_token(
+    cook,
+    api_client,
+) -> None:
+    token = Token.objects.create(user=cook.user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    response = api_client.get(reverse_lazy("api:stopList-list"))
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_refresh_token_reloads_employee_claims(api_client) -> None:
+    employee = EmployeeFactory.create(role=Employee.Roles.COOK)
+    refresh = get_token_for_user(employee.user)
+    employee.role = Employee.Roles.WAITER
+    employee.save()
+    response = api_client.post(
+        "/api/v1/token/refresh/",
+        data={"refresh": str(refresh)},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert AccessToken(response.data["access"])["role"] == Employee.Roles.WAITER
+    assert RefreshToken(response.data["refresh"])["role"] == Employee.Roles.WAITER
+
+
+def test_refresh_token_of_inactive_user(api_client) -> None:
+    employee = EmployeeFactory.create()
+    refresh = get_token_for_user(employee.user)
+    employee.user.is_active = False
+    employee.user.save()
+    response = api_client.post(
+        "/api/v1/token/refresh/",
+        data={"refresh": str(refresh)},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -1,4 +1,4 @@
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from . import serializers
 
@@ -6,3 +6,8 @@ from . import serializers
 class EmployeeAuthAPIView(TokenObtainPairView):
 
     serializer_class = serializers.EmployeeAuthSerializer
+
+
+class TokenRefreshAPIView(TokenRefreshView):
+
+    serializer_class = serializers.PrincipalTokenRefreshSerializer
@@ -5,6 +5,7 @@ from apps.orders.viewsets import (
     CategoryViewSet,
     DishImageViewSet,
     DishViewSet,
+    MenuViewSet,
     OrderAndDishesViewSet,
     OrderViewSet,
     RestaurantAndOrderViewSet,
@@ -25,6 +26,11 @@ router.register(
     DishViewSet,
     basename="dishes",
 )
+router.register(
+    "menu",
+    MenuViewSet,
+    basename="menu",
+)
 router.register(
     "orders",
     OrderViewSet,
@@ -4,4 +4,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa E402
+
+from apps.core.middleware import (  # noqa E402
+    JWTCookieAuthMiddlewareStack,
+    JWTQueryParamAuthMiddleware,
+)
+from config.ws_router import websocket_urlpatterns  # noqa E402
+
+application = ProtocolTypeRouter({
+    "http": django_application,
+    "websocket": JWTCookieAuthMiddlewareStack(
+        JWTQueryParamAuthMiddleware(
+            URLRouter(websocket_urlpatterns),
+        ),
+    ),
+})
@@ -5,9 +5,7 @@ from datetime import timedelta
 # -------------------------------------------------------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "apps.core.authentication.SchemeAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
     "EXCEPTION_HANDLER": "apps.core.exception_handler.custom_exception_handler",
@@ -30,3 +28,7 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('JWT',),
 }
+
+# Validated JWT tokens and their users cached in process of server
+TOKEN_USER_CACHE_SIZE = int(os.getenv("TOKEN_USER_CACHE_SIZE", 1024))
+TOKEN_USER_CACHE_TIMEOUT = int(os.getenv("TOKEN_USER_CACHE_TIMEOUT", 60))
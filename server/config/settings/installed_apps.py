@@ -14,6 +14,7 @@ THIRD_PARTY_APPS = [
     "rest_framework",
     "rest_framework.authtoken",
     "corsheaders",
+    "channels",
 ]
 
 LOCAL_APPS = [
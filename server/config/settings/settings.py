@@ -20,6 +20,7 @@ USE_L10N = True
 USE_TZ = True
 ROOT_URLCONF = "config.urls"
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 APPEND_SLASH = False
 
 if allowed_hosts := os.getenv('ALLOWED_HOSTS'):
@@ -35,12 +36,45 @@ DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 DATABASES = {'default': dj_database_url.config(conn_max_age=60)}
 
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "",
+# Versions of menu and orders are kept in cache, so it must be shared by
+# all processes, local memory cache is used only without REDIS_URL.
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "",
+        }
+    }
+
+# CHANNELS
+# ------------------------------------------------------------------------------
+# In-memory layer works only inside one process, so REDIS_URL must be set
+# when events are sent by gunicorn workers to websockets served by daphne.
+
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": [REDIS_URL],
+            },
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer",
+        }
     }
-}
 
 # AUTHENTICATION
 # ------------------------------------------------------------------------------
@@ -90,6 +124,47 @@ STATICFILES_FINDERS = [
 # ------------------------------------------------------------------------------
 MEDIA_ROOT = str(ROOT_DIR / "media")
 MEDIA_URL = "/media/"
+# Store dish and review images by hash of content under media/blobs, so same
+# image is stored once.
+CONTENT_ADDRESSED_MEDIA = os.getenv("CONTENT_ADDRESSED_MEDIA", "False") == "True"
+# Uploaded dish images get WebP copies not wider than these widths, which are
+# rendered by process pool after upload.
+DISH_IMAGE_VARIANTS = {
+    "thumbnail": 320,
+    "medium": 960,
+}
+DISH_IMAGE_QUALITY = 80
+DISH_IMAGE_PROCESSING_WORKERS = int(
+    os.getenv("DISH_IMAGE_PROCESSING_WORKERS", "2"),
+)
+DISH_IMAGE_PROCESSING_EAGER = False
+# Rows changed this number of seconds before sync token are sent again, as
+# their transactions could be committed after sync.
+MENU_CHANGES_OVERLAP = 60
+MENU_TOMBSTONE_RETENTION_DAYS = 30
+# Dish names are found by trigrams, when no name starts with typed words,
+# if at least this part of typed trigrams is in name.
+DISH_AUTOCOMPLETE_TRIGRAMS = True
+DISH_AUTOCOMPLETE_SIMILARITY = 0.5
+# Buckets of price and weight facets of dishes, from minimum inclusive to
+# maximum exclusive, `None` is unbounded.
+DISH_PRICE_FACETS = (
+    (None, 300),
+    (300, 600),
+    (600, 1000),
+    (1000, None),
+)
+DISH_WEIGHT_FACETS = (
+    (None, 200),
+    (200, 400),
+    (400, None),
+)
+# Models which reference files in media, `sweep_media` command deletes files
+# which none of them reference.
+MEDIA_REFERENCE_MODELS = (
+    "orders.DishImages",
+    "reviews.ReviewImages",
+)
 
 # TEMPLATES
 # ------------------------------------------------------------------------------
@@ -1,3 +1,4 @@
 from config.settings import *  # noqa F403 F401
 
 CELERY_TASK_ALWAYS_EAGER = True
+DISH_IMAGE_PROCESSING_EAGER = True
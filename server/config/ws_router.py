@@ -0,0 +1,14 @@
+from django.urls import path
+
+from apps.orders.consumers import OrderTrackingConsumer, RestaurantOrdersConsumer
+
+websocket_urlpatterns = [
+    path(
+        "ws/orders",
+        RestaurantOrdersConsumer.as_asgi(),
+    ),
+    path(
+        "ws/orders/<int:order_id>/track",
+        OrderTrackingConsumer.as_asgi(),
+    ),
+]
@@ -1,6 +1,9 @@
 import pytest
+from django.core.cache import cache
 from rest_framework import test
 
+from apps.core.authentication import token_user_cache
+from apps.orders.services import dish_name_index
 from apps.users.factories import ClientFactory, EmployeeFactory
 from apps.users.models import Employee
 
@@ -10,6 +13,18 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Clear cache between tests."""
+    cache.clear()
+    token_user_cache.clear()
+    dish_name_index.clear()
+    yield
+    cache.clear()
+    token_user_cache.clear()
+    dish_name_index.clear()
+
+
 @pytest.fixture
 def client(django_db_setup, django_db_blocker):
     """Module-level fixture for client."""
@@ -0,0 +1,76 @@
+import statistics
+import time
+from random import choice, randint, sample
+
+from django.db import transaction
+from faker.providers.lorem.ru_RU import Provider
+
+from apps.orders.factories import CategoryFactory
+from apps.orders.models import Dish
+from apps.orders.services import search_dishes
+
+DISHES_COUNT = 100_000
+QUERIES_COUNT = 200
+PAGE_SIZE = 9
+WORDS = Provider.word_list
+
+
+class Rollback(Exception):
+    """Raised to roll back synthetic dishes."""
+
+
+def get_text(words_count: int) -> str:
+    return " ".join(sample(WORDS, words_count))
+
+
+def run(*args):
+    """Measure search over synthetic dishes, which are rolled back after.
+
+    Run with `python manage.py runscript benchmark_dish_search` and pass
+    number of dishes with `--script-args`. Database is taken from
+    `DATABASE_URL`, so both PostgreSQL and SQLite indexes are measured.
+
+    """
+    dishes_count = int(args[0]) if args else DISHES_COUNT
+    try:
+        with transaction.atomic():
+            category = CategoryFactory.create()
+            started = time.perf_counter()
+            Dish.objects.bulk_create(
+                (
+                    Dish(
+                        category=category,
+                        name=get_text(2),
+                        description=get_text(8),
+                        short_description=get_text(3),
+                        compound=get_text(5),
+                        price=randint(50, 1000),
+                        weight=randint(100, 500),
+                    )
+                    for _ in range(dishes_count)
+                ),
+                batch_size=5000,
+            )
+            print(
+                f"Created {dishes_count} dishes in "
+                f"{time.perf_counter() - started:.1f} s",
+            )
+            timings = []
+            for _ in range(QUERIES_COUNT):
+                query = " ".join(
+                    choice(WORDS)[:randint(3, 6)]
+                    for _ in range(randint(1, 2))
+                )
+                started = time.perf_counter()
+                list(search_dishes(query).values_list("id", flat=True)[:PAGE_SIZE])
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            print(
+                f"Search of first page by {QUERIES_COUNT} queries: "
+                f"median {statistics.median(timings):.2f} ms, "
+                f"p95 {timings[int(len(timings) * 0.95)]:.2f} ms, "
+                f"max {timings[-1]:.2f} ms",
+            )
+            raise Rollback
+    except Rollback:
+        pass